@@ -0,0 +1,56 @@
+# app/api/instrumentation.py
+
+import time
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.db.database import engine
+from app.utils.metrics import HTTP_REQUEST_SECONDS, HTTP_DB_SECONDS
+
+
+# Per-request accumulator; a one-item list so the threadpool copy of the
+# context still writes into the same object as the route handler
+_db_time: ContextVar[list | None] = ContextVar("gp_db_time", default=None)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("gp_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["gp_query_start"].pop()
+    acc = _db_time.get()
+    if acc is not None:
+        acc[0] += time.perf_counter() - start
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("gp_query_start"):
+        conn.info["gp_query_start"].pop()
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records request latency and DB time per route."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        request_hist = HTTP_REQUEST_SECONDS.labels(self.path)
+        db_hist = HTTP_DB_SECONDS.labels(self.path)
+
+        async def timed_handler(request):
+            acc = [0.0]
+            token = _db_time.set(acc)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                request_hist.observe(time.perf_counter() - start)
+                db_hist.observe(acc[0])
+                _db_time.reset(token)
+
+        return timed_handler
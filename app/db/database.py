@@ -1,20 +1,210 @@
 # app/db/database.py
 
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, event, inspect, text, update
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import threading
+import time
 
 # Use DATABASE_URL from .env
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
 ) or "sqlite:///./test.db"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# Which process owns this engine: "api", "sentiment_worker" or "rss_worker"
+DB_ROLE = os.getenv("DB_ROLE", "api")
+
+
+# -------------------------
+# Pool profiles per process role
+# -------------------------
+POOL_PROFILES = {
+    # uvicorn runs sync routes in a threadpool, so the API needs the widest pool
+    "api": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 15000,
+    },
+    # one batch at a time, long inference between queries
+    "sentiment_worker": {
+        "pool_size": 2,
+        "max_overflow": 2,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 60000,
+    },
+    # single writer session per sweep plus a little headroom
+    "rss_worker": {
+        "pool_size": 4,
+        "max_overflow": 4,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 30000,
+    },
+}
+
+
+def resolve_pool_profile(role: str) -> dict:
+    """Profile for a role, with DB_POOL_* env vars taking precedence."""
+    profile = dict(POOL_PROFILES.get(role, POOL_PROFILES["api"]))
+
+    overrides = {
+        "pool_size": "DB_POOL_SIZE",
+        "max_overflow": "DB_MAX_OVERFLOW",
+        "pool_timeout": "DB_POOL_TIMEOUT",
+        "pool_recycle": "DB_POOL_RECYCLE",
+        "statement_timeout_ms": "DB_STATEMENT_TIMEOUT_MS",
+    }
+    for key, env_name in overrides.items():
+        value = os.getenv(env_name)
+        if value:
+            profile[key] = int(value)
+
+    return profile
+
+
+# -------------------------
+# Pool instrumentation
+# -------------------------
+class PoolStats:
+    """Thread-safe counters for connection checkouts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # pre-ping / invalidation rebuilds the pool; keep the same counters
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return conn
+
+
+# -------------------------
+# Engine factory
+# -------------------------
+def _is_sqlite_memory(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _enable_sqlite_pragmas(engine):
+    """WAL lets readers run alongside the scraper's writes on local runs."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL, role: str = DB_ROLE):
+    """Build an engine tuned for the given process role."""
+    profile = resolve_pool_profile(role)
+
+    if url.startswith("sqlite"):
+        connect_args = {
+            "check_same_thread": False,
+            # busy timeout, in seconds
+            "timeout": profile["statement_timeout_ms"] / 1000,
+        }
+
+        if _is_sqlite_memory(url):
+            # every new connection would be a new empty database
+            return create_engine(url, connect_args=connect_args)
+
+        engine = create_engine(
+            url,
+            connect_args=connect_args,
+            poolclass=InstrumentedQueuePool,
+            pool_size=profile["pool_size"],
+            max_overflow=profile["max_overflow"],
+            pool_timeout=profile["pool_timeout"],
+            pool_pre_ping=True,
+        )
+        _enable_sqlite_pragmas(engine)
+        return engine
+
+    connect_args = {}
+    if url.startswith("postgresql"):
+        connect_args["options"] = f"-c statement_timeout={profile['statement_timeout_ms']}"
+
+    return create_engine(
+        url,
+        connect_args=connect_args,
+        poolclass=InstrumentedQueuePool,
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+        pool_timeout=profile["pool_timeout"],
+        pool_recycle=profile["pool_recycle"],
+        pool_pre_ping=True,
+    )
+
 
-engine = create_engine(DATABASE_URL)
+def get_pool_status(bind=None) -> dict:
+    """Current pool occupancy and checkout wait statistics."""
+    pool = (bind or engine).pool
+    status = {"role": DB_ROLE, "pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+
+    return status
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -24,10 +214,139 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+
+# -------------------------
+# Schema
+# -------------------------
+def ensure_columns(bind=None):
+    """Add nullable columns that create_all() can't add to existing tables.
+
+    There are no migrations; this covers the common case of a new optional
+    column (and its index) on a table that already exists.
+    """
+    bind = bind or engine
+    inspector = inspect(bind)
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable or column.primary_key:
+                print(f"[WARN] Cannot add NOT NULL column {table.name}.{column.name}; migrate by hand")
+                continue
+
+            col_type = column.type.compile(dialect=bind.dialect)
+            with bind.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+            print(f"[DB] Added column {table.name}.{column.name}")
+
+            for index in table.indexes:
+                if column.name in index.columns:
+                    index.create(bind, checkfirst=True)
+
+
+def ensure_indexes(bind=None):
+    """Create indexes added to models after their table was created."""
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
+
+
+def init_db(bind=None):
+    """Create missing tables, columns, indexes and (Postgres) upcoming partitions."""
+    from app.db.partitioning import ensure_partitions
+
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    ensure_columns(bind)
+    ensure_indexes(bind)
+    ensure_partitions(bind)
+
+
+# -------------------------
+# Counters
+# -------------------------
+def increment(db, table, rows: list, keys: tuple, counters: tuple):
+    """Insert rows, adding their `counters` to any row already there with the same `keys`.
+
+    One executemany INSERT ... ON CONFLICT DO UPDATE (SQLite and Postgres),
+    in key order so concurrent writers lock rows in the same order.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"increment() has no upsert for {dialect}")
+
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[k] for k in keys],
+        set_={c: table.c[c] + stmt.excluded[c] for c in counters},
+    )
+    db.execute(stmt, sorted(rows, key=lambda r: tuple(r[k] for k in keys)))
+
+
+def decrement(db, table, rows: list, keys: tuple, counters: tuple):
+    """Subtract rows' `counters` from the rows already there with the same `keys`.
+
+    Rows that don't exist (e.g. pruned) stay absent rather than coming back
+    negative. One executemany UPDATE, in key order like increment().
+    """
+    if not rows:
+        return
+    stmt = (
+        update(table)
+        .where(*[table.c[k] == bindparam(f"k_{k}") for k in keys])
+        .values({c: table.c[c] - bindparam(f"v_{c}") for c in counters})
+    )
+    params = [
+        {**{f"k_{k}": r[k] for k in keys}, **{f"v_{c}": r[c] for c in counters}}
+        for r in sorted(rows, key=lambda r: tuple(r[k] for k in keys))
+    ]
+    db.execute(stmt, params)
+
+
+# -------------------------
+# Bounded calls
+# -------------------------
+def call_with_timeout(fn, timeout: float):
+    """fn() in a daemon thread, waiting at most `timeout` seconds for it.
+
+    Raises TimeoutError if it takes longer; the call carries on in the
+    background and its result is dropped. fn should open its own session,
+    since the caller may move on while it still runs.
+    """
+    outcome = {}
+
+    def run():
+        try:
+            outcome["value"] = fn()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"no answer from the database within {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
+
+
 def get_db():
     """FastAPI dependency for DB sessions."""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
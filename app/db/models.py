@@ -1,6 +1,6 @@
 # app/db/models.py
 
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, ForeignKey, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -12,9 +12,11 @@ class Article(Base):
     title = Column(String(500))
     url = Column(String(500), unique=True, index=True)
     source = Column(String(200))
-    published_at = Column(DateTime)
+    published_at = Column(DateTime, index=True)
     content = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # set when this is a near-duplicate of an earlier article (see services/dedup.py)
+    canonical_id = Column(Integer, ForeignKey("articles.id"), index=True)
 
     # relationship to sentiment table
     sentiment = relationship("SentimentResult", back_populates="article", uselist=False)
@@ -25,10 +27,14 @@ class SentimentResult(Base):
     __tablename__ = "sentiment_results"
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"))
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
     label = Column(String(50))
     score = Column(Float)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # what produced this row and the article's entities (NULL: before versioning);
+    # see app/services/backfill.py
+    model_version = Column(String(200), index=True)
+    ner_version = Column(String(200), index=True)
 
     article = relationship("Article", back_populates="sentiment")
 
@@ -36,10 +42,101 @@ class ArticleEntity(Base):
     __tablename__ = "article_entities"
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"))
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), index=True)
 
     entity = Column(String(255), index=True)
     entity_type = Column(String(50), index=True)  # person, org, location, product
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    model_version = Column(String(200))
+
+    article = relationship("Article", back_populates="entities")
+
+
+class ScraperNode(Base):
+    """RSS scraper instance: shard membership heartbeat + sweep progress."""
+    __tablename__ = "scraper_nodes"
+
+    node_id = Column(String(200), primary_key=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    last_heartbeat = Column(DateTime, default=datetime.utcnow, index=True)
+
+    feeds_owned = Column(Integer, default=0)
+    feeds_done = Column(Integer, default=0)
+    articles_inserted = Column(Integer, default=0)
+    sweep_started_at = Column(DateTime)
+    sweep_finished_at = Column(DateTime)
+
+
+class FeedHealth(Base):
+    """Per-feed fetch history used to back off from dead feeds."""
+    __tablename__ = "feed_health"
+
+    url = Column(String(500), primary_key=True)
+    last_attempt_at = Column(DateTime)
+    last_success_at = Column(DateTime)
+    last_status = Column(String(50))  # ok, timeout, dns, http_404, too_large, throttled, ...
+    last_error = Column(Text)
+
+    consecutive_failures = Column(Integer, default=0, index=True)
+    total_fetches = Column(Integer, default=0)
+    total_failures = Column(Integer, default=0)
+    bozo_count = Column(Integer, default=0)
+    avg_latency = Column(Float)  # seconds, exponentially weighted
+
+    quarantined_until = Column(DateTime, index=True)
+
+
+class Story(Base):
+    """Cluster of articles covering the same story (see services/stories.py)."""
+    __tablename__ = "stories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(500))  # title of the article that opened the story
+    article_count = Column(Integer, default=0)
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, index=True)
+    centroid = Column(LargeBinary)  # float32 sum of member vectors
+
+
+class ArticleStory(Base):
+    __tablename__ = "article_stories"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    story_id = Column(Integer, ForeignKey("stories.id", ondelete="CASCADE"), index=True)
+    similarity = Column(Float)
+    assigned_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EntityCooccurrence(Base):
+    """Articles per day mentioning both entities (see services/entity_graph.py).
+
+    Stored in both directions, so an entity's neighbours are one index range.
+    """
+    __tablename__ = "entity_cooccurrence"
+
+    entity = Column(String(255), primary_key=True)
+    entity_type = Column(String(50), primary_key=True)
+    neighbor = Column(String(255), primary_key=True)
+    neighbor_type = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class EntitySentimentDaily(Base):
+    """Sentiment of the articles mentioning an entity, per day (see services/entity_sentiment.py)."""
+    __tablename__ = "entity_sentiment_daily"
+
+    entity = Column(String(255), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    label = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+
+
+class ExportDirty(Base):
+    """Day of an exported table changed in place; re-exported by services/parquet_export.py."""
+    __tablename__ = "export_dirty"
 
-    article = relationship("Article", back_populates="entities")
\ No newline at end of file
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(100), nullable=False)
+    day = Column(Date)  # NULL: rows without created_at
@@ -0,0 +1,424 @@
+# app/db/partitioning.py
+"""
+Monthly partitions and retention.
+
+Postgres: sentiment_results and article_entities can be converted once to
+tables range-partitioned by month on created_at:
+
+    python -m app.db.partitioning convert
+
+`ensure_partitions` then keeps a few months ahead (a DEFAULT partition
+catches anything outside them), and retention drops whole partitions.
+
+articles stays a plain table: on a partitioned table every primary key and
+unique constraint must include the partition column, so articles.id could
+no longer be the target of the foreign keys pointing at it. It is pruned
+with batched deletes over the created_at index.
+
+SQLite (local runs, tests, benchmarks) has no partitioning. Everything
+works the same, except that retention deletes month ranges in batches.
+
+Retention keeps RETENTION_MONTHS whole months (0 keeps everything) and,
+with RETENTION_ARCHIVE_DIR set, first writes each month to zstd-compressed
+Parquet (needs pyarrow):
+
+    python -m app.db.partitioning retain [--dry-run]
+
+Retention marks the days it deleted from in export_dirty, so the Parquet
+export (app/services/parquet_export.py) redoes them.
+"""
+
+import argparse
+import os
+from datetime import date, datetime
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.schema import AddConstraint
+
+from app.db.database import Base, engine
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed to archive
+    pa = pq = None
+
+RETENTION_MONTHS = int(os.getenv("RETENTION_MONTHS", 12))
+ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "")
+PARTITIONS_AHEAD = int(os.getenv("PARTITIONS_AHEAD", 3))
+DELETE_BATCH = 5000
+ARCHIVE_BATCH = 10000
+
+# partitioned on Postgres, by month of this column
+PARTITIONED = {
+    "sentiment_results": "created_at",
+    "article_entities": "created_at",
+}
+
+# exported to Parquet by day of created_at (app/services/parquet_export.py)
+EXPORTED = ("articles", "sentiment_results", "article_entities")
+
+
+# -------------------------
+# Months
+# -------------------------
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def retention_cutoff(today: date = None, months: int = None):
+    """First day of the oldest month kept, or None when retention is off."""
+    months = RETENTION_MONTHS if months is None else months
+    if months <= 0:
+        return None
+    return add_months(month_start(today or date.today()), -(months - 1))
+
+
+def _as_datetime(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+def month_days(month: date) -> list:
+    return [date(month.year, month.month, d) for d in range(1, (add_months(month, 1) - month).days + 1)]
+
+
+# -------------------------
+# Change marks (for the Parquet export)
+# -------------------------
+def partition_day(value):
+    """Day a created_at value (or SQL date(created_at) result) falls on; None stays None."""
+    if value is None or type(value) is date:
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value.date()
+
+
+def changed_days(conn, table, where) -> set:
+    """Days of created_at of the rows of `table` matching `where`."""
+    rows = conn.execute(select(func.date(table.c.created_at)).where(where).distinct())
+    return {partition_day(day) for (day,) in rows}
+
+
+def mark_dirty(conn, table_name: str, days):
+    """Have the Parquet export redo these days of a table; part of the caller's transaction."""
+    rows = [{"table_name": table_name, "day": day} for day in set(days)]
+    if rows:
+        conn.execute(Base.metadata.tables["export_dirty"].insert(), rows)
+
+
+# -------------------------
+# Postgres partitions
+# -------------------------
+def _is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table"
+    ), {"table": table}).first() is not None
+
+
+def list_partitions(conn, table: str) -> dict:
+    """Monthly partitions of a table as {month: partition name}."""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table"
+    ), {"table": table}).scalars()
+
+    partitions = {}
+    prefix = f"{table}_y"
+    for name in names:
+        if not name.startswith(prefix):
+            continue  # the DEFAULT partition
+        year, month = name[len(prefix):].split("m")
+        partitions[date(int(year), int(month), 1)] = name
+    return partitions
+
+
+def create_partition(conn, table: str, month: date):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+    ))
+
+
+def ensure_partitions(bind=None, ahead: int = PARTITIONS_AHEAD, today: date = None) -> int:
+    """Create monthly partitions from this month to `ahead` months out."""
+    bind = bind or engine
+    if not _is_postgres(bind):
+        return 0
+
+    current = month_start(today or date.today())
+    created = 0
+    with bind.begin() as conn:
+        for table in PARTITIONED:
+            if not is_partitioned(conn, table):
+                continue
+            existing = list_partitions(conn, table)
+            for n in range(ahead + 1):
+                month = add_months(current, n)
+                if month not in existing:
+                    create_partition(conn, table, month)
+                    created += 1
+    return created
+
+
+def convert_table(bind, table: str):
+    """Rebuild an existing table as a monthly-partitioned one, in one transaction.
+
+    Takes an exclusive lock and copies every row; run it in a quiet window.
+    """
+    column = PARTITIONED[table]
+    model = Base.metadata.tables[table]
+    old = f"{table}_unpartitioned"
+
+    with bind.begin() as conn:
+        if is_partitioned(conn, table):
+            print(f"[DB] {table} is already partitioned")
+            return
+
+        conn.execute(text(f"ALTER TABLE {table} RENAME TO {old}"))
+        # the partition column joins the primary key, so it can't be NULL
+        conn.execute(text(f"UPDATE {old} SET {column} = now() WHERE {column} IS NULL"))
+        conn.execute(text(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({column})"))
+        conn.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+
+        first = conn.execute(text(f"SELECT min({column}) FROM {old}")).scalar()
+        month = month_start(first or date.today())
+        last = add_months(month_start(date.today()), PARTITIONS_AHEAD)
+        while month <= last:
+            create_partition(conn, table, month)
+            month = add_months(month, 1)
+
+        conn.execute(text(f"INSERT INTO {table} SELECT * FROM {old}"))
+        sequence = conn.execute(text(f"SELECT pg_get_serial_sequence('{old}', 'id')")).scalar()
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+        conn.execute(text(f"DROP TABLE {old}"))
+
+        conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {column})"))
+        for index in model.indexes:
+            index.create(conn)
+        for constraint in model.foreign_key_constraints:
+            conn.execute(AddConstraint(constraint))
+
+    print(f"[DB] Partitioned {table} by month on {column}")
+
+
+def convert(bind=None):
+    bind = bind or engine
+    if not _is_postgres(bind):
+        print("[WARN] Partitioning needs Postgres; SQLite uses batched retention deletes")
+        return
+    for table in PARTITIONED:
+        convert_table(bind, table)
+
+
+# -------------------------
+# Archive
+# -------------------------
+def _arrow_type(column):
+    python_type = column.type.python_type
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp("us")
+    if python_type is bytes:
+        return pa.binary()
+    return pa.string()
+
+
+def arrow_schema(table):
+    """Arrow schema mirroring a SQLAlchemy table."""
+    return pa.schema([(c.name, _arrow_type(c)) for c in table.columns])
+
+
+def arrow_table(rows: list, schema):
+    """Arrow table from a list of row tuples in schema column order."""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.Table.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def archive_rows(conn, table, where, path: str) -> int:
+    """Stream the rows of `table` matching `where` into a Parquet file."""
+    schema = arrow_schema(table)
+    result = conn.execution_options(stream_results=True).execute(select(table).where(where))
+
+    written = 0
+    partial = path + ".partial"
+    with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+        for rows in result.partitions(ARCHIVE_BATCH):
+            writer.write_table(arrow_table(rows, schema))
+            written += len(rows)
+    os.replace(partial, path)
+    return written
+
+
+def archive_month(conn, month: date, archive_dir: str) -> dict:
+    """Write a month of articles and everything hanging off them to Parquet."""
+    tables = Base.metadata.tables
+    articles = tables["articles"]
+    start, end = _as_datetime(month), _as_datetime(add_months(month, 1))
+    month_ids = select(articles.c.id).where(articles.c.created_at >= start, articles.c.created_at < end)
+
+    counts = {}
+    os.makedirs(archive_dir, exist_ok=True)
+    for name in ("articles", "sentiment_results", "article_entities"):
+        table = tables[name]
+        if name == "articles":
+            where = (articles.c.created_at >= start) & (articles.c.created_at < end)
+        else:
+            # the month's rows, plus rows created later for the month's articles
+            where = ((table.c.created_at >= start) & (table.c.created_at < end)) | table.c.article_id.in_(month_ids)
+        path = os.path.join(archive_dir, f"{name}-{month:%Y-%m}.parquet")
+        counts[name] = archive_rows(conn, table, where, path)
+    return counts
+
+
+# -------------------------
+# Retention
+# -------------------------
+def _delete_in_batches(bind, table, where) -> int:
+    deleted = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(select(table.c.id, table.c.created_at).where(where).limit(DELETE_BATCH)).all()
+            if rows:
+                conn.execute(delete(table).where(table.c.id.in_([row.id for row in rows])))
+                mark_dirty(conn, table.name, (partition_day(row.created_at) for row in rows))
+        deleted += len(rows)
+        if len(rows) < DELETE_BATCH:
+            return deleted
+
+
+def _delete_articles(bind, start: datetime, end: datetime) -> int:
+    tables = Base.metadata.tables
+    articles = tables["articles"]
+    children = [tables["sentiment_results"], tables["article_entities"], tables["article_stories"]]
+
+    deleted = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(
+                select(articles.c.id, articles.c.created_at)
+                .where(articles.c.created_at >= start, articles.c.created_at < end)
+                .limit(DELETE_BATCH)
+            ).all()
+            if not rows:
+                return deleted
+            ids = [row.id for row in rows]
+            # SQLite doesn't enforce ON DELETE CASCADE unless asked; be explicit
+            for child in children:
+                if child.name in EXPORTED:
+                    mark_dirty(conn, child.name, changed_days(conn, child, child.c.article_id.in_(ids)))
+                conn.execute(delete(child).where(child.c.article_id.in_(ids)))
+            repointed = articles.c.canonical_id.in_(ids)
+            mark_dirty(conn, "articles", changed_days(conn, articles, repointed))
+            conn.execute(update(articles).where(repointed).values(canonical_id=None))
+            conn.execute(delete(articles).where(articles.c.id.in_(ids)))
+            mark_dirty(conn, "articles", (partition_day(row.created_at) for row in rows))
+        deleted += len(rows)
+
+
+def expired_months(bind, cutoff: date) -> list:
+    """Months before `cutoff` that still hold articles or partitions."""
+    articles = Base.metadata.tables["articles"]
+    with bind.connect() as conn:
+        first = conn.execute(select(func.min(articles.c.created_at))).scalar()
+        partitioned = set()
+        if _is_postgres(bind):
+            for table in PARTITIONED:
+                if is_partitioned(conn, table):
+                    partitioned.update(m for m in list_partitions(conn, table) if m < cutoff)
+
+    months = set(partitioned)
+    if first is not None:
+        month = month_start(first)
+        while month < cutoff:
+            months.add(month)
+            month = add_months(month, 1)
+    return sorted(months)
+
+
+def drop_month(bind, month: date, archive_dir: str = "") -> dict:
+    """Archive (optionally) and remove one month of data."""
+    start, end = _as_datetime(month), _as_datetime(add_months(month, 1))
+    counts = {}
+    if archive_dir:
+        with bind.connect() as conn:
+            counts["archived"] = archive_month(conn, month, archive_dir)
+
+    tables = Base.metadata.tables
+    for name, column in PARTITIONED.items():
+        table = tables[name]
+        dropped = False
+        if _is_postgres(bind):
+            with bind.begin() as conn:
+                partition = list_partitions(conn, name).get(month) if is_partitioned(conn, name) else None
+                if partition:
+                    conn.execute(text(f"ALTER TABLE {name} DETACH PARTITION {partition}"))
+                    conn.execute(text(f"DROP TABLE {partition}"))
+                    mark_dirty(conn, name, month_days(month))
+                    dropped = True
+        if not dropped:
+            where = (table.c[column] >= start) & (table.c[column] < end)
+            counts[name] = _delete_in_batches(bind, table, where)
+
+    counts["articles"] = _delete_articles(bind, start, end)
+    return counts
+
+
+def apply_retention(bind=None, cutoff: date = None, archive_dir: str = None, dry_run: bool = False) -> dict:
+    """Remove every month older than the retention cutoff; returns counts per month."""
+    bind = bind or engine
+    cutoff = cutoff or retention_cutoff()
+    archive_dir = ARCHIVE_DIR if archive_dir is None else archive_dir
+    if cutoff is None:
+        return {}
+    if archive_dir and pa is None:
+        # never delete what we were asked to keep
+        raise RuntimeError("RETENTION_ARCHIVE_DIR is set but pyarrow is not installed")
+
+    report = {}
+    for month in expired_months(bind, cutoff):
+        if dry_run:
+            report[str(month)] = "expired"
+            continue
+        report[str(month)] = drop_month(bind, month, archive_dir)
+        print(f"[RETENTION] {month:%Y-%m}: {report[str(month)]}")
+    return report
+
+
+if __name__ == "__main__":
+    from app.db import models  # noqa: F401  (register tables)
+
+    parser = argparse.ArgumentParser(description="Monthly partitions and retention.")
+    parser.add_argument("command", choices=["convert", "ensure", "retain"])
+    parser.add_argument("--dry-run", action="store_true", help="retain: list expired months only")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        convert()
+    elif args.command == "ensure":
+        print(f"[DB] Created {ensure_partitions()} partitions")
+    else:
+        ensure_partitions()
+        print(apply_retention(dry_run=args.dry_run))
@@ -1,11 +1,14 @@
-from fastapi import FastAPI
-from app.db.database import Base, engine
+from fastapi import FastAPI, Response
+from app.db.database import init_db, get_pool_status
 from app.db import models
 from app.routers.analytics import router as analytics_router
+from app.routers.feeds import router as feeds_router
+from app.routers.live import router as live_router
+from app.utils.metrics import render_latest
 
 
-# Create DB tables on startup
-Base.metadata.create_all(bind=engine)
+# Create DB tables (and any new nullable columns) on startup
+init_db()
 
 app = FastAPI(
     title="Global Pulse API",
@@ -18,4 +21,19 @@ def health_check():
     return {"status": "ok", "message": "API is running"}
 
 
-app.include_router(analytics_router)
\ No newline at end of file
+@app.get("/health/db")
+def db_pool_health():
+    """Connection pool occupancy and checkout wait times."""
+    return get_pool_status()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+app.include_router(analytics_router)
+app.include_router(feeds_router)
+app.include_router(live_router)
\ No newline at end of file
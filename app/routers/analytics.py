@@ -1,26 +1,64 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func, Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from datetime import date
-from collections import Counter
-import re
 from datetime import datetime
 from datetime import timedelta
 
-GLOBAL_CUTOFF = date(2025, 10, 1)
-
 from app.db.database import get_db
-from app.db.models import Article, SentimentResult, ArticleEntity
+from app.db.models import Article, SentimentResult, ArticleEntity, Story, ArticleStory
+from app.db.partitioning import retention_cutoff
+from app.services import duckdb_analytics, entity_graph, entity_sentiment
+from app.services.live import TOP_ENTITIES
+from app.api.instrumentation import TimedRoute
+from app.utils.keywords import count_keywords
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"], route_class=TimedRoute)
+
+
+# -------------------------
+# Date helpers
+# -------------------------
+class calendar_day(FunctionElement):
+    """Calendar day of a timestamp column, for grouping."""
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(calendar_day)
+def _day_default(element, compiler, **kw):
+    return "CAST(%s AS DATE)" % compiler.process(element.clauses, **kw)
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+@compiles(calendar_day, "sqlite")
+def _day_sqlite(element, compiler, **kw):
+    # CAST(... AS DATE) on SQLite yields the year as a number
+    return "date(%s)" % compiler.process(element.clauses, **kw)
+
+
+def since(column, cutoff: date):
+    """`column >= cutoff` on the raw timestamp, so indexes and partitions prune."""
+    return column >= datetime.combine(cutoff, datetime.min.time())
+
+
+def columnar(name: str, *args):
+    """DuckDB answer when ANALYTICS_BACKEND=duckdb; None means use SQL."""
+    if not duckdb_analytics.ENABLED:
+        return None
+    return duckdb_analytics.run(name, *args)
 
 
 @router.get("/sentiment-summary")
 def sentiment_summary(after: str = None, days: int = None, db: Session = Depends(get_db)):
     cutoff = resolve_cutoff(after, days)
+    result = columnar("sentiment_summary", cutoff)
+    if result is not None:
+        return result
     query = db.query(SentimentResult).join(Article, Article.id == SentimentResult.article_id)
     if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
+        query = query.filter(since(Article.published_at, cutoff))
     total = query.count()
     positive = query.filter(SentimentResult.label == "positive").count()
     negative = query.filter(SentimentResult.label == "negative").count()
@@ -38,9 +76,12 @@ def sentiment_summary(after: str = None, days: int = None, db: Session = Depends
 @router.get("/top-sources")
 def top_sources(after: str = None, days: int = None, db: Session = Depends(get_db)):
     cutoff = resolve_cutoff(after, days)
-    query = db.query(Article.source, func.count(Article.id).label("count"))
+    result = columnar("top_sources", cutoff)
+    if result is not None:
+        return result
+    query = db.query(Article.source, func.count(Article.id).label("count")).filter(Article.canonical_id == None)
     if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
+        query = query.filter(since(Article.published_at, cutoff))
     results = query.group_by(Article.source).order_by(func.count(Article.id).desc()).all()
     return [{"source": s, "count": c} for s, c in results]
 
@@ -48,13 +89,16 @@ def top_sources(after: str = None, days: int = None, db: Session = Depends(get_d
 @router.get("/daily-sentiment")
 def daily_sentiment(after: str = None, days: int = None, db: Session = Depends(get_db)):
     cutoff = resolve_cutoff(after, days)
+    result = columnar("daily_sentiment", cutoff)
+    if result is not None:
+        return result
     query = db.query(
-        cast(Article.published_at, Date).label("day"),
+        calendar_day(Article.published_at).label("day"),
         SentimentResult.label,
         func.count(SentimentResult.id)
     ).join(SentimentResult, SentimentResult.article_id == Article.id)
     if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
+        query = query.filter(since(Article.published_at, cutoff))
     results = query.group_by("day", SentimentResult.label).order_by("day").all()
     trend = {}
     for day, label, count in results:
@@ -65,51 +109,6 @@ def daily_sentiment(after: str = None, days: int = None, db: Session = Depends(g
     return trend
 
 
-STOPWORDS = set("""
-                will first content post time need cent people like other when appeared best features million free high plan help country back billion make tool online years
-a an the and or but if while then than
-of for with without within
-to from in on at by about into onto upon
-is was are were be been being
-it this that these those
-you your yours we our us they them their
-as so just very really
-what which who whom whose
-also too much many most
-can could should would may might
-do does did doing done
-has have had having
-not no yes
-all any each every some
-there here after before during
-such though although however still
-because since until
-over under again once even only
-more less few several
-out up down off
-i me my mine
-he him his she her hers
-one two three four five
-really actually basically literally kinda sort maybe probably
-new latest update report reports reporting
-breaking developing announced announcement
-news article media sources source experts
-today yesterday tomorrow week month year
-said says saying according
-company companies firm firms organization organizations
-market markets
-global international world national
-industry industries sector sectors
-single game review read
-""".split())
-
-
-def extract_keywords(text: str):
-    text = text.lower()
-    words = re.findall(r"[a-zA-Z]+", text)
-    return [w for w in words if w not in STOPWORDS and len(w) > 3]
-
-
 def resolve_cutoff(after: str | None, days: int | None):
     user_cutoff = None
 
@@ -122,39 +121,42 @@ def resolve_cutoff(after: str | None, days: int | None):
     if days:
         user_cutoff = date.today() - timedelta(days=days)
 
-    if user_cutoff:
-        return max(user_cutoff, GLOBAL_CUTOFF)
+    # nothing older than the retention window is kept (see app/db/partitioning.py)
+    kept_from = retention_cutoff()
+    if user_cutoff and kept_from:
+        return max(user_cutoff, kept_from)
 
-    return GLOBAL_CUTOFF
+    return user_cutoff or kept_from
 
 
 @router.get("/keyword-frequency")
-def keyword_frequency(after: str = None, days: int = None, db: Session = Depends(get_db)):
+def keyword_frequency(after: str = None, days: int = None, ngram: int = 1, db: Session = Depends(get_db)):
+    """Top 50 keywords (ngram=2: bigrams) in titles and content."""
     cutoff = resolve_cutoff(after, days)
-    query = db.query(Article)
+    if ngram == 1:
+        result = columnar("keyword_frequency", cutoff)
+        if result is not None:
+            return result
+    query = db.query(Article.title, Article.content).filter(Article.canonical_id == None)
     if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
-    articles = query.all()
-    all_words = []
-    for a in articles:
-        if a.title:
-            all_words.extend(extract_keywords(a.title))
-        if a.content:
-            all_words.extend(extract_keywords(a.content))
-    freq = Counter(all_words).most_common(50)
-    return [{"word": w, "count": c} for w, c in freq]
+        query = query.filter(since(Article.published_at, cutoff))
+    texts = (text for row in query.yield_per(5000) for text in row)
+    return [{"word": w, "count": c} for w, c in count_keywords(texts, top=50, ngram=ngram)]
 
 
 @router.get("/source-sentiment")
 def source_sentiment(after: str = None, days: int = None, db: Session = Depends(get_db)):
     cutoff = resolve_cutoff(after, days)
+    result = columnar("source_sentiment", cutoff)
+    if result is not None:
+        return result
     query = db.query(
         Article.source,
         SentimentResult.label,
         func.count(SentimentResult.id)
     ).join(SentimentResult, SentimentResult.article_id == Article.id)
     if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
+        query = query.filter(since(Article.published_at, cutoff))
     results = query.group_by(Article.source, SentimentResult.label).all()
     data = {}
     for source, label, count in results:
@@ -167,6 +169,9 @@ def source_sentiment(after: str = None, days: int = None, db: Session = Depends(
 @router.get("/top-entities")
 def top_entities(limit: int = 100, after: str = None, days: int = None, db: Session = Depends(get_db)):
     cutoff = resolve_cutoff(after, days)
+    result = columnar("top_entities", cutoff, limit)
+    if result is not None:
+        return result
     query = db.query(
         ArticleEntity.entity,
         ArticleEntity.entity_type,
@@ -174,7 +179,7 @@ def top_entities(limit: int = 100, after: str = None, days: int = None, db: Sess
     ).join(Article, Article.id == ArticleEntity.article_id)
 
     if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
+        query = query.filter(since(Article.published_at, cutoff))
 
     results = query.group_by(
         ArticleEntity.entity,
@@ -185,40 +190,54 @@ def top_entities(limit: int = 100, after: str = None, days: int = None, db: Sess
 
 @router.get("/entity-trend/{entity_name}")
 def entity_trend(entity_name: str, after: str = None, days: int = None, db: Session = Depends(get_db)):
+    """Articles per day mentioning the entity."""
     cutoff = resolve_cutoff(after, days)
-    query = db.query(
-        cast(ArticleEntity.created_at, Date).label("day"),
-        func.count(ArticleEntity.id)
-    ).filter(ArticleEntity.entity.ilike(f"%{entity_name}%"))
-    if cutoff:
-        query = query.filter(cast(ArticleEntity.created_at, Date) >= cutoff)
-    results = query.group_by("day").order_by("day").all()
-    return {str(day): count for day, count in results}
+    series = entity_sentiment.series(db, [entity_name], cutoff)[entity_name]
+    return {day: sum(point[label] for label in entity_sentiment.LABELS) for day, point in series.items()}
 
 
 @router.get("/entity-sentiment/{entity_name}")
-def entity_sentiment(entity_name: str, after: str = None, days: int = None, db: Session = Depends(get_db)):
+def entity_sentiment_summary(entity_name: str, after: str = None, days: int = None, db: Session = Depends(get_db)):
     cutoff = resolve_cutoff(after, days)
-    query = (
-        db.query(
-            SentimentResult.label,
-            func.count(SentimentResult.id)
-        )
-        .join(Article, Article.id == SentimentResult.article_id)
-        .join(ArticleEntity, ArticleEntity.article_id == Article.id)
-        .filter(ArticleEntity.entity.ilike(f"%{entity_name}%"))
-    )
-    if cutoff:
-        query = query.filter(cast(Article.published_at, Date) >= cutoff)
-    results = query.group_by(SentimentResult.label).all()
-    summary = {"positive": 0, "negative": 0, "neutral": 0, "error": 0}
-    for label, count in results:
-        summary[label] = count
-    return summary
+    return entity_sentiment.summary(db, [entity_name], cutoff)[entity_name]
+
+
+def _compared(db: Session, entity: list, cutoff) -> list:
+    # with no entities given, compare the most mentioned ones
+    return entity[:20] if entity else entity_sentiment.top_entities(db, cutoff)
+
+
+@router.get("/entity-sentiment")
+def entity_sentiment_compare(entity: list[str] = Query(default=[]), after: str = None, days: int = None,
+                             db: Session = Depends(get_db)):
+    """Sentiment totals for several entities: ?entity=A&entity=B."""
+    cutoff = resolve_cutoff(after, days)
+    return entity_sentiment.summary(db, _compared(db, entity, cutoff), cutoff)
+
+
+@router.get("/entity-sentiment-trend")
+def entity_sentiment_trend(entity: list[str] = Query(default=[]), after: str = None, days: int = None,
+                           db: Session = Depends(get_db)):
+    """Daily sentiment counts and mean score for several entities: ?entity=A&entity=B."""
+    cutoff = resolve_cutoff(after, days)
+    return entity_sentiment.series(db, _compared(db, entity, cutoff), cutoff)
+
+
+@router.get("/entity-graph/{entity}")
+def entity_graph_neighbors(entity: str, entity_type: str = None, limit: int = 20, min_count: int = 1,
+                           after: str = None, days: int = None, db: Session = Depends(get_db)):
+    """Entities most often mentioned in the same articles, from the co-occurrence table."""
+    cutoff = resolve_cutoff(after, days)
+    return entity_graph.neighbors(db, entity, entity_type=entity_type, cutoff=cutoff,
+                                  limit=min(limit, 200), min_count=min_count)
 
 
 @router.get("/article/{article_id}/entities")
 def article_entities(article_id: int, db: Session = Depends(get_db)):
+    # near-duplicates carry no entities of their own; use the canonical article's
+    canonical_id = db.query(Article.canonical_id).filter(Article.id == article_id).scalar()
+    article_id = canonical_id or article_id
+
     results = (
         db.query(
             ArticleEntity.entity,
@@ -240,6 +259,67 @@ def trending_entities(days: int = 7, after: str = None, db: Session = Depends(ge
         func.count(ArticleEntity.id)
     )
     if cutoff:
-        query = query.filter(cast(ArticleEntity.created_at, Date) >= cutoff)
+        query = query.filter(since(ArticleEntity.created_at, cutoff))
     results = query.group_by(ArticleEntity.entity, ArticleEntity.entity_type).order_by(func.count(ArticleEntity.id).desc()).limit(20).all()
-    return [{"entity": e, "type": t, "count": c} for e, t, c in results]
\ No newline at end of file
+    return [{"entity": e, "type": t, "count": c} for e, t, c in results]
+
+
+@router.get("/dashboard-bundle")
+def dashboard_bundle(after: str = None, days: int = None, db: Session = Depends(get_db)):
+    """Every dataset the dashboard pages show, for one date range, from one session."""
+    return {
+        "sentiment_summary": sentiment_summary(after=after, days=days, db=db),
+        "daily_sentiment": daily_sentiment(after=after, days=days, db=db),
+        "keyword_frequency": keyword_frequency(after=after, days=days, db=db),
+        "source_sentiment": source_sentiment(after=after, days=days, db=db),
+        "top_entities": top_entities(limit=TOP_ENTITIES, after=after, days=days, db=db),
+    }
+
+
+@router.get("/stories")
+def stories(hours: int = 24, limit: int = 20, db: Session = Depends(get_db)):
+    """Stories with the most coverage among those active in the last `hours`."""
+    since = datetime.utcnow() - timedelta(hours=hours)
+    top = (
+        db.query(Story)
+        .filter(Story.last_seen_at >= since)
+        .order_by(Story.article_count.desc(), Story.last_seen_at.desc())
+        .limit(limit)
+        .all()
+    )
+    if not top:
+        return []
+    ids = [s.id for s in top]
+
+    # near-duplicates of a story's articles count as extra coverage
+    duplicates = dict(
+        db.query(ArticleStory.story_id, func.count(Article.id))
+        .join(Article, Article.canonical_id == ArticleStory.article_id)
+        .filter(ArticleStory.story_id.in_(ids))
+        .group_by(ArticleStory.story_id)
+        .all()
+    )
+
+    sentiment = {}
+    rows = (
+        db.query(ArticleStory.story_id, SentimentResult.label, func.count(SentimentResult.id))
+        .join(SentimentResult, SentimentResult.article_id == ArticleStory.article_id)
+        .filter(ArticleStory.story_id.in_(ids))
+        .group_by(ArticleStory.story_id, SentimentResult.label)
+        .all()
+    )
+    for story_id, label, count in rows:
+        sentiment.setdefault(story_id, {"positive": 0, "negative": 0, "neutral": 0, "error": 0})[label] = count
+
+    return [
+        {
+            "id": s.id,
+            "title": s.title,
+            "articles": s.article_count,
+            "coverage": s.article_count + duplicates.get(s.id, 0),
+            "first_seen": str(s.first_seen_at),
+            "last_seen": str(s.last_seen_at),
+            "sentiment": sentiment.get(s.id, {"positive": 0, "negative": 0, "neutral": 0, "error": 0}),
+        }
+        for s in top
+    ]
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from app.db.database import get_db
+from app.db.models import ScraperNode, FeedHealth
+from app.api.instrumentation import TimedRoute
+from app.scrapers.sharding import HEARTBEAT_TTL
+from app.scrapers.feed_health import worst_offenders
+
+router = APIRouter(prefix="/feeds", tags=["Feeds"], route_class=TimedRoute)
+
+
+@router.get("/shards")
+def shard_progress(db: Session = Depends(get_db)):
+    """Per-node sweep progress for sharded RSS scrapers."""
+    live_cutoff = datetime.utcnow() - timedelta(seconds=HEARTBEAT_TTL)
+    nodes = db.query(ScraperNode).order_by(ScraperNode.node_id).all()
+    return [
+        {
+            "node_id": n.node_id,
+            "live": bool(n.last_heartbeat and n.last_heartbeat >= live_cutoff),
+            "last_heartbeat": str(n.last_heartbeat),
+            "feeds_owned": n.feeds_owned,
+            "feeds_done": n.feeds_done,
+            "progress": round(n.feeds_done / n.feeds_owned, 4) if n.feeds_owned else None,
+            "articles_inserted": n.articles_inserted,
+            "sweep_started_at": str(n.sweep_started_at) if n.sweep_started_at else None,
+            "sweep_finished_at": str(n.sweep_finished_at) if n.sweep_finished_at else None,
+        }
+        for n in nodes
+    ]
+
+
+@router.get("/health")
+def feed_health(
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Quarantine summary plus the feeds failing most often."""
+    now = datetime.utcnow()
+    return {
+        "tracked": db.query(FeedHealth).count(),
+        "quarantined": db.query(FeedHealth).filter(FeedHealth.quarantined_until > now).count(),
+        "worst_offenders": worst_offenders(db, limit=limit),
+    }
@@ -0,0 +1,52 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.live import BROADCASTER, TooManySubscribers
+
+router = APIRouter(prefix="/live", tags=["Live"])
+
+KEEPALIVE_SECONDS = 15
+
+
+async def event_stream(request: Request, sub):
+    """SSE frames for one subscriber until the client goes away."""
+    reported = 0
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(sub.queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield b": keepalive\n\n"
+                continue
+
+            if sub.dropped > reported:
+                # the client missed deltas; it should re-fetch the aggregates
+                yield f'event: lagged\ndata: {{"dropped": {sub.dropped - reported}}}\n\n'.encode("utf-8")
+                reported = sub.dropped
+            yield frame
+    finally:
+        BROADCASTER.unsubscribe(sub)
+
+
+@router.get("/stream")
+async def stream(request: Request):
+    """Server-sent events: `article` per newly enriched article, `delta` per batch.
+
+    Deltas add to the /analytics/dashboard-bundle datasets (see
+    app.services.live.apply_delta); re-fetch the bundle after `lagged`.
+    """
+    try:
+        sub = BROADCASTER.subscribe()
+    except TooManySubscribers:
+        raise HTTPException(status_code=503, detail="Too many live subscribers")
+
+    return StreamingResponse(
+        event_stream(request, sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,142 @@
+# app/scrapers/feed_body.py
+
+import os
+import zlib
+
+from app.utils.metrics import FEED_BYTES_WIRE, FEED_BYTES_DECODED
+
+try:  # optional: only advertised when installed
+    import brotli
+except ImportError:
+    brotli = None
+
+# older brotli releases can't bound a decompress call, so a bomb would
+# inflate a whole chunk before the size check; don't accept br from those
+if brotli is not None and not hasattr(brotli.Decompressor, "can_accept_more_data"):
+    brotli = None
+
+
+# Hard cap on a decoded feed body; runaway or hostile feeds are dropped
+MAX_FEED_BYTES = int(os.getenv("RSS_MAX_FEED_BYTES", 10 * 1024 * 1024))
+READ_CHUNK = 64 * 1024
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+
+class FeedTooLarge(Exception):
+    """Feed body exceeded MAX_FEED_BYTES."""
+
+
+# -------------------------
+# Decoders
+# -------------------------
+class _Identity:
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Zlib:
+    """gzip / deflate with bounded output per call (zip-bomb safe)."""
+
+    def __init__(self, encoding: str):
+        # deflate is supposed to be zlib-wrapped, but raw deflate is common too
+        self._wbits = 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+        self._obj = zlib.decompressobj(self._wbits)
+        self._raw_fallback = encoding == "deflate"
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        try:
+            out = self._obj.decompress(data, max_length)
+        except zlib.error:
+            if not self._raw_fallback:
+                raise
+            self._raw_fallback = False
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            out = self._obj.decompress(data, max_length)
+        # anything left in unconsumed_tail means out hit max_length: the caller
+        # sees the body is over its cap and stops, the rest is never inflated
+        self._raw_fallback = False
+        return out
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _Brotli:
+    """br with bounded output per call (brotli >= 1.1)."""
+
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        out = self._obj.process(data, output_buffer_limit=max_length)
+        # input it couldn't take yet stays buffered inside the decompressor;
+        # drain it without passing max_length, the caller stops past that
+        while not self._obj.can_accept_more_data() and len(out) < max_length:
+            more = self._obj.process(b"", output_buffer_limit=max_length - len(out))
+            if not more:
+                break
+            out += more
+        return out
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _decoder(content_encoding: str):
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return _Zlib("gzip")
+    if encoding == "deflate":
+        return _Zlib("deflate")
+    if encoding == "br" and brotli is not None:
+        return _Brotli()
+    if encoding == "identity":
+        return _Identity()
+    raise ValueError(f"unsupported Content-Encoding: {content_encoding}")
+
+
+# -------------------------
+# Reading a response
+# -------------------------
+def read_body(response, max_bytes: int = None) -> bytes:
+    """Read and decode an HTTP response body chunk by chunk.
+
+    Compressed bytes are inflated as they arrive, and reading stops as soon
+    as the decoded size passes max_bytes, so a runaway feed never gets fully
+    buffered.
+    """
+    max_bytes = max_bytes or MAX_FEED_BYTES
+    headers = response.headers
+
+    declared = headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise FeedTooLarge(f"Content-Length {declared} exceeds {max_bytes} bytes")
+
+    decoder = _decoder(headers.get("Content-Encoding"))
+    parts, wire, decoded = [], 0, 0
+
+    while True:
+        chunk = response.read(READ_CHUNK)
+        if not chunk:
+            break
+        wire += len(chunk)
+
+        out = decoder.decompress(chunk, max_bytes - decoded + 1)
+        decoded += len(out)
+        if decoded > max_bytes or wire > max_bytes:
+            raise FeedTooLarge(f"decoded body exceeds {max_bytes} bytes")
+        parts.append(out)
+
+    tail = decoder.flush()
+    decoded += len(tail)
+    if decoded > max_bytes:
+        raise FeedTooLarge(f"decoded body exceeds {max_bytes} bytes")
+    parts.append(tail)
+
+    FEED_BYTES_WIRE.inc(wire)
+    FEED_BYTES_DECODED.inc(decoded)
+    return b"".join(parts)
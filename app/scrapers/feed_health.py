@@ -0,0 +1,268 @@
+# app/scrapers/feed_health.py
+
+import os
+import socket
+import threading
+import urllib.error
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.db.database import call_with_timeout
+from app.db.models import FeedHealth
+from app.scrapers.politeness import HostBackoff, RobotsDisallowed
+from app.scrapers.feed_body import FeedTooLarge
+from app.utils.metrics import FEEDS_QUARANTINE_SKIPPED
+
+
+# Failures in a row before a feed is quarantined
+QUARANTINE_AFTER = int(os.getenv("RSS_QUARANTINE_AFTER", 2))
+# First quarantine lasts BACKOFF_BASE seconds and doubles per further failure
+BACKOFF_BASE = int(os.getenv("RSS_BACKOFF_BASE", 1800))       # one sweep
+BACKOFF_MAX = int(os.getenv("RSS_BACKOFF_MAX", 7 * 24 * 3600))  # one week
+
+LATENCY_ALPHA = 0.2
+BATCH_SIZE = 500  # URLs per IN (...) query
+
+
+def classify_error(exc: Exception) -> str:
+    """Short status string for a fetch / parse exception."""
+    if isinstance(exc, HostBackoff):
+        return "throttled"
+    if isinstance(exc, RobotsDisallowed):
+        return "robots"
+    if isinstance(exc, FeedTooLarge):
+        return "too_large"
+    if isinstance(exc, urllib.error.HTTPError):
+        return f"http_{exc.code}"
+    if isinstance(exc, urllib.error.URLError):
+        exc = exc.reason if isinstance(exc.reason, Exception) else exc
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, socket.gaierror):
+        return "dns"
+    if isinstance(exc, ConnectionError):
+        return "connection"
+    return "error"
+
+
+def backoff_seconds(consecutive_failures: int) -> int:
+    """Quarantine length for a feed, 0 while under the threshold."""
+    if consecutive_failures < QUARANTINE_AFTER:
+        return 0
+    exponent = min(consecutive_failures - QUARANTINE_AFTER, 32)
+    return min(BACKOFF_BASE * 2 ** exponent, BACKOFF_MAX)
+
+
+# -------------------------
+# Skipping quarantined feeds
+# -------------------------
+def quarantined_urls(db, urls: list, now=None) -> set:
+    """Which of `urls` are still in quarantine."""
+    now = now or datetime.utcnow()
+    blocked = set()
+    for i in range(0, len(urls), BATCH_SIZE):
+        rows = (
+            db.query(FeedHealth.url)
+            .filter(FeedHealth.url.in_(urls[i:i + BATCH_SIZE]))
+            .filter(FeedHealth.quarantined_until > now)
+            .all()
+        )
+        blocked.update(r[0] for r in rows)
+    return blocked
+
+
+# quarantine list from the last bounded read, reused when the database is slow
+_last_blocked = set()
+
+
+def skip_quarantined(db, feeds: dict, timeout: float = None) -> dict:
+    """Drop feeds still in quarantine from a category -> urls mapping.
+
+    With a timeout (spooling sweeps) the lookup runs on its own session, and
+    if the database doesn't answer in time the last list read is used.
+    """
+    global _last_blocked
+    urls = [u for urls in feeds.values() for u in urls]
+
+    if timeout is None:
+        try:
+            blocked = quarantined_urls(db, urls)
+        except Exception as e:
+            print(f"[WARN] Could not read feed health, fetching everything: {e}")
+            db.rollback()
+            return feeds
+    else:
+        def read():
+            with Session(db.get_bind()) as own:
+                return quarantined_urls(own, urls)
+        try:
+            blocked = _last_blocked = call_with_timeout(read, timeout)
+        except Exception as e:
+            print(f"[WARN] Could not read feed health, using the last quarantine list: {e}")
+            blocked = _last_blocked
+
+    if not blocked:
+        return feeds
+
+    kept, skipped = {}, 0
+    for category, urls in feeds.items():
+        live = [u for u in urls if u not in blocked]
+        skipped += len(urls) - len(live)
+        if live:
+            kept[category] = live
+
+    if skipped:
+        FEEDS_QUARANTINE_SKIPPED.inc(skipped)
+        print(f"[HEALTH] Skipping {skipped} quarantined feeds")
+    return kept
+
+
+# -------------------------
+# Recording outcomes
+# -------------------------
+class HealthTracker:
+    """Collects fetch outcomes during a scrape and writes them in one go.
+
+    Thread-safe, so the pipelined fetchers can share one tracker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes = {}  # url -> [status, seconds, error, bozo]
+
+    def __len__(self):
+        return len(self._outcomes)
+
+    def success(self, url: str, seconds: float, bozo: bool = False):
+        with self._lock:
+            self._outcomes[url] = ["ok", seconds, None, bozo]
+
+    def failure(self, url: str, exc: Exception, seconds: float = None, status: str = None):
+        status = status or classify_error(exc)
+        with self._lock:
+            previous = self._outcomes.get(url)
+            if seconds is None and previous:
+                seconds = previous[1]
+            self._outcomes[url] = [status, seconds, str(exc)[:1000], False]
+
+    def bozo(self, url: str):
+        with self._lock:
+            if url in self._outcomes:
+                self._outcomes[url][3] = True
+
+    def flush(self, db, timeout: float = None):
+        """Upsert feed_health rows for everything recorded so far.
+
+        With a timeout the write runs on its own session and the caller waits
+        at most that long; a slow write finishes in the background.
+        """
+        if timeout is not None:
+            def write():
+                with Session(db.get_bind()) as own:
+                    self.flush(own)
+            try:
+                call_with_timeout(write, timeout)
+            except TimeoutError:
+                print(f"[WARN] Feed health still saving after {timeout}s; not waiting for it")
+            return
+
+        with self._lock:
+            outcomes, self._outcomes = self._outcomes, {}
+        if not outcomes:
+            return
+
+        now = datetime.utcnow()
+        urls = list(outcomes)
+        try:
+            for i in range(0, len(urls), BATCH_SIZE):
+                batch = urls[i:i + BATCH_SIZE]
+                rows = {
+                    r.url: r
+                    for r in db.query(FeedHealth).filter(FeedHealth.url.in_(batch)).all()
+                }
+                new_rows = []
+                for url in batch:
+                    row = rows.get(url)
+                    if row is None:
+                        row = FeedHealth(url=url)
+                        new_rows.append(row)
+                    _apply(row, *outcomes[url], now=now)
+                db.add_all(new_rows)
+            db.commit()
+        except Exception as e:
+            print(f"[WARN] Could not save feed health: {e}")
+            db.rollback()
+
+
+def _apply(row: FeedHealth, status, seconds, error, bozo, now):
+    row.last_attempt_at = now
+    row.last_status = status
+    if status == "throttled":
+        # skipped for the host's sake; says nothing about the feed itself
+        return
+
+    row.total_fetches = (row.total_fetches or 0) + 1
+
+    if seconds is not None:
+        if row.avg_latency is None:
+            row.avg_latency = seconds
+        else:
+            row.avg_latency += LATENCY_ALPHA * (seconds - row.avg_latency)
+
+    if status == "ok":
+        row.last_success_at = now
+        row.last_error = None
+        row.consecutive_failures = 0
+        row.quarantined_until = None
+        if bozo:
+            row.bozo_count = (row.bozo_count or 0) + 1
+        return
+
+    row.last_error = error
+    row.total_failures = (row.total_failures or 0) + 1
+    row.consecutive_failures = (row.consecutive_failures or 0) + 1
+
+    wait = backoff_seconds(row.consecutive_failures)
+    row.quarantined_until = now + timedelta(seconds=wait) if wait else None
+
+
+# -------------------------
+# Report
+# -------------------------
+def worst_offenders(db, limit: int = 50) -> list:
+    rows = (
+        db.query(FeedHealth)
+        .filter(FeedHealth.total_failures > 0)
+        .order_by(
+            FeedHealth.consecutive_failures.desc(),
+            FeedHealth.total_failures.desc(),
+        )
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "url": r.url,
+            "last_status": r.last_status,
+            "last_error": r.last_error,
+            "consecutive_failures": r.consecutive_failures,
+            "failure_rate": round(r.total_failures / r.total_fetches, 4) if r.total_fetches else None,
+            "bozo_rate": round((r.bozo_count or 0) / r.total_fetches, 4) if r.total_fetches else None,
+            "avg_latency": round(r.avg_latency, 3) if r.avg_latency is not None else None,
+            "last_success_at": str(r.last_success_at) if r.last_success_at else None,
+            "quarantined_until": str(r.quarantined_until) if r.quarantined_until else None,
+        }
+        for r in rows
+    ]
+
+
+if __name__ == "__main__":
+    from app.db.database import SessionLocal
+
+    with SessionLocal() as db:
+        for row in worst_offenders(db, limit=25):
+            print(
+                f"{row['consecutive_failures']:>4} fails  {row['last_status'] or '-':<12} "
+                f"until {row['quarantined_until'] or '-':<26} {row['url']}"
+            )
@@ -0,0 +1,289 @@
+# app/scrapers/politeness.py
+
+import os
+import socket
+import threading
+import time
+import urllib.request
+import urllib.robotparser
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from app.utils.metrics import HOST_WAIT_SECONDS, HOST_THROTTLED
+
+
+# Per-host request budget: HOST_RATE requests/second (0 = unlimited) with bursts of HOST_BURST
+HOST_RATE = float(os.getenv("RSS_HOST_RATE", 1.0))
+HOST_BURST = int(os.getenv("RSS_HOST_BURST", 3))
+HOST_CONCURRENCY = int(os.getenv("RSS_HOST_CONCURRENCY", 2))
+
+# Give up on a host for this sweep instead of parking a fetcher longer than this
+HOST_MAX_WAIT = float(os.getenv("RSS_HOST_MAX_WAIT", 30))
+
+# Backoff after a 429/503 without a usable Retry-After
+THROTTLE_BACKOFF_BASE = 30
+THROTTLE_BACKOFF_MAX = 3600
+
+# RSS_ROBOTS=1: fetch robots.txt once per host for Crawl-delay / Disallow
+RESPECT_ROBOTS = os.getenv("RSS_ROBOTS") == "1"
+ROBOTS_AGENT = "GlobalPulseRSS"
+ROBOTS_TTL = 24 * 3600
+ROBOTS_TIMEOUT = 5
+
+DNS_TTL = int(os.getenv("RSS_DNS_TTL", 300))  # 0 disables the cache
+DNS_NEGATIVE_TTL = 60
+DNS_CACHE_SIZE = 50_000
+
+
+class HostBackoff(Exception):
+    """The host asked us to slow down; skip the feed this sweep."""
+
+
+class RobotsDisallowed(Exception):
+    """robots.txt disallows fetching this feed."""
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def parse_retry_after(value, now=None) -> float:
+    """Retry-After header (seconds or HTTP date) -> seconds, None if unusable."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max((when - now).total_seconds(), 0.0)
+
+
+# -------------------------
+# Token bucket
+# -------------------------
+class TokenBucket:
+    """Classic token bucket; reserve() hands out the wait for the next token."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self.rate = rate
+
+    def reserve(self) -> float:
+        """Take a token, returning how long the caller must sleep before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self):
+        """Give back a reserved token that was not used."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+# -------------------------
+# Per-host limiter
+# -------------------------
+class _Host:
+    def __init__(self, rate, burst, concurrency):
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.blocked_until = 0.0
+        self.throttles = 0
+        self.robots = None
+        self.robots_checked = None
+        self.lock = threading.Lock()
+
+
+class HostLimiter:
+    """Rate limit, concurrency cap and 429/503 backoff, all per host."""
+
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST, concurrency=HOST_CONCURRENCY,
+                 max_wait=HOST_MAX_WAIT, respect_robots=RESPECT_ROBOTS):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_wait = max_wait
+        self.respect_robots = respect_robots
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> _Host:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _Host(self.rate, self.burst, self.concurrency)
+            return state
+
+    def _check_blocked(self, host: str, state: _Host):
+        remaining = state.blocked_until - time.monotonic()
+        if remaining > self.max_wait:
+            raise HostBackoff(f"{host} backing off for another {remaining:.0f}s")
+        return max(remaining, 0.0)
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's concurrency slots once its rate limit allows."""
+        host = host_of(url)
+        state = self._host(host)
+        start = time.monotonic()
+
+        # fail fast before queueing behind the host's other fetches
+        self._check_blocked(host, state)
+        if self.respect_robots:
+            self._apply_robots(url, host, state)
+
+        if not state.slots.acquire(timeout=self.max_wait):
+            raise HostBackoff(f"{host} has no free fetch slot")
+        try:
+            wait = self._check_blocked(host, state) + state.bucket.reserve()
+            if wait > self.max_wait:
+                state.bucket.refund()
+                raise HostBackoff(f"{host} rate limit needs {wait:.0f}s")
+            if wait > 0:
+                time.sleep(wait)
+            HOST_WAIT_SECONDS.observe(time.monotonic() - start)
+            yield
+        finally:
+            state.slots.release()
+
+    def throttled(self, url: str, retry_after=None):
+        """Record a 429/503: pause the host for Retry-After or an exponential backoff."""
+        state = self._host(host_of(url))
+        HOST_THROTTLED.inc()
+        with state.lock:
+            state.throttles += 1
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = min(THROTTLE_BACKOFF_BASE * 2 ** (state.throttles - 1), THROTTLE_BACKOFF_MAX)
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+
+    def succeeded(self, url: str):
+        state = self._host(host_of(url))
+        if state.throttles:
+            with state.lock:
+                state.throttles = 0
+
+    # -------------------------
+    # robots.txt (opt-in)
+    # -------------------------
+    def _apply_robots(self, url: str, host: str, state: _Host):
+        with state.lock:
+            checked = state.robots_checked
+            if checked is None or time.monotonic() - checked > ROBOTS_TTL:
+                state.robots = _fetch_robots(url)
+                state.robots_checked = time.monotonic()
+
+                delay = state.robots.crawl_delay(ROBOTS_AGENT) if state.robots else None
+                if delay:
+                    state.bucket.set_rate(min(self.rate, 1.0 / float(delay)))
+
+        if state.robots and not state.robots.can_fetch(ROBOTS_AGENT, url):
+            raise RobotsDisallowed(f"robots.txt disallows {url}")
+
+
+def _fetch_robots(url: str):
+    """Parsed robots.txt for the url's host, None if unavailable."""
+    from app.scrapers.rss_scraper import USER_AGENT
+
+    parts = urlsplit(url)
+    robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+    try:
+        req = urllib.request.Request(robots_url, headers={"User-Agent": USER_AGENT})
+        body = urllib.request.urlopen(req, timeout=ROBOTS_TIMEOUT).read(512 * 1024)
+    except Exception:
+        return None
+
+    parser = urllib.robotparser.RobotFileParser(robots_url)
+    parser.parse(body.decode("utf-8", "replace").splitlines())
+    return parser
+
+
+def interleave_by_host(jobs):
+    """Reorder (category, url) jobs round-robin across hosts.
+
+    Feed lists are grouped by publisher, so in file order a pool of fetchers
+    ends up queued behind one host's rate limit while other hosts sit idle.
+    """
+    by_host = OrderedDict()
+    for job in jobs:
+        by_host.setdefault(host_of(job[1]), []).append(job)
+
+    queues = [iter(q) for q in by_host.values()]
+    while queues:
+        alive = []
+        for q in queues:
+            job = next(q, None)
+            if job is not None:
+                yield job
+                alive.append(q)
+        queues = alive
+
+
+# -------------------------
+# DNS cache
+# -------------------------
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache = OrderedDict()
+_dns_lock = threading.Lock()
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+
+    with _dns_lock:
+        hit = _dns_cache.get(key)
+        if hit and hit[0] > now:
+            _dns_cache.move_to_end(key)
+            result = hit[1]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+    try:
+        result = _original_getaddrinfo(*args, **kwargs)
+        expires = now + DNS_TTL
+    except socket.gaierror as e:
+        # dead domains are common in the feed list; remember those briefly too
+        result, expires = e, now + DNS_NEGATIVE_TTL
+
+    with _dns_lock:
+        _dns_cache[key] = (expires, result)
+        if len(_dns_cache) > DNS_CACHE_SIZE:
+            _dns_cache.popitem(last=False)
+
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def install_dns_cache():
+    """Route socket.getaddrinfo (used by urllib) through a TTL cache."""
+    if DNS_TTL > 0 and socket.getaddrinfo is not _cached_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+def clear_dns_cache():
+    with _dns_lock:
+        _dns_cache.clear()
@@ -0,0 +1,298 @@
+# app/scrapers/rss_pipeline.py
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import feedparser
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.scrapers.rss_loader import load_feeds
+from app.scrapers.rss_scraper import ScrapeResult, article_id, entry_records, fetch_feed
+from app.scrapers.spool import DB_TIMEOUT, get_writer
+from app.scrapers.feed_health import HealthTracker, skip_quarantined
+from app.scrapers.politeness import install_dns_cache, interleave_by_host
+from app.db.database import SessionLocal
+from app.db.models import Article
+from app.services.dedup import get_index, link_duplicates
+from app.utils.metrics import (
+    FEED_FETCH_OK,
+    FEED_FETCH_ERROR,
+    FEED_FETCH_SECONDS,
+    FEED_PARSE_SECONDS,
+    FEED_ENTRIES,
+    ARTICLES_INSERTED,
+)
+from app.utils.tracing import span
+
+
+FETCH_WORKERS = int(os.getenv("RSS_FETCH_WORKERS", 16))
+PARSE_WORKERS = int(os.getenv("RSS_PARSE_WORKERS", 0)) or os.cpu_count() or 1
+# max fetched-but-unparsed feeds, and max parses in flight
+QUEUE_SIZE = int(os.getenv("RSS_PIPELINE_QUEUE", 64))
+
+_DONE = object()
+
+# database down or unreachable, as opposed to a conflict on one row
+UNAVAILABLE = (OperationalError, InterfaceError)
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+# -------------------------
+# Parse stage (runs in worker processes)
+# -------------------------
+def parse_feed_bytes(raw: bytes):
+    """feedparser + clean_html on raw bytes.
+
+    Returns (entries_seen, bozo_message, records, seconds) where records
+    are EntryRecords.
+    """
+    start = time.perf_counter()
+    feed = feedparser.parse(raw)
+    entries = getattr(feed, "entries", None) or []
+
+    bozo = None
+    if getattr(feed, "bozo", False):
+        bozo = str(getattr(feed, "bozo_exception", ""))
+
+    return len(entries), bozo, entry_records(entries), time.perf_counter() - start
+
+
+# -------------------------
+# Single DB writer
+# -------------------------
+def write_records(db, category: str, records: list) -> list:
+    """Insert one feed's records, skipping URLs that already exist."""
+    links = {r[1] for r in records}
+    existing = {
+        url for (url,) in db.query(Article.url).filter(Article.url.in_(links)).all()
+    }
+
+    articles = []
+    for title, link, summary, published in records:
+        if link in existing:
+            continue
+        existing.add(link)
+        articles.append(Article(
+            title=title,
+            url=link,
+            source=category,
+            published_at=published,
+            content=summary,
+        ))
+
+    if not articles:
+        return []
+
+    try:
+        db.add_all(articles)
+        db.flush()
+        link_duplicates(db, articles)
+        db.commit()
+        return articles
+    except UNAVAILABLE:
+        # retrying row by row would only drop every row; let the caller retry
+        db.rollback()
+        raise
+    except Exception:
+        # another writer got there first; fall back to one row at a time
+        db.rollback()
+
+    inserted = []
+    for article in articles:
+        try:
+            db.add(article)
+            db.flush()
+            link_duplicates(db, [article])
+            db.commit()
+            inserted.append(article)
+        except UNAVAILABLE:
+            db.rollback()
+            raise
+        except Exception as e:
+            print(f"[ERROR] Failed inserting {article.url}: {e}")
+            db.rollback()
+    return inserted
+
+
+# -------------------------
+# Pipeline
+# -------------------------
+def _fetch_stage(jobs: queue.Queue, raw_queue: queue.Queue, stop: threading.Event, health: HealthTracker):
+    while not stop.is_set():
+        job = jobs.get()
+        if job is _DONE:
+            return
+
+        category, url = job
+        start = time.perf_counter()
+        try:
+            raw = fetch_feed(url)
+            FEED_FETCH_OK.inc()
+            health.success(url, time.perf_counter() - start)
+        except Exception as e:
+            FEED_FETCH_ERROR.inc()
+            health.failure(url, e, time.perf_counter() - start)
+            print(f"[RSS ERROR] Could not fetch feed: {url}\n -> {e}")
+            raw = None  # still passed on, so the writer counts the feed as done
+        finally:
+            FEED_FETCH_SECONDS.observe(time.perf_counter() - start)
+
+        # blocks while the parse stage is behind
+        if not _put(raw_queue, (category, url, raw), stop):
+            return
+
+
+def _dispatch_stage(raw_queue: queue.Queue, parsed_queue: queue.Queue, pool, fetchers: int, stop: threading.Event):
+    finished = 0
+    while finished < fetchers and not stop.is_set():
+        try:
+            item = raw_queue.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        if item is _DONE:
+            finished += 1
+            continue
+
+        category, url, raw = item
+        future = None if raw is None else pool.submit(parse_feed_bytes, raw)
+        # blocks while the writer is behind
+        if not _put(parsed_queue, (category, url, future), stop):
+            if future is not None:
+                future.cancel()
+            return
+
+    _put(parsed_queue, _DONE, stop)
+
+
+def _store(db, writer, health, result, category, url, future):
+    """Writer side of one fetched feed: wait for its parse, then spool or insert."""
+    try:
+        seen, bozo, records, seconds = future.result()
+    except Exception as e:
+        health.failure(url, e, status="parse_error")
+        print(f"[RSS ERROR] Could not parse feed: {url}\n -> {e}")
+        return
+
+    FEED_PARSE_SECONDS.observe(seconds)
+    FEED_ENTRIES.inc(seen)
+    if bozo:
+        health.bozo(url)
+        print(f"[WARN] Feed parse issue ({url}): {bozo}")
+    if not records:
+        return
+
+    if writer is not None:
+        with span("pipeline.spool", url=url):
+            result.spooled += writer.append(category, records)
+        return
+
+    with span("pipeline.write", url=url):
+        inserted = write_records(db, category, records)
+    ARTICLES_INSERTED.inc(len(inserted))
+    result.article_ids.extend(article_id(a) for a in inserted)
+
+
+def scrape_rss_pipelined(custom_feeds=None, fetch_workers=None, parse_workers=None, queue_size=None,
+                         progress=None):
+    """Concurrent fetch -> process-pool parse -> single DB writer (or the spool).
+
+    Returns a ScrapeResult: new article ids, or the spooled count with RSS_SPOOL=1.
+    Raw bytes and pending parses each sit in a bounded queue, so memory stays
+    bounded by queue_size feeds no matter how many URLs are scheduled.
+    progress(feeds_done, result), if given, is called from the writer after
+    each feed, fetched or not.
+    """
+    fetch_workers = fetch_workers or FETCH_WORKERS
+    parse_workers = parse_workers or PARSE_WORKERS
+    queue_size = queue_size or QUEUE_SIZE
+    install_dns_cache()
+
+    feeds = custom_feeds or load_feeds()
+    health = HealthTracker()
+    db = SessionLocal()
+    # RSS_SPOOL=1: parsed records go to the write-ahead spool, not the database
+    writer = get_writer()
+    # while spooling, the database gets DB_TIMEOUT seconds and no more
+    timeout = DB_TIMEOUT if writer is not None else None
+    feeds = skip_quarantined(db, feeds, timeout)
+    if writer is None:
+        get_index(db)
+
+    jobs = queue.Queue()
+    # spread each host's feeds out so fetchers don't all wait on one rate limit
+    for job in interleave_by_host(
+        (category, url) for category, feed_urls in feeds.items() for url in feed_urls
+    ):
+        jobs.put(job)
+    for _ in range(fetch_workers):
+        jobs.put(_DONE)
+
+    raw_queue = queue.Queue(maxsize=queue_size)
+    parsed_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    result = ScrapeResult()
+
+    print(f"[PIPELINE] {jobs.qsize() - fetch_workers} feeds, {fetch_workers} fetchers, {parse_workers} parsers")
+
+    try:
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+
+            def fetch_then_signal():
+                try:
+                    _fetch_stage(jobs, raw_queue, stop, health)
+                finally:
+                    _put(raw_queue, _DONE, stop)
+
+            fetchers = [
+                threading.Thread(target=fetch_then_signal, daemon=True)
+                for _ in range(fetch_workers)
+            ]
+            dispatcher = threading.Thread(
+                target=_dispatch_stage,
+                args=(raw_queue, parsed_queue, pool, fetch_workers, stop),
+                daemon=True,
+            )
+            for t in fetchers:
+                t.start()
+            dispatcher.start()
+
+            try:
+                done = 0
+                while True:
+                    item = parsed_queue.get()
+                    if item is _DONE:
+                        break
+
+                    category, url, future = item
+                    if future is not None:
+                        _store(db, writer, health, result, category, url, future)
+                    done += 1
+                    if progress is not None:
+                        progress(done, result)
+            finally:
+                # on a writer error this releases any stage blocked on a full queue
+                stop.set()
+
+            for t in fetchers:
+                t.join()
+            dispatcher.join()
+    finally:
+        if writer is not None:
+            writer.sync()
+        health.flush(db, timeout)
+        db.close()
+
+    return result
@@ -1,23 +1,42 @@
 # app/scrapers/rss_scraper.py
 
 import feedparser
+import urllib.error
 import urllib.request
+import time
+from array import array
 from datetime import datetime
-from bs4 import BeautifulSoup
+from typing import NamedTuple
 import traceback
 
+from sqlalchemy import inspect
+
 from app.scrapers.rss_loader import load_feeds
 from app.db.database import SessionLocal
 from app.db.models import Article
+from app.utils.metrics import (
+    FEED_FETCH_OK,
+    FEED_FETCH_ERROR,
+    FEED_FETCH_SECONDS,
+    FEED_ENTRIES,
+    ARTICLES_INSERTED,
+    ARTICLE_INSERT_SECONDS,
+)
+from app.utils.tracing import span
+from app.utils.html_text import strip_html
+from app.scrapers.feed_health import HealthTracker, skip_quarantined
+from app.scrapers.politeness import HostLimiter, install_dns_cache, interleave_by_host
+from app.scrapers.feed_body import ACCEPT_ENCODING, read_body
+from app.services.dedup import get_index, link_duplicates
+from app.scrapers.spool import DB_TIMEOUT, get_writer
 
 
 # -------------------------
 # Helper: Clean HTML safely
 # -------------------------
 def clean_html(text: str) -> str:
-    if not text:
-        return ""
-    return BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+    # same output as BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+    return strip_html(text)
 
 
 # -------------------------
@@ -32,97 +51,246 @@ def parse_published(entry):
     return None
 
 
+# -------------------------
+# Compact records
+# -------------------------
+class EntryRecord(NamedTuple):
+    """What the pipeline keeps of a feed entry, instead of feedparser's nested dicts.
+
+    A plain tuple underneath: no per-instance dict, cheap to pickle between
+    parse processes, and it unpacks like the (title, link, summary,
+    published_at) tuples it replaces.
+    """
+    title: str
+    link: str
+    summary: str
+    published_at: datetime
+
+
+def entry_records(entries) -> list:
+    """EntryRecords for feed entries; entries without a link are skipped."""
+    records = []
+    for entry in entries:
+        try:
+            link = entry.get("link")
+            if not link:
+                continue
+            records.append(EntryRecord(
+                entry.get("title"),
+                link,
+                clean_html(entry.get("summary", "")),
+                parse_published(entry),
+            ))
+        except Exception:
+            continue
+    return records
+
+
+class ScrapeResult:
+    """What a scrape did, without holding on to the articles themselves.
+
+    Ids go in an array (8 bytes each), so a 200k-feed sweep keeps neither
+    ORM objects nor their content alive.
+    """
+    __slots__ = ("article_ids", "spooled")
+
+    def __init__(self):
+        self.article_ids = array("q")
+        self.spooled = 0  # entries written to the spool (RSS_SPOOL=1)
+
+    @property
+    def inserted(self) -> int:
+        return len(self.article_ids)
+
+
+def article_id(article) -> int:
+    """Primary key of a flushed or committed Article, without reloading it."""
+    return inspect(article).identity[0]
+
+
+# -------------------------
+# Network fetch
+# -------------------------
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0 Safari/537.36 GlobalPulseRSS/1.0"
+)
+FETCH_TIMEOUT = 10
+
+
+# shared by every fetcher thread in the process
+HOSTS = HostLimiter()
+
+
+def fetch_feed(url: str) -> bytes:
+    """Download raw feed bytes. Raises on network / HTTP errors.
+
+    Waits for the host's rate limit first; raises HostBackoff instead when
+    the host is throttling us for longer than HOST_MAX_WAIT, and FeedTooLarge
+    when the decoded body passes MAX_FEED_BYTES.
+    """
+    # Add browser-level headers to avoid feed blocking
+    # Compressed transfer; read_body inflates incrementally and enforces MAX_FEED_BYTES
+    req = urllib.request.Request(url, headers={
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING,
+    })
+
+    with HOSTS.slot(url), span("scrape.fetch", url=url):
+        try:
+            # Fail fast so we don't hang on bad feeds
+            with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as response:
+                raw = read_body(response)
+        except urllib.error.HTTPError as e:
+            if e.code in (429, 503):
+                HOSTS.throttled(url, e.headers.get("Retry-After") if e.headers else None)
+            raise
+
+    HOSTS.succeeded(url)
+    return raw
+
+
 # -------------------------
 # CRITICAL FIX:
 # Safe feed parsing wrapper
 # -------------------------
-def safe_parse(url: str):
+def safe_parse(url: str, health: HealthTracker = None):
     """Feedparser wrapper that avoids RemoteDisconnected & redirect loops."""
+    start = time.perf_counter()
     try:
-        # Add browser-level headers to avoid feed blocking
-        req = urllib.request.Request(
-            url,
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (X11; Linux x86_64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0 Safari/537.36 GlobalPulseRSS/1.0"
-                )
-            }
-        )
-
-        # Fail fast so we don't hang on bad feeds
-        raw_data = urllib.request.urlopen(req, timeout=10).read()
+        raw_data = fetch_feed(url)
+        fetched = time.perf_counter() - start
 
         # Parse RSS/XML from memory
-        return feedparser.parse(raw_data)
+        with span("scrape.feedparser"):
+            feed = feedparser.parse(raw_data)
+        FEED_FETCH_OK.inc()
+        if health is not None:
+            health.success(url, fetched, bozo=bool(getattr(feed, "bozo", False)))
+        return feed
 
     except Exception as e:
+        FEED_FETCH_ERROR.inc()
+        if health is not None:
+            health.failure(url, e, time.perf_counter() - start)
         print(f"[RSS ERROR] Could not parse feed: {url}\n -> {e}")
         return None
+
+    finally:
+        FEED_FETCH_SECONDS.observe(time.perf_counter() - start)
     
 # -------------------------
 # Main scraper
 # -------------------------
-def scrape_rss(custom_feeds=None):
-    feeds = custom_feeds or load_feeds()
+def scrape_rss(custom_feeds=None, progress=None) -> ScrapeResult:
+    """Fetch and store every feed once; returns the new article ids (or spooled count).
+
+    progress(feeds_done, result), if given, is called after each feed.
+    """
+    # patches socket.getaddrinfo process-wide, so only once something scrapes
+    install_dns_cache()
+    with span("scrape_rss"):
+        return _scrape_rss(custom_feeds, progress)
+
+
+def _scrape_rss(custom_feeds=None, progress=None):
+    with span("scrape.load_feeds"):
+        feeds = custom_feeds or load_feeds()
     db = SessionLocal()
-    new_articles = []
+    health = HealthTracker()
+    result = ScrapeResult()
+    # RSS_SPOOL=1: entries go to the write-ahead spool, not the database
+    writer = get_writer()
+
+    # while spooling, the database gets DB_TIMEOUT seconds and no more
+    timeout = DB_TIMEOUT if writer is not None else None
 
     try:
+        # dead feeds in backoff are not worth a 10s timeout each
+        feeds = skip_quarantined(db, feeds, timeout)
+        if writer is None:
+            get_index(db)
+
         for category, feed_urls in feeds.items():
             print(f"[SCRAPER] Category: {category} — {len(feed_urls)} feeds")
 
-            for url in feed_urls:
+        # one host's feeds back to back would each wait for its rate limit;
+        # round-robin across hosts instead, as the pipelined scraper does
+        for done, (category, url) in enumerate(interleave_by_host(
+            (category, url) for category, feed_urls in feeds.items() for url in feed_urls
+        ), 1):
+            _scrape_feed(db, writer, health, result, category, url)
+            if progress is not None:
+                progress(done, result)
+
+        return result
+
+    finally:
+        if writer is not None:
+            writer.sync()
+        health.flush(db, timeout)
+        db.close()
 
-                # SAFE parse instead of direct feedparser.parse
-                feed = safe_parse(url)
-                if not feed or not getattr(feed, "entries", None):
-                    continue  # skip broken feed
 
-                # warn if feed is malformed but still usable
-                if getattr(feed, "bozo", False):
-                    print(f"[WARN] Feed parse issue ({url}): {feed.bozo_exception}")
+def _scrape_feed(db, writer, health, result, category, url):
+    # SAFE parse instead of direct feedparser.parse
+    feed = safe_parse(url, health)
+    if not feed or not getattr(feed, "entries", None):
+        return  # skip broken feed
 
-                for entry in feed.entries:
-                    try:
-                        title = entry.get("title")
-                        link = entry.get("link")
+    # warn if feed is malformed but still usable
+    if getattr(feed, "bozo", False):
+        print(f"[WARN] Feed parse issue ({url}): {feed.bozo_exception}")
 
-                        if not link:
-                            continue
+    FEED_ENTRIES.inc(len(feed.entries))
 
-                        # Prevent duplicates
-                        if db.query(Article).filter(Article.url == link).first():
-                            continue
+    if writer is not None:
+        result.spooled += writer.append(category, entry_records(feed.entries))
+        return
 
-                        summary = clean_html(entry.get("summary", ""))
-                        published_dt = parse_published(entry)
+    for entry in feed.entries:
+        entry_start = time.perf_counter()
+        try:
+            title = entry.get("title")
+            link = entry.get("link")
 
-                        article = Article(
-                            title=title,
-                            url=link,
-                            source=category,
-                            published_at=published_dt,
-                            content=summary,
-                        )
+            if not link:
+                continue
 
-                        db.add(article)
-                        db.commit()
-                        db.refresh(article)
-                        new_articles.append(article)
+            # Prevent duplicates
+            with span("scrape.dedupe_check"):
+                exists = db.query(Article.id).filter(Article.url == link).first()
+            if exists:
+                continue
 
-                    except Exception as e:
-                        print(f"[ERROR] Failed processing entry from {url}: {e}")
-                        traceback.print_exc()
-                        db.rollback()
+            with span("scrape.clean_html"):
+                summary = clean_html(entry.get("summary", ""))
+            published_dt = parse_published(entry)
 
-        return new_articles
+            article = Article(
+                title=title,
+                url=link,
+                source=category,
+                published_at=published_dt,
+                content=summary,
+            )
 
-    finally:
-        db.close()
+            with span("scrape.commit"):
+                db.add(article)
+                db.flush()
+                link_duplicates(db, [article])
+                db.commit()
+            result.article_ids.append(article_id(article))
+            ARTICLES_INSERTED.inc()
+            ARTICLE_INSERT_SECONDS.observe(time.perf_counter() - entry_start)
+
+        except Exception as e:
+            print(f"[ERROR] Failed processing entry from {url}: {e}")
+            traceback.print_exc()
+            db.rollback()
 
 
 if __name__ == "__main__":
     r = scrape_rss()
-    print(f"Scraped {len(r)} new articles.")
\ No newline at end of file
+    print(f"Scraped {r.inserted} new articles.")
\ No newline at end of file
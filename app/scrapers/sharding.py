@@ -0,0 +1,121 @@
+# app/scrapers/sharding.py
+
+import bisect
+import hashlib
+import os
+import socket
+from datetime import datetime, timedelta
+
+from app.db.models import ScraperNode
+
+
+VNODES = 128
+HEARTBEAT_TTL = int(os.getenv("RSS_HEARTBEAT_TTL", 300))  # seconds
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# -------------------------
+# Consistent hashing
+# -------------------------
+class HashRing:
+    """Consistent-hash ring with virtual nodes.
+
+    Adding or removing one of N nodes only moves the keys in the arcs that
+    node owns, i.e. roughly 1/N of all feeds.
+    """
+
+    def __init__(self, nodes, vnodes: int = VNODES):
+        self.nodes = sorted(set(nodes))
+        if not self.nodes:
+            raise ValueError("HashRing needs at least one node")
+
+        points = []
+        for node in self.nodes:
+            for i in range(vnodes):
+                points.append((_hash(f"{node}#{i}"), node))
+        points.sort()
+
+        self._keys = [p[0] for p in points]
+        self._owners = [p[1] for p in points]
+
+    def owner(self, key: str) -> str:
+        idx = bisect.bisect(self._keys, _hash(key))
+        if idx == len(self._keys):
+            idx = 0
+        return self._owners[idx]
+
+
+def filter_feeds(feeds: dict, ring: HashRing, node: str) -> dict:
+    """Subset of a category -> urls mapping owned by `node`."""
+    owned = {}
+    for category, urls in feeds.items():
+        mine = [u for u in urls if ring.owner(u) == node]
+        if mine:
+            owned[category] = mine
+    return owned
+
+
+def static_node_name(shard_id: int) -> str:
+    return f"shard-{shard_id}"
+
+
+def shard_feeds(feeds: dict, shard_id: int, shard_count: int) -> dict:
+    """Static sharding: shard_id out of shard_count fixed shards."""
+    if not 0 <= shard_id < shard_count:
+        raise ValueError(f"shard_id {shard_id} outside 0..{shard_count - 1}")
+    ring = HashRing([static_node_name(i) for i in range(shard_count)])
+    return filter_feeds(feeds, ring, static_node_name(shard_id))
+
+
+# -------------------------
+# Membership + progress (scraper_nodes table)
+# -------------------------
+def default_node_id() -> str:
+    return os.getenv("RSS_NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+
+def heartbeat(db, node_id: str, **progress) -> ScraperNode:
+    """Upsert this node's row, refreshing last_heartbeat and any progress fields."""
+    node = db.get(ScraperNode, node_id)
+    now = datetime.utcnow()
+
+    if node is None:
+        node = ScraperNode(node_id=node_id, started_at=now)
+        db.add(node)
+
+    node.last_heartbeat = now
+    for key, value in progress.items():
+        setattr(node, key, value)
+
+    db.commit()
+    return node
+
+
+def live_nodes(db, ttl: int = HEARTBEAT_TTL) -> list:
+    cutoff = datetime.utcnow() - timedelta(seconds=ttl)
+    rows = (
+        db.query(ScraperNode.node_id)
+        .filter(ScraperNode.last_heartbeat >= cutoff)
+        .all()
+    )
+    return [r[0] for r in rows]
+
+
+def leave(db, node_id: str):
+    """Remove this node so the others take over its feeds on their next sweep."""
+    db.query(ScraperNode).filter(ScraperNode.node_id == node_id).delete()
+    db.commit()
+
+
+def members(db, node_id: str) -> list:
+    """Heartbeat, then the currently live nodes (node_id included)."""
+    heartbeat(db, node_id)
+    return live_nodes(db) or [node_id]
+
+
+def membership_feeds(db, feeds: dict, node_id: str) -> dict:
+    """Feeds owned by node_id among the currently live nodes."""
+    return filter_feeds(feeds, HashRing(members(db, node_id)), node_id)
@@ -0,0 +1,307 @@
+# app/scrapers/spool.py
+"""
+Write-ahead spool between fetching feeds and writing articles.
+
+With RSS_SPOOL=1 the scrapers append each feed's entries to local JSONL
+segments instead of the database, so a sweep runs at network speed
+whatever the database is doing. The sweep's other database calls
+(quarantine list, feed health, membership, progress) wait at most
+SPOOL_DB_TIMEOUT seconds. A separate loader drains the segments into the
+database in bulk:
+
+    python -m app.scrapers.spool load --follow
+
+Writer: one per SPOOL_DIR (held with a lock file). Each append is flushed
+to the OS, so a crashed process loses nothing. fsync runs every
+SPOOL_FSYNC_RECORDS records or SPOOL_FSYNC_SECONDS, and at the end of each
+scrape, which bounds what a power loss can cost. Segments roll over at
+SPOOL_SEGMENT_BYTES, and a restarted writer always starts a new one.
+
+Loader: reads complete lines from the checkpointed (segment, offset),
+inserts them with write_records() (which skips URLs already stored), and
+only then advances the checkpoint. A crash between the two replays a
+batch harmlessly. A loaded segment is deleted once a newer one exists.
+While the database is down the loader backs off and retries from the
+checkpoint.
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.services.dedup import get_index
+from app.utils.metrics import SPOOL_BACKLOG_BYTES, SPOOL_LOADED, SPOOL_WRITTEN
+
+ENABLED = os.getenv("RSS_SPOOL") == "1"
+SPOOL_DIR = os.getenv("SPOOL_DIR", "./data/spool")
+SEGMENT_BYTES = int(os.getenv("SPOOL_SEGMENT_BYTES", 64 * 1024 * 1024))
+FSYNC_RECORDS = int(os.getenv("SPOOL_FSYNC_RECORDS", 1000))
+FSYNC_SECONDS = float(os.getenv("SPOOL_FSYNC_SECONDS", 1.0))
+LOAD_BATCH = int(os.getenv("SPOOL_LOAD_BATCH", 2000))  # records per transaction
+# how long a spooling sweep waits on the database for anything else
+# (quarantine list, feed health, membership, progress)
+DB_TIMEOUT = float(os.getenv("SPOOL_DB_TIMEOUT", 5))
+POLL_SECONDS = 2
+MAX_BACKOFF = 60
+METRICS_PORT_DEFAULT = 9104
+
+SUFFIX = ".jsonl"
+CHECKPOINT = "checkpoint.json"
+LOCK = "writer.lock"
+
+
+class SpoolLocked(RuntimeError):
+    """Another process is already writing to this spool directory."""
+
+
+def segments(spool_dir: str) -> list:
+    return sorted(name for name in os.listdir(spool_dir) if name.endswith(SUFFIX))
+
+
+def _segment_name(seq: int) -> str:
+    return f"{seq:012d}{SUFFIX}"
+
+
+def _fsync_dir(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def encode(category: str, record: tuple) -> bytes:
+    title, link, summary, published = record
+    line = [category, title, link, summary, published.isoformat() if published else None]
+    return json.dumps(line, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> tuple:
+    """-> (category, (title, link, summary, published_at)), as write_records() takes them."""
+    category, title, link, summary, published = json.loads(line)
+    return category, (title, link, summary, datetime.fromisoformat(published) if published else None)
+
+
+# -------------------------
+# Writer
+# -------------------------
+class SpoolWriter:
+    def __init__(self, spool_dir: str = SPOOL_DIR, segment_bytes: int = SEGMENT_BYTES,
+                 fsync_records: int = FSYNC_RECORDS, fsync_seconds: float = FSYNC_SECONDS):
+        os.makedirs(spool_dir, exist_ok=True)
+        self.spool_dir = spool_dir
+        self.segment_bytes = segment_bytes
+        self.fsync_records = fsync_records
+        self.fsync_seconds = fsync_seconds
+
+        self._lock = open(os.path.join(spool_dir, LOCK), "a")
+        try:
+            fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock.close()
+            raise SpoolLocked(f"{spool_dir} is in use by another writer")
+
+        # continue after both the newest segment and the loader's position
+        names = segments(spool_dir) + [load_checkpoint(spool_dir)["segment"]]
+        self._seq = max((int(name[:-len(SUFFIX)]) for name in names if name), default=0)
+        self._file = None
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._open_next()
+
+    def _open_next(self):
+        self._seq += 1
+        self._file = open(os.path.join(self.spool_dir, _segment_name(self._seq)), "ab")
+        self._size = 0
+        _fsync_dir(self.spool_dir)
+
+    def append(self, category: str, records: list) -> int:
+        """Spool one feed's (title, link, summary, published_at) records."""
+        if not records:
+            return 0
+        data = b"".join(encode(category, r) for r in records)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        self._unsynced += len(records)
+        SPOOL_WRITTEN.inc(len(records))
+
+        if self._size >= self.segment_bytes:
+            self.sync()
+            self._file.close()
+            self._open_next()
+        elif self._unsynced >= self.fsync_records or time.monotonic() - self._synced_at >= self.fsync_seconds:
+            self.sync()
+        return len(records)
+
+    def sync(self):
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        self._lock.close()
+
+
+_writer = None
+
+
+def get_writer():
+    """Process-wide writer when RSS_SPOOL=1, else None."""
+    global _writer
+    if ENABLED and _writer is None:
+        _writer = SpoolWriter()
+    return _writer
+
+
+# -------------------------
+# Loader
+# -------------------------
+def load_checkpoint(spool_dir: str) -> dict:
+    try:
+        with open(os.path.join(spool_dir, CHECKPOINT)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"segment": "", "offset": 0}
+
+
+def save_checkpoint(spool_dir: str, checkpoint: dict):
+    path = os.path.join(spool_dir, CHECKPOINT)
+    with open(path + ".partial", "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".partial", path)
+
+
+def read_lines(path: str, offset: int, limit: int) -> tuple:
+    """Up to `limit` complete lines from `offset`; returns (lines, next_offset, leftover bytes)."""
+    lines = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while len(lines) < limit:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                # the writer is mid-append, or died mid-append
+                return lines, offset, len(line)
+            lines.append(line)
+            offset += len(line)
+    return lines, offset, 0
+
+
+def backlog_bytes(spool_dir: str, checkpoint: dict) -> int:
+    total = 0
+    for name in segments(spool_dir):
+        if name >= checkpoint["segment"]:
+            total += os.path.getsize(os.path.join(spool_dir, name))
+            if name == checkpoint["segment"]:
+                total -= checkpoint["offset"]
+    return total
+
+
+def load_lines(db: Session, lines: list) -> int:
+    """Insert spooled lines, one write_records() call per category; returns articles inserted."""
+    from app.scrapers.rss_pipeline import write_records
+
+    by_category = defaultdict(list)
+    for line in lines:
+        category, record = decode(line)
+        by_category[category].append(record)
+    return sum(len(write_records(db, category, records)) for category, records in by_category.items())
+
+
+def drain(bind=None, spool_dir: str = SPOOL_DIR, batch: int = LOAD_BATCH, follow: bool = False) -> dict:
+    """Load spooled entries into the database; follow=True keeps polling for new ones.
+
+    Without follow, a database error propagates (after nothing past the
+    last checkpoint was marked loaded); with it, the loader backs off.
+    """
+    bind = bind or engine
+    os.makedirs(spool_dir, exist_ok=True)
+    checkpoint = load_checkpoint(spool_dir)
+    loaded = inserted = 0
+    backoff = POLL_SECONDS
+
+    with Session(bind) as db:
+        get_index(db)
+        while True:
+            names = segments(spool_dir)
+            # segments before the checkpoint were loaded before a crash; drop them
+            for name in names:
+                if name < checkpoint["segment"]:
+                    os.remove(os.path.join(spool_dir, name))
+            names = [n for n in names if n >= checkpoint["segment"]]
+            if not names:
+                if follow:
+                    time.sleep(POLL_SECONDS)
+                    continue
+                break
+            if checkpoint["segment"] != names[0]:
+                checkpoint = {"segment": names[0], "offset": 0}
+
+            path = os.path.join(spool_dir, checkpoint["segment"])
+            lines, offset, leftover = read_lines(path, checkpoint["offset"], batch)
+            SPOOL_BACKLOG_BYTES.set(backlog_bytes(spool_dir, checkpoint))
+
+            if lines:
+                try:
+                    inserted += load_lines(db, lines)
+                except Exception as e:
+                    db.rollback()
+                    if not follow:
+                        raise
+                    print(f"[SPOOL] Database write failed, retrying in {backoff}s: {e}")
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, MAX_BACKOFF)
+                    continue
+                backoff = POLL_SECONDS
+                checkpoint = {"segment": checkpoint["segment"], "offset": offset}
+                save_checkpoint(spool_dir, checkpoint)
+                loaded += len(lines)
+                SPOOL_LOADED.inc(len(lines))
+                continue
+
+            if len(names) > 1:
+                # the writer has moved on; whatever is left is a torn final line
+                if leftover:
+                    print(f"[WARN] Dropping {leftover} bytes of a torn record at the end of {path}")
+                os.remove(path)
+                checkpoint = {"segment": names[1], "offset": 0}
+                save_checkpoint(spool_dir, checkpoint)
+                continue
+
+            if not follow:
+                break
+            time.sleep(POLL_SECONDS)
+
+    SPOOL_BACKLOG_BYTES.set(backlog_bytes(spool_dir, checkpoint))
+    return {"loaded": loaded, "inserted": inserted}
+
+
+if __name__ == "__main__":
+    from app.db.database import init_db
+    from app.utils.metrics import start_metrics_server
+
+    parser = argparse.ArgumentParser(description="Load the RSS write-ahead spool into the database.")
+    parser.add_argument("command", choices=["load"])
+    parser.add_argument("--follow", action="store_true", help="keep loading as the scraper spools")
+    parser.add_argument("--dir", default=SPOOL_DIR)
+    parser.add_argument("--batch", type=int, default=LOAD_BATCH, help="records per transaction")
+    args = parser.parse_args()
+
+    start_metrics_server("METRICS_PORT", METRICS_PORT_DEFAULT)
+    init_db()
+    print(f"[SPOOL] {drain(spool_dir=args.dir, batch=args.batch, follow=args.follow)}")
@@ -0,0 +1,318 @@
+# app/services/backfill.py
+"""
+Re-score history after a model or heuristics change.
+
+Every result records the MODEL_VERSION that produced it (app/utils/nlp.py,
+app/utils/ner.py). Articles whose sentiment_results.model_version or
+ner_version differ from the current ones are read in id order, scored
+across a process pool, and written back per batch in one transaction:
+an executemany UPDATE of sentiment_results keyed by article, and a
+delete + bulk insert of the article's entities, with the entity
+co-occurrence graph and sentiment rollup moved from the old results to
+the new. Rows keep their created_at, so they stay in their monthly
+partition; the days they were on are marked for the Parquet export.
+
+Progress is checkpointed to BACKFILL_STATE after each batch. A rerun with
+the same versions and range resumes from there, and anything already at
+the current versions is skipped, so reruns are idempotent.
+
+To leave room for the live worker, --rate caps articles per second, the
+run pauses while more than --yield-queue articles wait for sentiment,
+and pool processes run niced.
+
+    python -m app.services.backfill --workers 4 [--from-id N] [--to-id M] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, delete, func, insert, or_, update
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.db.models import Article, ArticleEntity, SentimentResult
+from app.db.partitioning import mark_dirty, partition_day
+from app.services import entity_graph, entity_sentiment
+
+STATE_PATH = os.getenv("BACKFILL_STATE", "./data/backfill_state.json")
+BATCH = int(os.getenv("BACKFILL_BATCH", 2000))             # articles per transaction
+CHUNK = int(os.getenv("BACKFILL_CHUNK", 100))              # articles per pool task
+WORKERS = int(os.getenv("BACKFILL_WORKERS", 2))
+RATE = float(os.getenv("BACKFILL_RATE", 0))                # articles/sec, 0 = unthrottled
+YIELD_QUEUE = int(os.getenv("BACKFILL_YIELD_QUEUE", 500))  # live backlog that pauses us
+NICE = int(os.getenv("BACKFILL_NICE", 10))
+YIELD_SLEEP = 10
+
+
+# -------------------------
+# Checkpoints
+# -------------------------
+def load_state(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(path: str, state: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".partial", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".partial", path)
+
+
+def run_key(versions: tuple, from_id: int, to_id) -> str:
+    return f"{versions[0]}|{versions[1]}|{from_id}-{to_id or ''}"
+
+
+# -------------------------
+# Reads
+# -------------------------
+def _stale(versions: tuple):
+    sentiment_version, ner_version = versions
+    return or_(
+        SentimentResult.model_version.is_(None),
+        SentimentResult.model_version != sentiment_version,
+        SentimentResult.ner_version.is_(None),
+        SentimentResult.ner_version != ner_version,
+    )
+
+
+def _range_query(db: Session, versions: tuple, after_id: int, to_id, *columns):
+    query = (
+        db.query(*columns)
+          .join(SentimentResult, SentimentResult.article_id == Article.id)
+          .filter(Article.canonical_id == None, Article.id > after_id, _stale(versions))
+    )
+    if to_id is not None:
+        query = query.filter(Article.id <= to_id)
+    return query
+
+
+def count_stale(db: Session, versions: tuple, after_id: int = 0, to_id=None) -> int:
+    return _range_query(db, versions, after_id, to_id, func.count(Article.id)).scalar()
+
+
+def next_batch(db: Session, versions: tuple, after_id: int, to_id=None, limit: int = BATCH) -> list:
+    """Stale articles after after_id, in id order, with their current sentiment row."""
+    return (
+        _range_query(
+            db, versions, after_id, to_id,
+            Article.id, Article.title, Article.content,
+            Article.published_at, Article.created_at.label("article_created_at"),
+            SentimentResult.label, SentimentResult.score, SentimentResult.created_at,
+            SentimentResult.model_version, SentimentResult.ner_version,
+        )
+        .order_by(Article.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def live_queue_depth(db: Session) -> int:
+    return (
+        db.query(func.count(Article.id))
+          .filter(Article.sentiment == None, Article.canonical_id == None)
+          .scalar()
+    )
+
+
+# -------------------------
+# Scoring (pool processes)
+# -------------------------
+def _init_pool(nice: int, threads: int):
+    if nice:
+        os.nice(nice)
+    # N processes x all cores each would thrash; split the cores instead
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+
+def _versions() -> tuple:
+    from app.utils import ner, nlp
+
+    return nlp.MODEL_VERSION, ner.MODEL_VERSION
+
+
+def _score(items: list) -> list:
+    """run_models() with entities already as ArticleEntity column dicts."""
+    from app.services.enrichment import run_models
+    from app.services.entity_service import entity_rows
+
+    return [
+        (sentiment, entity_rows(found) if found is not None else None)
+        for sentiment, found in run_models(items)
+    ]
+
+
+# -------------------------
+# Writes
+# -------------------------
+def write_batch(db: Session, rows: list, results: list, versions: tuple):
+    """Store _score() results for `rows` (next_batch) in one transaction; the caller commits."""
+    sentiment_version, ner_version = versions
+    sentiment_table = SentimentResult.__table__
+
+    # current entities, to move the graph and sentiment rollup off them
+    old_entities, old_entity_days = {}, {}
+    for article_id, entity, entity_type, created_at in (
+        db.query(ArticleEntity.article_id, ArticleEntity.entity, ArticleEntity.entity_type, ArticleEntity.created_at)
+          .filter(ArticleEntity.article_id.in_([row.id for row in rows]))
+    ):
+        old_entities.setdefault(article_id, []).append((entity, entity_type))
+        old_entity_days.setdefault(article_id, set()).add(partition_day(created_at))
+
+    updates, entity_ids, entity_rows_, entity_days = [], [], [], set()
+    old_mentions, new_mentions, old_rollup, new_rollup = [], [], [], []
+    for row, (sentiment, entities) in zip(rows, results):
+        if sentiment is not None:
+            label, score = sentiment["label"], float(sentiment["score"])
+        else:
+            label, score = row.label, row.score
+        updates.append({
+            "b_article_id": row.id,
+            "b_label": label,
+            "b_score": score,
+            "b_model_version": sentiment_version,
+            "b_ner_version": ner_version if entities is not None else row.ner_version,
+        })
+
+        day = entity_graph.day_of(row.published_at, row.article_created_at)
+        old = old_entities.get(row.id, [])
+        new = old
+        if entities is not None:
+            entity_ids.append(row.id)
+            created_at = row.created_at or datetime.utcnow()
+            entity_rows_.extend(
+                dict(e, article_id=row.id, created_at=created_at, model_version=ner_version)
+                for e in entities
+            )
+            new = [(e["entity"], e["entity_type"]) for e in entities]
+            entity_days |= old_entity_days.get(row.id, set())
+            if new:
+                entity_days.add(partition_day(created_at))
+            old_mentions.append((day, old))
+            new_mentions.append((day, new))
+        if old:
+            old_rollup.append((day, row.label, row.score, [name for name, _ in old]))
+        if new:
+            new_rollup.append((day, label, score, [name for name, _ in new]))
+
+    db.execute(
+        update(sentiment_table)
+        .where(sentiment_table.c.article_id == bindparam("b_article_id"))
+        .values(
+            label=bindparam("b_label"),
+            score=bindparam("b_score"),
+            model_version=bindparam("b_model_version"),
+            ner_version=bindparam("b_ner_version"),
+        ),
+        updates,
+    )
+    entity_graph.record(db, old_mentions, sign=-1)
+    entity_graph.record(db, new_mentions)
+    entity_sentiment.record(db, old_rollup, sign=-1)
+    entity_sentiment.record(db, new_rollup)
+    if entity_ids:
+        db.execute(delete(ArticleEntity).where(ArticleEntity.article_id.in_(entity_ids)))
+    if entity_rows_:
+        db.execute(insert(ArticleEntity), entity_rows_)
+    mark_dirty(db, "sentiment_results", (partition_day(row.created_at) for row in rows))
+    mark_dirty(db, "article_entities", entity_days)
+
+
+# -------------------------
+# Run
+# -------------------------
+def _eta(remaining: int, rate: float) -> str:
+    return str(timedelta(seconds=int(remaining / rate))) if rate > 0 else "?"
+
+
+def run_backfill(bind=None, workers: int = WORKERS, batch: int = BATCH, chunk: int = CHUNK,
+                 from_id: int = 0, to_id=None, rate: float = RATE, yield_queue: int = YIELD_QUEUE,
+                 nice: int = NICE, state_path: str = STATE_PATH, dry_run: bool = False) -> dict:
+    """Re-score stale articles with ids in [from_id, to_id]; returns the run's progress."""
+    bind = bind or engine
+    pool = None
+    if workers > 0:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        pool = ProcessPoolExecutor(workers, initializer=_init_pool, initargs=(nice, threads))
+
+    try:
+        versions = pool.submit(_versions).result() if pool else _versions()
+        key = run_key(versions, from_id, to_id)
+        state = load_state(state_path)
+        progress = state.get(key, {"last_id": from_id - 1, "done": 0})
+
+        with Session(bind) as db:
+            remaining = count_stale(db, versions, progress["last_id"], to_id)
+        print(f"[BACKFILL] {versions[0]} | {versions[1]}: {remaining} articles to re-score"
+              f" after id {progress['last_id']}")
+        if dry_run or not remaining:
+            return dict(progress, remaining=remaining)
+
+        started, done = time.monotonic(), 0
+        while True:
+            with Session(bind) as db:
+                while yield_queue and live_queue_depth(db) > yield_queue:
+                    print(f"[BACKFILL] Live worker backlog above {yield_queue}; waiting")
+                    time.sleep(YIELD_SLEEP)
+
+                rows = next_batch(db, versions, progress["last_id"], to_id, batch)
+                if not rows:
+                    break
+
+                items = [(r.title, r.content, r.model_version != versions[0], r.ner_version != versions[1])
+                         for r in rows]
+                chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+                scored = pool.map(_score, chunks) if pool else map(_score, chunks)
+                results = [result for part in scored for result in part]
+
+                write_batch(db, rows, results, versions)
+                db.commit()
+
+            done += len(rows)
+            progress = {"last_id": rows[-1].id, "done": progress["done"] + len(rows)}
+            state[key] = progress
+            save_state(state_path, state)
+
+            elapsed = time.monotonic() - started
+            if rate and done / rate > elapsed:
+                time.sleep(done / rate - elapsed)
+                elapsed = time.monotonic() - started
+            per_sec = done / elapsed if elapsed else 0.0
+            print(f"[BACKFILL] {done}/{remaining} articles (id {progress['last_id']}), "
+                  f"{per_sec:.1f}/s, ETA {_eta(remaining - done, per_sec)}")
+
+        return dict(progress, remaining=max(0, remaining - done))
+    finally:
+        if pool:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score articles produced by older model versions.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="scoring processes (0: in-process)")
+    parser.add_argument("--batch", type=int, default=BATCH, help="articles per transaction")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="articles per pool task")
+    parser.add_argument("--from-id", type=int, default=0)
+    parser.add_argument("--to-id", type=int)
+    parser.add_argument("--rate", type=float, default=RATE, help="max articles/sec (0: unthrottled)")
+    parser.add_argument("--yield-queue", type=int, default=YIELD_QUEUE,
+                        help="pause while more articles than this await the live worker (0: never)")
+    parser.add_argument("--nice", type=int, default=NICE, help="CPU niceness of pool processes")
+    parser.add_argument("--state", default=STATE_PATH, help="checkpoint file")
+    parser.add_argument("--dry-run", action="store_true", help="count stale articles only")
+    args = parser.parse_args()
+
+    result = run_backfill(
+        workers=args.workers, batch=args.batch, chunk=args.chunk,
+        from_id=args.from_id, to_id=args.to_id,
+        rate=args.rate, yield_queue=args.yield_queue, nice=args.nice,
+        state_path=args.state, dry_run=args.dry_run,
+    )
+    print(f"[BACKFILL] {result}")
@@ -0,0 +1,250 @@
+# app/services/dedup.py
+
+import os
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.models import Article
+from app.utils.metrics import ARTICLES_DUPLICATE
+
+
+NUM_PERM = 128
+BANDS = 32                      # 32 bands x 4 rows: candidates from ~0.45 Jaccard, verified below
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3                # word 3-grams
+MIN_SHINGLES = 5                # too little text to call anything a duplicate
+
+THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.7))
+WINDOW_HOURS = int(os.getenv("DEDUP_WINDOW_HOURS", 48))
+ENABLED = os.getenv("DEDUP_ENABLED", "1") != "0"
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64) % _PRIME
+_B = _rng.randint(0, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64) % _PRIME
+
+
+# -------------------------
+# MinHash
+# -------------------------
+def shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str):
+    """MinHash signature (uint64[NUM_PERM]) of a text, None if it is too short."""
+    grams = shingles(text)
+    if len(grams) < MIN_SHINGLES:
+        return None
+
+    hashes = np.fromiter(
+        (zlib.crc32(g.encode("utf-8")) for g in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+    # universal hashing (a*x + b) mod p; uint64 wraparound is fine for min-hashing
+    permuted = ((hashes[:, None] * _A + _B) % _PRIME) & _MAX_HASH
+    return permuted.min(axis=0)
+
+
+def similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def article_text(title, content) -> str:
+    return f"{title or ''} {content or ''}"
+
+
+# -------------------------
+# LSH index over a sliding window
+# -------------------------
+class NearDuplicateIndex:
+    """Banded LSH over MinHash signatures of recently ingested articles.
+
+    Entries older than `window` seconds are evicted as new ones arrive, so
+    memory tracks the ingest rate rather than the size of the table.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, window_hours: int = WINDOW_HOURS):
+        self.threshold = threshold
+        self.window = window_hours * 3600
+        self._buckets = [dict() for _ in range(BANDS)]
+        self._signatures = {}      # article_id -> signature
+        self._canonical = {}       # article_id -> canonical article_id
+        self._order = deque()      # (added_at, article_id)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    @staticmethod
+    def _band_keys(sig):
+        return [sig[i * ROWS:(i + 1) * ROWS].tobytes() for i in range(BANDS)]
+
+    def _evict(self, now: float):
+        cutoff = now - self.window
+        while self._order and self._order[0][0] < cutoff:
+            _, article_id = self._order.popleft()
+            sig = self._signatures.pop(article_id, None)
+            self._canonical.pop(article_id, None)
+            if sig is None:
+                continue
+            for band, key in zip(self._buckets, self._band_keys(sig)):
+                ids = band.get(key)
+                if ids:
+                    ids.discard(article_id)
+                    if not ids:
+                        del band[key]
+
+    def find(self, sig, exclude=None):
+        """Canonical id of the closest indexed near-duplicate, or None."""
+        best_id, best_score = None, self.threshold
+        seen = {exclude}
+        for band, key in zip(self._buckets, self._band_keys(sig)):
+            for candidate in band.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = similarity(sig, self._signatures[candidate])
+                if score >= best_score:
+                    best_id, best_score = candidate, score
+        if best_id is None:
+            return None
+        return self._canonical.get(best_id, best_id)
+
+    def add(self, article_id: int, sig, canonical_id: int = None, added_at: float = None):
+        added_at = added_at or time.time()
+        self._signatures[article_id] = sig
+        self._canonical[article_id] = canonical_id or article_id
+        self._order.append((added_at, article_id))
+        for band, key in zip(self._buckets, self._band_keys(sig)):
+            band.setdefault(key, set()).add(article_id)
+
+    def assign(self, article: Article, pending: "NearDuplicateIndex" = None):
+        """Set article.canonical_id if it repeats a recent story, then index it.
+
+        The article needs an id (flush first). Returns the canonical id or None.
+        With `pending`, the article goes there instead and is matched against
+        both, so articles in one uncommitted batch can still find each other.
+        """
+        article.canonical_id = None     # left over from a rolled-back attempt
+        if article.id is None:
+            return None
+        sig = signature(article_text(article.title, article.content))
+        if sig is None:
+            return None
+
+        with self._lock:
+            self._evict(time.time())
+            canonical_id = self.find(sig, exclude=article.id)
+        if pending is not None:
+            canonical_id = canonical_id or pending.find(sig, exclude=article.id)
+            pending.add(article.id, sig, canonical_id)
+        else:
+            with self._lock:
+                self.add(article.id, sig, canonical_id)
+
+        if canonical_id is not None and canonical_id != article.id:
+            article.canonical_id = canonical_id
+            ARTICLES_DUPLICATE.inc()
+            return canonical_id
+        return None
+
+    def merge(self, pending: "NearDuplicateIndex"):
+        """Index everything staged in `pending`, in the order it was added."""
+        with self._lock:
+            for added_at, article_id in pending._order:
+                self.add(article_id, pending._signatures[article_id], pending._canonical[article_id], added_at)
+
+    def warm(self, db):
+        """Index articles created within the window (e.g. on worker start)."""
+        since = datetime.utcnow() - timedelta(seconds=self.window)
+        rows = (
+            db.query(Article.id, Article.title, Article.content, Article.canonical_id, Article.created_at)
+            .filter(Article.created_at >= since)
+            .order_by(Article.id)
+            .yield_per(5000)
+        )
+        count = 0
+        with self._lock:
+            for article_id, title, content, canonical_id, created_at in rows:
+                sig = signature(article_text(title, content))
+                if sig is None:
+                    continue
+                added_at = (created_at - datetime(1970, 1, 1)).total_seconds() if created_at else None
+                self.add(article_id, sig, canonical_id, added_at)
+                count += 1
+        return count
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(db=None):
+    """Process-wide index, warmed from the database on first use.
+
+    Call it before flushing new articles, or the warm-up would index them too.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = NearDuplicateIndex()
+                if db is not None and ENABLED:
+                    try:
+                        print(f"[DEDUP] Indexed {index.warm(db)} recent articles")
+                    except Exception as e:
+                        print(f"[WARN] Could not warm near-duplicate index: {e}")
+                        db.rollback()
+                _index = index
+    return _index
+
+
+def link_duplicates(db, articles: list) -> int:
+    """Point near-duplicates at their canonical article; returns how many matched.
+
+    Articles must already be flushed so they have ids. They are only added to
+    the shared index once `db` commits: a rolled-back article must never
+    become the canonical_id of a later one.
+    """
+    if not ENABLED or not articles:
+        return 0
+    index = get_index(db)
+    pending = db.info.setdefault(_PENDING, NearDuplicateIndex(index.threshold, 0))
+    return sum(1 for a in articles if index.assign(a, pending) is not None)
+
+
+# -------------------------
+# Index on commit
+# -------------------------
+_PENDING = "dedup_pending"
+
+
+@event.listens_for(Session, "after_commit")
+def _index_committed(session):
+    pending = session.info.pop(_PENDING, None)
+    if pending is not None and _index is not None:
+        _index.merge(pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted(session, transaction):
+    # rollback or close: whatever was staged was never stored
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
@@ -0,0 +1,176 @@
+# app/services/duckdb_analytics.py
+"""
+DuckDB over the Parquet export (see parquet_export.py) for the heavy
+/analytics aggregates. Enabled with ANALYTICS_BACKEND=duckdb.
+
+Every function returns exactly what the SQL path of the matching route
+returns. If DuckDB or the export is unavailable, or the export has not
+finished its first run in the current layout, `run` returns None and the
+route falls back to SQL. Keyword ties at the cut-off are broken by word;
+the SQL path leaves them in scan order.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+from app.services.parquet_export import EXPORT_DIR, TABLES, ready, table_glob
+from app.utils.keywords import MIN_LENGTH, STOPWORDS
+
+try:
+    import duckdb
+except ImportError:  # optional backend
+    duckdb = None
+
+BACKEND = os.getenv("ANALYTICS_BACKEND", "sql")
+ENABLED = BACKEND == "duckdb"
+
+LABELS = ("positive", "negative", "neutral", "error")
+
+_conn = None
+_conn_lock = threading.Lock()
+
+
+# -------------------------
+# Connection
+# -------------------------
+def connect(export_dir: str = EXPORT_DIR):
+    """In-memory DuckDB with one view per exported table (re-globbed per query)."""
+    conn = duckdb.connect()
+    for name in TABLES:
+        glob = table_glob(export_dir, name).replace("'", "''")
+        conn.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{glob}', union_by_name = true)")
+    conn.execute("CREATE TABLE stopwords (word VARCHAR PRIMARY KEY)")
+    conn.executemany("INSERT INTO stopwords VALUES (?)", [(w,) for w in sorted(STOPWORDS)])
+    return conn
+
+
+def _cursor():
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                _conn = connect()
+    # a cursor is a separate connection to the same database, safe per thread
+    return _conn.cursor()
+
+
+def run(name: str, *args):
+    """Result of the named query, or None to use the SQL path."""
+    if duckdb is None or not ready(EXPORT_DIR):
+        return None
+    try:
+        cursor = _cursor()
+        try:
+            return QUERIES[name](cursor, *args)
+        finally:
+            cursor.close()
+    except Exception as e:
+        print(f"[WARN] DuckDB analytics failed for {name}, using SQL: {e}")
+        return None
+
+
+def _since(column: str, cutoff):
+    """WHERE fragment and params for `column >= cutoff`."""
+    if not cutoff:
+        return "TRUE", []
+    return f"{column} >= ?", [datetime.combine(cutoff, datetime.min.time())]
+
+
+def _labels():
+    return dict.fromkeys(LABELS, 0)
+
+
+# -------------------------
+# Queries (mirror app/routers/analytics.py)
+# -------------------------
+def sentiment_summary(cur, cutoff) -> dict:
+    where, params = _since("a.published_at", cutoff)
+    rows = cur.execute(f"""
+        SELECT s.label, count(*)
+        FROM sentiment_results s JOIN articles a ON a.id = s.article_id
+        WHERE {where}
+        GROUP BY s.label
+    """, params).fetchall()
+    counts = dict(rows)
+    return {"total": sum(counts.values()), **{label: counts.get(label, 0) for label in LABELS}}
+
+
+def top_sources(cur, cutoff) -> list:
+    where, params = _since("published_at", cutoff)
+    rows = cur.execute(f"""
+        SELECT source, count(*) AS n
+        FROM articles
+        WHERE canonical_id IS NULL AND {where}
+        GROUP BY source ORDER BY n DESC
+    """, params).fetchall()
+    return [{"source": s, "count": c} for s, c in rows]
+
+
+def daily_sentiment(cur, cutoff) -> dict:
+    where, params = _since("a.published_at", cutoff)
+    rows = cur.execute(f"""
+        SELECT CAST(a.published_at AS DATE) AS day, s.label, count(*)
+        FROM articles a JOIN sentiment_results s ON s.article_id = a.id
+        WHERE {where}
+        GROUP BY day, s.label ORDER BY day
+    """, params).fetchall()
+    trend = {}
+    for day, label, count in rows:
+        trend.setdefault(str(day), _labels())[label] = count
+    return trend
+
+
+def source_sentiment(cur, cutoff) -> dict:
+    where, params = _since("a.published_at", cutoff)
+    rows = cur.execute(f"""
+        SELECT a.source, s.label, count(*)
+        FROM articles a JOIN sentiment_results s ON s.article_id = a.id
+        WHERE {where}
+        GROUP BY a.source, s.label
+    """, params).fetchall()
+    data = {}
+    for source, label, count in rows:
+        data.setdefault(source, _labels())[label] = count
+    return data
+
+
+def keyword_frequency(cur, cutoff) -> list:
+    where, params = _since("published_at", cutoff)
+    # same tokens as app/utils/keywords.py: lowercase ASCII runs, MIN_LENGTH+, no stopwords
+    rows = cur.execute(f"""
+        WITH texts AS (
+            SELECT title AS body FROM articles WHERE canonical_id IS NULL AND {where}
+            UNION ALL
+            SELECT content FROM articles WHERE canonical_id IS NULL AND {where}
+        ), words AS (
+            SELECT unnest(regexp_extract_all(lower(body), '[a-z]+')) AS word
+            FROM texts WHERE body IS NOT NULL
+        )
+        SELECT word, count(*) AS n
+        FROM words
+        WHERE length(word) >= {MIN_LENGTH} AND word NOT IN (SELECT word FROM stopwords)
+        GROUP BY word ORDER BY n DESC, word LIMIT 50
+    """, params + params).fetchall()
+    return [{"word": w, "count": c} for w, c in rows]
+
+
+def top_entities(cur, cutoff, limit: int) -> list:
+    where, params = _since("a.published_at", cutoff)
+    rows = cur.execute(f"""
+        SELECT e.entity, e.entity_type, count(*) AS n
+        FROM article_entities e JOIN articles a ON a.id = e.article_id
+        WHERE {where}
+        GROUP BY e.entity, e.entity_type ORDER BY n DESC LIMIT ?
+    """, params + [limit]).fetchall()
+    return [{"entity": e, "type": t, "count": c} for e, t, c in rows]
+
+
+QUERIES = {
+    "sentiment_summary": sentiment_summary,
+    "top_sources": top_sources,
+    "daily_sentiment": daily_sentiment,
+    "source_sentiment": source_sentiment,
+    "keyword_frequency": keyword_frequency,
+    "top_entities": top_entities,
+}
@@ -0,0 +1,149 @@
+# app/services/enrichment.py
+"""
+Single-pass enrichment: sentiment and entities for a batch of articles.
+
+The batch is loaded with its relationships in a constant number of
+queries, each text is cleaned once, each model runs once over the whole
+batch, and every result is written in one transaction.
+"""
+
+import os
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.models import Article, ArticleEntity, SentimentResult
+from app.services import entity_graph, entity_sentiment
+from app.services.entity_service import entity_rows
+from app.utils.ner import MODEL_VERSION as NER_VERSION, extract_entities_batch
+from app.utils.nlp import (
+    LONG_TEXT, LONG_TEXT_VERSION, TRUNCATED_VERSION, analyze_sentiment, analyze_sentiment_batch, clean_text,
+)
+from app.utils.tracing import span
+
+BATCH_SIZE = int(os.getenv("WORKER_BATCH", 25))
+
+
+def load_pending(db: Session, limit: int = BATCH_SIZE) -> list:
+    """Articles still missing sentiment, with sentiment and entities preloaded."""
+    # near-duplicates share their canonical article's results
+    return (
+        db.query(Article)
+          .options(selectinload(Article.sentiment), selectinload(Article.entities))
+          .filter(Article.sentiment == None, Article.canonical_id == None)
+          .limit(limit)
+          .all()
+    )
+
+
+def sentiment_text(title: str, content: str, long_text: bool = LONG_TEXT) -> str:
+    if long_text and title and content:
+        return f"{title}. {content}"
+    return content or title
+
+
+def run_models(items: list, long_text: bool = LONG_TEXT) -> list:
+    """[(title, content, want_sentiment, want_entities)] -> [(sentiment, entities)].
+
+    Each text is cleaned once and each model runs once over the items that
+    want it; results not asked for are None.
+    """
+    with span("enrich.clean_text", n=len(items)):
+        cleaned = [(clean_text(title), clean_text(content)) for title, content, _, _ in items]
+
+    want_sentiment = [i for i, item in enumerate(items) if item[2]]
+    want_entities = [i for i, item in enumerate(items) if item[3]]
+    results = [[None, None] for _ in items]
+
+    if want_sentiment:
+        texts = [sentiment_text(*cleaned[i], long_text=long_text) for i in want_sentiment]
+        with span("enrich.sentiment", n=len(texts)):
+            if long_text:
+                sentiments = analyze_sentiment_batch(texts, cleaned=True)
+            else:
+                sentiments = [analyze_sentiment(t) for t in texts]
+        for i, sentiment in zip(want_sentiment, sentiments):
+            results[i][0] = sentiment
+
+    if want_entities:
+        with span("enrich.ner", n=len(want_entities)):
+            entities = extract_entities_batch([cleaned[i][0] for i in want_entities])
+        for i, found in zip(want_entities, entities):
+            results[i][1] = found
+
+    return [tuple(r) for r in results]
+
+
+def enrich_batch(articles: list, db: Session, long_text: bool = LONG_TEXT) -> list:
+    """Sentiment + entities for articles missing them, committed together.
+
+    Relationships must already be loaded (load_pending) or each access is a
+    query. Rows go in as one executemany per table, plus one upsert each
+    into the entity co-occurrence graph and sentiment rollup, then are
+    attached to the articles in memory for the stages that follow; use a
+    session with expire_on_commit=False to read them without a reload.
+    Raises after rolling back, with nothing stored for the batch.
+    """
+    todo = [a for a in articles if a.sentiment is None or not a.entities]
+    if not todo:
+        return []
+
+    try:
+        results = run_models(
+            [(a.title, a.content, a.sentiment is None, not a.entities) for a in todo],
+            long_text=long_text,
+        )
+
+        now = datetime.utcnow()
+        sentiment_rows, entity_rows_by_article = {}, {}
+        for article, (sentiment, found) in zip(todo, results):
+            if found is not None:
+                entity_rows_by_article[article] = [
+                    dict(row, article_id=article.id, created_at=now, model_version=NER_VERSION)
+                    for row in entity_rows(found)
+                ]
+            if sentiment is not None:
+                sentiment_rows[article] = {
+                    "article_id": article.id,
+                    "label": sentiment["label"],
+                    "score": float(sentiment["score"]),
+                    "created_at": now,
+                    "model_version": LONG_TEXT_VERSION if long_text else TRUNCATED_VERSION,
+                    # entities already there came from an unknown version
+                    "ner_version": NER_VERSION if found is not None else None,
+                }
+        all_entity_rows = [row for rows in entity_rows_by_article.values() for row in rows]
+
+        with span("enrich.commit", sentiments=len(sentiment_rows), entities=len(all_entity_rows)):
+            if sentiment_rows:
+                db.execute(insert(SentimentResult), list(sentiment_rows.values()))
+            if all_entity_rows:
+                db.execute(insert(ArticleEntity), all_entity_rows)
+                entity_graph.record(db, [
+                    (entity_graph.article_day(article), [(r["entity"], r["entity_type"]) for r in rows])
+                    for article, rows in entity_rows_by_article.items()
+                ])
+            # every article in the batch now has both sentiment and entities
+            rollup = []
+            for article in todo:
+                sentiment = sentiment_rows.get(article) or {"label": article.sentiment.label,
+                                                            "score": article.sentiment.score}
+                if article in entity_rows_by_article:
+                    names = [r["entity"] for r in entity_rows_by_article[article]]
+                else:
+                    names = [e.entity for e in article.entities]
+                rollup.append((entity_graph.article_day(article), sentiment["label"], sentiment["score"], names))
+            entity_sentiment.record(db, rollup)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for article, row in sentiment_rows.items():
+        set_committed_value(article, "sentiment", SentimentResult(**row))
+    for article, rows in entity_rows_by_article.items():
+        set_committed_value(article, "entities", [ArticleEntity(**r) for r in rows])
+
+    return todo
@@ -0,0 +1,164 @@
+# app/services/entity_graph.py
+"""
+Entity co-occurrence graph: (entity, neighbor, day) -> articles mentioning both.
+
+Maintained incrementally in the same transaction that writes an article's
+entities (enrichment, entity_service, backfill), so reading an entity's
+neighbours is an index range scan instead of a self-join on
+article_entities.
+
+Storage is bounded by pruning: once a day is GRAPH_PRUNE_AFTER_DAYS old,
+its edges seen in fewer than GRAPH_MIN_COUNT articles are deleted, as are
+days before the retention cutoff. Long-tail pairs are therefore
+undercounted over long ranges; strong edges are exact.
+
+    python -m app.services.entity_graph rebuild    # recompute from article_entities
+    python -m app.services.entity_graph prune
+"""
+
+import argparse
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta
+from itertools import combinations
+
+from sqlalchemy import delete, func, or_
+from sqlalchemy.orm import Session
+
+from app.db.database import decrement, engine, increment
+from app.db.models import Article, ArticleEntity, EntityCooccurrence
+from app.db.partitioning import retention_cutoff
+
+GRAPH_TYPES = ("person", "organization", "location")
+MIN_COUNT = int(os.getenv("GRAPH_MIN_COUNT", 2))
+PRUNE_AFTER_DAYS = int(os.getenv("GRAPH_PRUNE_AFTER_DAYS", 2))
+PRUNE_INTERVAL = int(os.getenv("GRAPH_PRUNE_INTERVAL", 3600))  # seconds, in the worker
+REBUILD_BATCH = 5000
+
+KEYS = ("entity", "entity_type", "neighbor", "neighbor_type", "day")
+
+
+def day_of(published_at, created_at=None) -> date:
+    """The day an article's edges count towards."""
+    return (published_at or created_at or datetime.utcnow()).date()
+
+
+def article_day(article) -> date:
+    return day_of(article.published_at, article.created_at)
+
+
+def edges(entities) -> list:
+    """Directed edges between the distinct graph entities of one article."""
+    nodes = sorted({(e, t) for e, t in entities if t in GRAPH_TYPES})
+    pairs = []
+    for a, b in combinations(nodes, 2):
+        pairs.append(a + b)
+        pairs.append(b + a)
+    return pairs
+
+
+def record(db: Session, mentions, sign: int = 1) -> int:
+    """Add (sign=-1: remove) the edges of [(day, [(entity, type), ...])] per article.
+
+    Does not commit: runs inside the caller's entity write.
+    """
+    counts = Counter()
+    for day, entities in mentions:
+        for edge in edges(entities):
+            counts[edge + (day,)] += sign
+    added = [dict(zip(KEYS, key), count=n) for key, n in counts.items() if n > 0]
+    removed = [dict(zip(KEYS, key), count=-n) for key, n in counts.items() if n < 0]
+    increment(db, EntityCooccurrence.__table__, added, KEYS, ("count",))
+    # a removed edge may already be pruned; don't bring it back with a negative count
+    decrement(db, EntityCooccurrence.__table__, removed, KEYS, ("count",))
+    return len(added) + len(removed)
+
+
+def neighbors(db: Session, entity: str, entity_type: str = None, cutoff=None,
+              limit: int = 20, min_count: int = 1) -> list:
+    weight = func.sum(EntityCooccurrence.count)
+    query = (
+        db.query(EntityCooccurrence.neighbor, EntityCooccurrence.neighbor_type, weight)
+          .filter(EntityCooccurrence.entity == entity)
+    )
+    if entity_type:
+        query = query.filter(EntityCooccurrence.entity_type == entity_type)
+    if cutoff:
+        query = query.filter(EntityCooccurrence.day >= cutoff)
+    rows = (
+        query.group_by(EntityCooccurrence.neighbor, EntityCooccurrence.neighbor_type)
+             .having(weight >= max(min_count, 1))
+             .order_by(weight.desc(), EntityCooccurrence.neighbor)
+             .limit(limit)
+             .all()
+    )
+    return [{"entity": n, "type": t, "count": c} for n, t, c in rows]
+
+
+# -------------------------
+# Maintenance
+# -------------------------
+def prune(db: Session, min_count: int = MIN_COUNT, after_days: int = PRUNE_AFTER_DAYS, today=None) -> int:
+    """Drop weak edges of closed days and days past retention; returns rows deleted."""
+    today = today or date.today()
+    conditions = [
+        (EntityCooccurrence.day < today - timedelta(days=after_days)) & (EntityCooccurrence.count < min_count),
+        EntityCooccurrence.count <= 0,
+    ]
+    cutoff = retention_cutoff(today)
+    if cutoff:
+        conditions.append(EntityCooccurrence.day < cutoff)
+
+    deleted = db.execute(delete(EntityCooccurrence).where(or_(*conditions))).rowcount
+    db.commit()
+    return deleted
+
+
+def rebuild(bind=None) -> int:
+    """Recompute the whole graph from article_entities; returns articles counted."""
+    bind = bind or engine
+    articles = 0
+    with Session(bind) as db:
+        db.execute(delete(EntityCooccurrence))
+        rows = (
+            db.query(Article.id, Article.published_at, Article.created_at,
+                     ArticleEntity.entity, ArticleEntity.entity_type)
+              .join(ArticleEntity, ArticleEntity.article_id == Article.id)
+              .filter(ArticleEntity.entity_type.in_(GRAPH_TYPES))
+              .order_by(Article.id)
+              .yield_per(REBUILD_BATCH)
+        )
+
+        pending, current_id, day, entities = [], None, None, []
+        for article_id, published_at, created_at, entity, entity_type in rows:
+            if article_id != current_id:
+                if entities:
+                    pending.append((day, entities))
+                current_id, entities = article_id, []
+                day = day_of(published_at, created_at)
+            entities.append((entity, entity_type))
+            if len(pending) >= REBUILD_BATCH:
+                record(db, pending)
+                articles += len(pending)
+                pending = []
+        if entities:
+            pending.append((day, entities))
+        record(db, pending)
+        articles += len(pending)
+        db.commit()
+    return articles
+
+
+if __name__ == "__main__":
+    from app.db.database import init_db
+
+    parser = argparse.ArgumentParser(description="Maintain the entity co-occurrence graph.")
+    parser.add_argument("command", choices=["rebuild", "prune"])
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "rebuild":
+        print(f"[GRAPH] Rebuilt from {rebuild()} articles")
+    else:
+        with Session(engine) as db:
+            print(f"[GRAPH] Pruned {prune(db)} edges")
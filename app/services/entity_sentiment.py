@@ -0,0 +1,178 @@
+# app/services/entity_sentiment.py
+"""
+Entity sentiment rollup: (entity, day, label) -> article count, score sum.
+
+An article counts once both its sentiment and its entities are stored, in
+the transaction that stores the second of them (enrichment, or the
+per-article services); the backfill moves its counts when it re-scores.
+The entity sentiment and trend endpoints read from here instead of joining
+sentiment_results, articles and article_entities, and match entity names
+exactly.
+
+    python -m app.services.entity_sentiment rebuild    # recompute from history
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import delete, func, or_
+from sqlalchemy.orm import Session
+
+from app.db.database import decrement, engine, increment
+from app.db.models import Article, ArticleEntity, EntitySentimentDaily, SentimentResult
+from app.db.partitioning import retention_cutoff
+from app.services.entity_graph import article_day, day_of
+
+LABELS = ("positive", "negative", "neutral", "error")
+DEFAULT_ENTITIES = 5
+REBUILD_BATCH = 5000
+
+KEYS = ("entity", "day", "label")
+
+
+def article_item(article) -> tuple:
+    """(day, label, score, entity names) for record(), from the article's loaded rows."""
+    sentiment = article.sentiment
+    return article_day(article), sentiment.label, sentiment.score, [e.entity for e in article.entities]
+
+
+def record(db: Session, items, sign: int = 1) -> int:
+    """Add (sign=-1: remove) [(day, label, score, entity names)], one per article.
+
+    Does not commit: runs inside the caller's write.
+    """
+    totals = defaultdict(lambda: [0, 0.0])
+    for day, label, score, names in items:
+        for name in set(names):
+            total = totals[(name, day, label)]
+            total[0] += sign
+            total[1] += sign * float(score or 0.0)
+    added = [
+        {"entity": name, "day": day, "label": label, "count": n, "score_sum": score_sum}
+        for (name, day, label), (n, score_sum) in totals.items() if n > 0
+    ]
+    removed = [
+        {"entity": name, "day": day, "label": label, "count": -n, "score_sum": -score_sum}
+        for (name, day, label), (n, score_sum) in totals.items() if n < 0
+    ]
+    increment(db, EntitySentimentDaily.__table__, added, KEYS, ("count", "score_sum"))
+    # a removed row may already be pruned; don't bring it back with a negative count
+    decrement(db, EntitySentimentDaily.__table__, removed, KEYS, ("count", "score_sum"))
+    return len(added) + len(removed)
+
+
+# -------------------------
+# Reads
+# -------------------------
+def _filtered(query, names, cutoff):
+    query = query.filter(EntitySentimentDaily.entity.in_(names), EntitySentimentDaily.count > 0)
+    if cutoff:
+        query = query.filter(EntitySentimentDaily.day >= cutoff)
+    return query
+
+
+def top_entities(db: Session, cutoff=None, limit: int = DEFAULT_ENTITIES) -> list:
+    total = func.sum(EntitySentimentDaily.count)
+    query = db.query(EntitySentimentDaily.entity).filter(EntitySentimentDaily.count > 0)
+    if cutoff:
+        query = query.filter(EntitySentimentDaily.day >= cutoff)
+    return [name for name, in query.group_by(EntitySentimentDaily.entity).order_by(total.desc()).limit(limit)]
+
+
+def summary(db: Session, names: list, cutoff=None) -> dict:
+    """{entity: {label: articles}} over the range."""
+    result = {name: dict.fromkeys(LABELS, 0) for name in names}
+    rows = (
+        _filtered(db.query(EntitySentimentDaily.entity, EntitySentimentDaily.label,
+                           func.sum(EntitySentimentDaily.count)), names, cutoff)
+          .group_by(EntitySentimentDaily.entity, EntitySentimentDaily.label)
+          .all()
+    )
+    for name, label, count in rows:
+        result[name][label] = count
+    return result
+
+
+def series(db: Session, names: list, cutoff=None) -> dict:
+    """{entity: {day: {label: articles, ..., "score": mean score}}}."""
+    result = {name: {} for name in names}
+    rows = (
+        _filtered(db.query(EntitySentimentDaily.entity, EntitySentimentDaily.day, EntitySentimentDaily.label,
+                           EntitySentimentDaily.count, EntitySentimentDaily.score_sum), names, cutoff)
+          .order_by(EntitySentimentDaily.day)
+          .all()
+    )
+    score_sums = defaultdict(float)
+    for name, day, label, count, score_sum in rows:
+        point = result[name].setdefault(str(day), dict.fromkeys(LABELS, 0))
+        point[label] = count
+        score_sums[(name, str(day))] += score_sum
+    for (name, day), score_sum in score_sums.items():
+        point = result[name][day]
+        point["score"] = round(score_sum / sum(point[label] for label in LABELS), 4)
+    return result
+
+
+# -------------------------
+# Maintenance
+# -------------------------
+def prune(db: Session, today=None) -> int:
+    """Drop emptied rows and days past retention; returns rows deleted."""
+    conditions = [EntitySentimentDaily.count <= 0]
+    cutoff = retention_cutoff(today or date.today())
+    if cutoff:
+        conditions.append(EntitySentimentDaily.day < cutoff)
+    deleted = db.execute(delete(EntitySentimentDaily).where(or_(*conditions))).rowcount
+    db.commit()
+    return deleted
+
+
+def rebuild(bind=None) -> int:
+    """Recompute the rollup from stored sentiment and entities; returns articles counted."""
+    bind = bind or engine
+    articles = 0
+    with Session(bind) as db:
+        db.execute(delete(EntitySentimentDaily))
+        rows = (
+            db.query(Article.id, Article.published_at, Article.created_at,
+                     SentimentResult.label, SentimentResult.score, ArticleEntity.entity)
+              .join(SentimentResult, SentimentResult.article_id == Article.id)
+              .join(ArticleEntity, ArticleEntity.article_id == Article.id)
+              .order_by(Article.id)
+              .yield_per(REBUILD_BATCH)
+        )
+
+        pending, current_id, item = [], None, None
+        for article_id, published_at, created_at, label, score, entity in rows:
+            if article_id != current_id:
+                if item:
+                    pending.append(item)
+                current_id = article_id
+                item = (day_of(published_at, created_at), label, score, [])
+            item[3].append(entity)
+            if len(pending) >= REBUILD_BATCH:
+                record(db, pending)
+                articles += len(pending)
+                pending = []
+        if item:
+            pending.append(item)
+        record(db, pending)
+        articles += len(pending)
+        db.commit()
+    return articles
+
+
+if __name__ == "__main__":
+    from app.db.database import init_db
+
+    parser = argparse.ArgumentParser(description="Maintain the entity sentiment rollup.")
+    parser.add_argument("command", choices=["rebuild", "prune"])
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "rebuild":
+        print(f"[ROLLUP] Rebuilt from {rebuild()} articles")
+    else:
+        with Session(engine) as db:
+            print(f"[ROLLUP] Pruned {prune(db)} rows")
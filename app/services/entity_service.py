@@ -1,49 +1,45 @@
 # app/services/entity_service.py
 
-from app.utils.ner import extract_entities
+from app.utils.ner import MODEL_VERSION, extract_entities
 from app.db.models import ArticleEntity
-from datetime import datetime
+from app.services import entity_graph, entity_sentiment
+from app.utils.tracing import span
+
+ENTITY_TYPES = {
+    "people": "person",
+    "organizations": "organization",
+    "locations": "location",
+    "products": "product",
+}
+
+
+def entity_rows(entities: dict) -> list:
+    """extract_entities() output -> ArticleEntity column dicts (article set by the caller)."""
+    return [
+        {"entity": name, "entity_type": entity_type}
+        for key, entity_type in ENTITY_TYPES.items()
+        for name in entities[key]
+    ]
+
 
 def process_entities_for_article(article, db):
     """Extract and store entities for a single article."""
+    with span("process_entities_for_article", article_id=article.id):
+        _process_entities(article, db)
+
 
+def _process_entities(article, db):
     # Avoid duplicates — skip if already processed
     if article.entities and len(article.entities) > 0:
         return
 
     entities = extract_entities(article.title or "")
 
-    batches = []
-
-    for e in entities["people"]:
-        batches.append(ArticleEntity(
-            article_id=article.id,
-            entity=e,
-            entity_type="person"
-        ))
-
-    for e in entities["organizations"]:
-        batches.append(ArticleEntity(
-            article_id=article.id,
-            entity=e,
-            entity_type="organization"
-        ))
-
-    for e in entities["locations"]:
-        batches.append(ArticleEntity(
-            article_id=article.id,
-            entity=e,
-            entity_type="location"
-        ))
-
-    for e in entities["products"]:
-        batches.append(ArticleEntity(
-            article_id=article.id,
-            entity=e,
-            entity_type="product"
-        ))
-
-    for row in batches:
-        db.add(row)
-
-    db.commit()
\ No newline at end of file
+    rows = entity_rows(entities)
+    with span("ner.commit"):
+        article.entities.extend(ArticleEntity(**row, model_version=MODEL_VERSION) for row in rows)
+        entity_graph.record(db, [(entity_graph.article_day(article), [(r["entity"], r["entity_type"]) for r in rows])])
+        if article.sentiment is not None:
+            article.sentiment.ner_version = MODEL_VERSION
+            entity_sentiment.record(db, [entity_sentiment.article_item(article)])
+        db.commit()
@@ -0,0 +1,188 @@
+# app/services/inference_server.py
+"""
+Local model server: one copy of the sentiment and NER models per node,
+shared by every worker through a Unix socket or localhost HTTP.
+
+Concurrent requests are merged by a dynamic batcher: a batch is run once
+it holds INFERENCE_MAX_BATCH texts or its oldest request has waited
+INFERENCE_MAX_LATENCY_MS, whichever comes first.
+
+    python -m app.services.inference_server                  # INFERENCE_LISTEN
+    INFERENCE_URL=unix:///tmp/gp-inference.sock python app/workers/sentiment_worker.py
+
+Endpoints (JSON): POST /sentiment (first 512 tokens, analyze_sentiment),
+POST /sentiment_long (overlapping windows, analyze_sentiment_batch) and
+POST /ner take {"texts": [...]} and return {"results": [...]}, one per
+text; GET /health.
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from socketserver import ThreadingMixIn
+
+from app.utils.metrics import INFERENCE_BATCH_SIZE, INFERENCE_QUEUE_SECONDS, start_metrics_server
+
+LISTEN = os.getenv("INFERENCE_LISTEN", "unix:///tmp/gp-inference.sock")
+MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", 64))
+MAX_LATENCY_MS = float(os.getenv("INFERENCE_MAX_LATENCY_MS", 10))
+METRICS_PORT_DEFAULT = 9103
+
+
+# -------------------------
+# Dynamic batching
+# -------------------------
+class _Request:
+    __slots__ = ("items", "arrived", "done", "results", "error")
+
+    def __init__(self, items: list):
+        self.items = items
+        self.arrived = time.monotonic()
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class DynamicBatcher:
+    """Runs fn(list) over items merged from concurrent submit() calls."""
+
+    def __init__(self, name: str, fn, max_batch: int = MAX_BATCH, max_latency_ms: float = MAX_LATENCY_MS):
+        self.name = name
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000
+        self._queue = queue.Queue()
+        threading.Thread(target=self._loop, name=f"batcher-{name}", daemon=True).start()
+
+    def submit(self, items: list) -> list:
+        if not items:
+            return []
+        request = _Request(items)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.results
+
+    def _collect(self) -> list:
+        first = self._queue.get()
+        batch, size = [first], len(first.items)
+        deadline = first.arrived + self.max_latency
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.items)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            started = time.monotonic()
+            for request in batch:
+                INFERENCE_QUEUE_SECONDS.labels(self.name).observe(started - request.arrived)
+
+            items = [item for request in batch for item in request.items]
+            INFERENCE_BATCH_SIZE.labels(self.name).observe(len(items))
+            try:
+                results = self.fn(items)
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            offset = 0
+            for request in batch:
+                request.results = results[offset:offset + len(request.items)]
+                offset += len(request.items)
+                request.done.set()
+
+
+# -------------------------
+# HTTP
+# -------------------------
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: clients hold one connection
+    batchers = {}
+
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok", "models": sorted(self.batchers)})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        batcher = self.batchers.get(self.path.strip("/"))
+        if batcher is None:
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            texts = json.loads(self.rfile.read(length))["texts"]
+            self._reply(200, {"results": batcher.submit(texts)})
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the worker logs
+
+
+class UnixHTTPServer(ThreadingMixIn, HTTPServer):
+    address_family = socket.AF_UNIX
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)  # stale socket from a previous run
+        self.socket.bind(self.server_address)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(listen: str, handlers: dict):
+    """HTTP server for `listen` ("unix:///path" or "http://host:port") serving handlers by name."""
+    handler = type("Handler", (_Handler,), {
+        "batchers": {name: DynamicBatcher(name, fn) for name, fn in handlers.items()},
+    })
+    if listen.startswith("unix://"):
+        return UnixHTTPServer(listen[len("unix://"):], handler)
+    host, port = listen.split("://", 1)[-1].rsplit(":", 1)
+    return ThreadingHTTPServer((host, int(port)), handler)
+
+
+def model_handlers() -> dict:
+    # this process holds the models; never proxy to ourselves
+    os.environ.pop("INFERENCE_URL", None)
+    from app.utils.nlp import analyze_sentiment, analyze_sentiment_batch
+    from app.utils.ner import extract_entities_batch
+
+    return {
+        # same results as in-process scoring, whichever mode the client runs
+        "sentiment": lambda texts: [analyze_sentiment(t) for t in texts],
+        "sentiment_long": analyze_sentiment_batch,
+        "ner": extract_entities_batch,
+    }
+
+
+if __name__ == "__main__":
+    start_metrics_server("METRICS_PORT", METRICS_PORT_DEFAULT)
+    server = make_server(LISTEN, model_handlers())
+    print(f"[INFERENCE] Serving on {LISTEN} (batch {MAX_BATCH}, {MAX_LATENCY_MS} ms)")
+    server.serve_forever()
@@ -0,0 +1,275 @@
+# app/services/live.py
+"""
+Live updates: workers publish newly enriched articles and aggregate deltas,
+API processes fan them out to server-sent-event subscribers.
+
+With REDIS_URL set the bus is Redis pub/sub, so any number of workers and
+API replicas share it. Without it, an in-process bus is used (tests and
+single-process runs).
+
+Each subscriber has a bounded buffer. A slow client loses its oldest
+events rather than growing memory, and is sent a `lagged` event so it
+knows to re-fetch the full aggregates. apply_delta marks a bundle
+"lagged" the same way when an entity outside its top_entities may have
+moved into it.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from app.utils.metrics import LIVE_EVENTS_DROPPED, LIVE_EVENTS_PUBLISHED, LIVE_SUBSCRIBERS
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+CHANNEL = os.getenv("LIVE_CHANNEL", "globalpulse:live")
+CLIENT_BUFFER = int(os.getenv("LIVE_CLIENT_BUFFER", 256))
+MAX_SUBSCRIBERS = int(os.getenv("LIVE_MAX_SUBSCRIBERS", 1000))
+RECONNECT_SECONDS = 3
+TOP_ENTITIES = 100  # top_entities in a dashboard bundle
+
+LABELS = ("positive", "negative", "neutral", "error")
+
+
+# -------------------------
+# Events
+# -------------------------
+def article_event(article) -> dict:
+    sentiment = article.sentiment
+    return {
+        "type": "article",
+        "id": article.id,
+        "title": article.title,
+        "url": article.url,
+        "source": article.source,
+        "published_at": str(article.published_at) if article.published_at else None,
+        "sentiment": {"label": sentiment.label, "score": sentiment.score} if sentiment else None,
+        "entities": [{"entity": e.entity, "type": e.entity_type} for e in article.entities],
+    }
+
+
+def delta_event(events: list) -> dict:
+    """Increments to the dashboard-bundle datasets for a batch of article events."""
+    summary = Counter()
+    daily, sources = {}, {}
+    entities = Counter()
+
+    for event in events:
+        label = (event["sentiment"] or {}).get("label")
+        if label:
+            summary["total"] += 1
+            summary[label] += 1
+            day = event["published_at"][:10] if event["published_at"] else "None"
+            daily.setdefault(day, Counter())[label] += 1
+            sources.setdefault(event["source"], Counter())[label] += 1
+        for e in event["entities"]:
+            entities[(e["entity"], e["type"])] += 1
+
+    return {
+        "type": "delta",
+        "sentiment_summary": dict(summary),
+        "daily_sentiment": {d: dict(c) for d, c in daily.items()},
+        "source_sentiment": {s: dict(c) for s, c in sources.items()},
+        "top_entities": [{"entity": n, "type": t, "count": c} for (n, t), c in entities.items()],
+    }
+
+
+def apply_delta(bundle: dict, delta: dict, limit: int = TOP_ENTITIES) -> dict:
+    """Apply a delta event to a /analytics/dashboard-bundle response in place.
+
+    top_entities keeps its `limit`. An entity missing from a full list may
+    already have up to the list's lowest count stored, so if its increment
+    could lift it into the list the bundle gets "lagged": True and its
+    top_entities must be re-fetched.
+    """
+    summary = bundle.setdefault("sentiment_summary", {})
+    for key, count in delta["sentiment_summary"].items():
+        summary[key] = summary.get(key, 0) + count
+
+    for dataset in ("daily_sentiment", "source_sentiment"):
+        target = bundle.setdefault(dataset, {})
+        for key, counts in delta[dataset].items():
+            row = target.setdefault(key, dict.fromkeys(LABELS, 0))
+            for label, count in counts.items():
+                row[label] = row.get(label, 0) + count
+
+    current = bundle.setdefault("top_entities", [])
+    full = len(current) >= limit
+    floor = min(e["count"] for e in current) if full else 0
+    entities = {(e["entity"], e["type"]): e for e in current}
+    outside = []
+    for e in delta["top_entities"]:
+        key = (e["entity"], e["type"])
+        if key in entities:
+            entities[key]["count"] += e["count"]
+        elif full:
+            outside.append(e)
+        else:
+            entities[key] = dict(e)  # the list held every entity, so this one was at 0
+
+    ranked = sorted(entities.values(), key=lambda e: -e["count"])
+    bundle["top_entities"] = ranked[:limit]
+    if outside and any(floor + e["count"] > ranked[limit - 1]["count"] for e in outside):
+        bundle["lagged"] = True
+    return bundle
+
+
+# -------------------------
+# Buses
+# -------------------------
+class LocalBus:
+    """In-process stand-in for Redis pub/sub."""
+
+    def __init__(self):
+        self._listeners = []
+
+    def publish(self, message: str):
+        for callback in list(self._listeners):
+            callback(message)
+
+    def listen(self, callback):
+        self._listeners.append(callback)
+
+
+class RedisBus:
+    def __init__(self, url: str, channel: str = CHANNEL):
+        import redis
+
+        self.redis = redis.Redis.from_url(url)
+        self.channel = channel
+
+    def publish(self, message: str):
+        self.redis.publish(self.channel, message)
+
+    def listen(self, callback):
+        threading.Thread(target=self._listen, args=(callback,), name="live-redis", daemon=True).start()
+
+    def _listen(self, callback):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    callback(message["data"].decode("utf-8"))
+            except Exception as e:
+                print(f"[WARN] Live Redis subscription lost: {e}")
+                time.sleep(RECONNECT_SECONDS)
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_bus():
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = RedisBus(REDIS_URL) if REDIS_URL else LocalBus()
+    return _bus
+
+
+def publish_articles(articles: list) -> int:
+    """Publish one event per article plus one delta; never raises."""
+    if not articles:
+        return 0
+    try:
+        bus = get_bus()
+        events = [article_event(a) for a in articles]
+        for event in events:
+            bus.publish(json.dumps(event))
+        bus.publish(json.dumps(delta_event(events)))
+        LIVE_EVENTS_PUBLISHED.inc(len(events) + 1)
+        return len(events)
+    except Exception as e:
+        print(f"[WARN] Could not publish live events: {e}")
+        return 0
+
+
+# -------------------------
+# Fan-out (API side)
+# -------------------------
+def sse_frame(message: str) -> bytes:
+    event_type = json.loads(message).get("type", "message")
+    return f"event: {event_type}\ndata: {message}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    def __init__(self, loop, buffer: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=buffer)
+        self.dropped = 0
+
+    def offer(self, frame: bytes):
+        """Runs on the subscriber's event loop."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            LIVE_EVENTS_DROPPED.inc()
+        self.queue.put_nowait(frame)
+
+
+def _offer_all(subs: list, frame: bytes):
+    for sub in subs:
+        sub.offer(frame)
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class Broadcaster:
+    """Encodes each bus message once and hands it to every subscriber."""
+
+    def __init__(self, bus=None, buffer: int = CLIENT_BUFFER, max_subscribers: int = MAX_SUBSCRIBERS):
+        self.bus = bus
+        self.buffer = buffer
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._listening = False
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def _ensure_listening(self):
+        with self._lock:
+            if self._listening:
+                return
+            (self.bus or get_bus()).listen(self.dispatch)
+            self._listening = True
+
+    def dispatch(self, message: str):
+        """Called from the bus (any thread)."""
+        frame = sse_frame(message)
+        by_loop = {}
+        with self._lock:
+            for sub in self._subscribers:
+                by_loop.setdefault(sub.loop, []).append(sub)
+        # one wake-up per event loop, not per subscriber
+        for loop, subs in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_offer_all, subs, frame)
+            except RuntimeError:
+                for sub in subs:
+                    self.unsubscribe(sub)  # their loop is gone
+
+    def subscribe(self) -> Subscriber:
+        self._ensure_listening()
+        sub = Subscriber(asyncio.get_running_loop(), self.buffer)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers()
+            self._subscribers.add(sub)
+            LIVE_SUBSCRIBERS.set(len(self._subscribers))
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            self._subscribers.discard(sub)
+            LIVE_SUBSCRIBERS.set(len(self._subscribers))
+
+
+BROADCASTER = Broadcaster()
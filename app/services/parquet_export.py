@@ -0,0 +1,179 @@
+# app/services/parquet_export.py
+"""
+Parquet export for the DuckDB analytics backend.
+
+Rows are exported by day of created_at, one file per table and day:
+
+    EXPORT_DIR/<table>/date=YYYY-MM-DD/part.parquet
+
+Each run re-exports, whole, every day that may have changed since the
+previous one, overwriting its file (or removing it once the day is empty):
+
+  - days of rows with ids above the last run's highest id;
+  - days from the previous run's start minus EXPORT_LAG_SECONDS up to now,
+    which picks up rows a transaction still open during that run committed
+    later with lower ids;
+  - days marked in export_dirty. The backfill and retention write these
+    marks in the same transaction as their UPDATEs and DELETEs (see
+    mark_dirty in app/db/partitioning.py). A mark is removed only after its
+    day was exported.
+
+The first run, or a run over an export in an older layout, rebuilds every
+day. Until a run has finished, `ready` is False and the DuckDB backend
+falls back to SQL. Progress is kept in EXPORT_DIR/_state.json and saved at
+the end of a run, so an interrupted run is redone.
+
+    python -m app.services.parquet_export [--once]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, select
+
+from app.db.database import Base, engine
+from app.db.partitioning import EXPORTED as TABLES, archive_rows, changed_days, partition_day, pq
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", "./data/parquet")
+EXPORT_LAG_SECONDS = int(os.getenv("EXPORT_LAG_SECONDS", 60))
+EXPORT_INTERVAL = int(os.getenv("EXPORT_INTERVAL", 300))
+DELETE_BATCH = 5000
+
+STATE_FILE = "_state.json"
+PART_FILE = "part.parquet"
+LAYOUT = 2  # 1: append-only part-<first id> files
+
+
+# -------------------------
+# State
+# -------------------------
+def load_state(export_dir: str) -> dict:
+    try:
+        with open(os.path.join(export_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(export_dir: str, state: dict):
+    path = os.path.join(export_dir, STATE_FILE)
+    with open(path + ".partial", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".partial", path)
+
+
+def ready(export_dir: str) -> bool:
+    """True once a complete export in the current layout exists."""
+    return load_state(export_dir).get("layout") == LAYOUT
+
+
+def table_glob(export_dir: str, table: str) -> str:
+    return os.path.join(export_dir, table, "*", "*.parquet")
+
+
+# -------------------------
+# Days
+# -------------------------
+def _days_between(first: date, last: date) -> set:
+    return {first + timedelta(days=n) for n in range((last - first).days + 1)}
+
+
+def all_days(conn, table) -> set:
+    """Every day from the oldest to the newest row, plus None if any row lacks created_at."""
+    first, last = conn.execute(select(func.min(table.c.created_at), func.max(table.c.created_at))).one()
+    days = _days_between(partition_day(first), partition_day(last)) if first is not None else set()
+    if conn.execute(select(table.c.id).where(table.c.created_at.is_(None)).limit(1)).first():
+        days.add(None)
+    return days
+
+
+def export_day(conn, name: str, export_dir: str, day) -> int:
+    """Overwrite one day's file with the rows in SQL now; returns rows written."""
+    table = Base.metadata.tables[name]
+    if day is None:
+        where = table.c.created_at.is_(None)
+    else:
+        start = datetime(day.year, day.month, day.day)
+        where = (table.c.created_at >= start) & (table.c.created_at < start + timedelta(days=1))
+
+    folder = os.path.join(export_dir, name, f"date={day.isoformat() if day else 'unknown'}")
+    path = os.path.join(folder, PART_FILE)
+    os.makedirs(folder, exist_ok=True)
+    written = archive_rows(conn, table, where, path)
+    if not written:
+        os.remove(path)
+        shutil.rmtree(folder)
+    return written
+
+
+# -------------------------
+# Export
+# -------------------------
+def export_all(bind=None, export_dir: str = EXPORT_DIR, lag_seconds: int = EXPORT_LAG_SECONDS) -> dict:
+    """Re-export every day changed since the last run; returns rows written per table."""
+    if pq is None:
+        raise RuntimeError("Parquet export needs pyarrow")
+
+    bind = bind or engine
+    os.makedirs(export_dir, exist_ok=True)
+    state = load_state(export_dir)
+    started = datetime.utcnow()
+
+    rebuild = state.get("layout") != LAYOUT
+    if rebuild:
+        # nothing exported yet, or by an older version: start over, unserved meanwhile
+        state = {}
+        save_state(export_dir, state)
+        for name in TABLES:
+            shutil.rmtree(os.path.join(export_dir, name), ignore_errors=True)
+    else:
+        since = datetime.fromisoformat(state["started_at"]) - timedelta(seconds=lag_seconds)
+        recent = _days_between(since.date(), started.date())
+
+    dirty = Base.metadata.tables["export_dirty"]
+    counts, last_ids = {}, {}
+    with bind.connect() as conn:
+        marks = conn.execute(select(dirty.c.id, dirty.c.table_name, dirty.c.day)).all()
+        for name in TABLES:
+            table = Base.metadata.tables[name]
+            last_ids[name] = conn.execute(select(func.max(table.c.id))).scalar() or 0
+            if rebuild:
+                days = all_days(conn, table)
+            else:
+                days = changed_days(conn, table, table.c.id > state["last_ids"].get(name, 0))
+                days |= recent
+                days.update(partition_day(day) for _, table_name, day in marks if table_name == name)
+            counts[name] = sum(
+                export_day(conn, name, export_dir, day)
+                for day in sorted(days, key=lambda d: d or date.min)
+            )
+
+    # only the marks read before exporting; later ones wait for the next run
+    mark_ids = [mark.id for mark in marks]
+    for i in range(0, len(mark_ids), DELETE_BATCH):
+        with bind.begin() as conn:
+            conn.execute(delete(dirty).where(dirty.c.id.in_(mark_ids[i:i + DELETE_BATCH])))
+
+    save_state(export_dir, {"layout": LAYOUT, "started_at": started.isoformat(), "last_ids": last_ids})
+    return counts
+
+
+if __name__ == "__main__":
+    from app.db import models  # noqa: F401  (register tables)
+
+    parser = argparse.ArgumentParser(description="Re-export changed days to Parquet.")
+    parser.add_argument("--once", action="store_true", help="export once and exit")
+    args = parser.parse_args()
+
+    while True:
+        try:
+            print(f"[EXPORT] {export_all()}")
+        except Exception as e:
+            print(f"[ERROR] Parquet export failed: {e}")
+        if args.once:
+            break
+        time.sleep(EXPORT_INTERVAL)
@@ -13,7 +13,7 @@ def process_unlabeled_articles(limit=50):
     try:
         articles = (
             db.query(Article)
-            .filter(Article.sentiment == None)
+            .filter(Article.sentiment == None, Article.canonical_id == None)
             .limit(limit)
             .all()
         )
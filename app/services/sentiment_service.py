@@ -2,13 +2,19 @@
 
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.utils.nlp import analyze_sentiment
+from app.utils.nlp import TRUNCATED_VERSION, analyze_sentiment
 from app.db.models import Article, SentimentResult
+from app.services import entity_sentiment
+from app.utils.tracing import span
 
 
 def process_sentiment_for_article(article: Article, db: Session) -> SentimentResult:
     """Run sentiment analysis on a single article and store the result."""
+    with span("process_sentiment_for_article", article_id=article.id):
+        return _process_sentiment(article, db)
 
+
+def _process_sentiment(article: Article, db: Session) -> SentimentResult:
     # Skip if sentiment already exists
     if article.sentiment:
         return article.sentiment
@@ -21,10 +27,15 @@ def process_sentiment_for_article(article: Article, db: Session) -> SentimentRes
         label=result["label"],
         score=float(result["score"]),
         created_at=datetime.utcnow(),
+        model_version=TRUNCATED_VERSION,
     )
 
-    db.add(sentiment)
-    db.commit()
-    db.refresh(sentiment)
+    with span("sentiment.commit"):
+        db.add(sentiment)
+        if article.entities:
+            article.sentiment = sentiment
+            entity_sentiment.record(db, [entity_sentiment.article_item(article)])
+        db.commit()
+        db.refresh(sentiment)
 
-    return sentiment
\ No newline at end of file
+    return sentiment
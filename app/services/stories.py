@@ -0,0 +1,291 @@
+# app/services/stories.py
+
+import os
+import re
+import threading
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.db.models import ArticleStory, Story
+from app.utils.keywords import STOPWORDS
+from app.utils.metrics import STORY_ASSIGN_SECONDS, STORIES_ACTIVE
+from app.utils.tracing import span
+
+
+DIM = 1024                      # hashed feature space
+TITLE_WEIGHT = 2.0
+INITIAL_CAPACITY = 1024
+PROBE_DIMS = 16                 # an article's heaviest dimensions, used to shortlist stories
+SHORTLIST = 32                  # shortlisted stories scored exactly
+
+THRESHOLD = float(os.getenv("STORY_SIMILARITY", 0.4))    # cosine to join a story
+WINDOW_HOURS = int(os.getenv("STORY_WINDOW_HOURS", 48))  # stories idle longer are closed
+MAX_OPEN = int(os.getenv("STORY_MAX_OPEN", 50_000))      # ~4 KB each; the smallest, stalest close first
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9]+")
+
+
+# -------------------------
+# Hashed vectors
+# -------------------------
+def tokens(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOPWORDS]
+
+
+def vectorize(title: str, content: str) -> np.ndarray:
+    """L2-normalised signed hashed bag of words (title counts double)."""
+    vec = np.zeros(DIM, dtype=np.float32)
+    for weight, text in ((TITLE_WEIGHT, title), (1.0, content)):
+        for tok in tokens(text or ""):
+            h = zlib.crc32(tok.encode("utf-8"))
+            vec[h % DIM] += weight if h & 0x80000000 else -weight
+
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+# -------------------------
+# Online clustering
+# -------------------------
+class StoryClusterer:
+    """Mini-batch online clustering against precomputed centroids.
+
+    Centroids are stored transposed (DIM x stories) next to the norm of each
+    story's vector sum, about 4 KB per story. An article's PROBE_DIMS
+    heaviest dimensions are then contiguous rows: their partial dot product
+    shortlists SHORTLIST stories, and only those are scored exactly, so an
+    assignment reads a fraction of the matrix rather than all of it.
+    Existing centroids are refreshed once per batch; stories opened inside a
+    batch are updated immediately so later rows can join them. At most
+    max_open stories stay open.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, window_hours: int = WINDOW_HOURS,
+                 max_open: int = MAX_OPEN):
+        self.threshold = threshold
+        self.window = timedelta(hours=window_hours)
+        self.max_open = max_open
+        self.keys = []              # story ids, column-aligned with the matrix
+        self.last_seen = []
+        # preallocated and grown by doubling: most articles open a new story
+        self._centroids = np.zeros((DIM, INITIAL_CAPACITY), dtype=np.float32)
+        self._norms = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """Normalised centroids, one row per open story."""
+        return self._centroids[:, :len(self.keys)].T
+
+    def sum_of(self, row: int) -> np.ndarray:
+        """The story's vector sum, as stored in Story.centroid."""
+        return self._centroids[:, row] * self._norms[row]
+
+    def _append(self, keys: list, sums: np.ndarray, last_seen: list):
+        n, needed = len(self.keys), len(self.keys) + len(keys)
+        if needed > len(self._norms):
+            # retire() trims back under max_open before every batch
+            capacity = max(needed, min(2 * len(self._norms), self.max_open + INITIAL_CAPACITY))
+            centroids = np.zeros((DIM, capacity), dtype=np.float32)
+            centroids[:, :n] = self._centroids[:, :n]
+            norms = np.zeros(capacity, dtype=np.float32)
+            norms[:n] = self._norms[:n]
+            self._centroids, self._norms = centroids, norms
+
+        norms = np.linalg.norm(sums, axis=1)
+        self._centroids[:, n:needed] = (sums / np.where(norms, norms, 1.0)[:, None]).T
+        self._norms[n:needed] = norms
+        self.keys.extend(keys)
+        self.last_seen.extend(last_seen)
+
+    def _keep(self, keep: list):
+        self._centroids[:, :len(keep)] = self._centroids[:, keep]
+        self._norms[:len(keep)] = self._norms[keep]
+        self.keys = [self.keys[i] for i in keep]
+        self.last_seen = [self.last_seen[i] for i in keep]
+
+    def load(self, rows: list):
+        """Add open stories as (key, centroid_sum, last_seen) tuples."""
+        if not rows:
+            return
+        self._append([r[0] for r in rows], np.vstack([r[1] for r in rows]), [r[2] for r in rows])
+
+    def retire(self, now: datetime) -> list:
+        """Close idle stories, then the smallest and stalest past max_open; returns their keys.
+
+        Over the cap it closes down to 90% of max_open, so the ranking runs
+        once per several thousand new stories rather than every batch.
+        """
+        cutoff = now - self.window
+        keep = [i for i, seen in enumerate(self.last_seen) if seen >= cutoff]
+        if len(keep) > self.max_open:
+            # a story's sum grows with its members: singletons have norm 1
+            ranked = sorted(keep, key=lambda i: (self._norms[i], self.last_seen[i]))
+            keep = sorted(ranked[len(keep) - int(self.max_open * 0.9):])
+        if len(keep) == len(self.keys):
+            return []
+
+        kept = set(keep)
+        closed = [k for i, k in enumerate(self.keys) if i not in kept]
+        self._keep(keep)
+        return closed
+
+    def best(self, vec: np.ndarray) -> tuple:
+        """(row, cosine) of the open story closest to `vec`, from the shortlist."""
+        n = len(self.keys)
+        centroids = self._centroids[:, :n]
+        if n <= SHORTLIST:
+            candidates = np.arange(n)
+        else:
+            dims = np.argpartition(np.abs(vec), -PROBE_DIMS)[-PROBE_DIMS:]
+            partial = vec[dims] @ centroids[dims]
+            candidates = np.argpartition(partial, -SHORTLIST)[-SHORTLIST:]
+        # hashed bags of words are sparse: the exact score only needs vec's nonzero dims
+        nonzero = np.flatnonzero(vec)
+        sims = vec[nonzero] @ centroids[nonzero[:, None], candidates]
+        j = int(np.argmax(sims))
+        return int(candidates[j]), float(sims[j])
+
+    def assign(self, vectors: np.ndarray, now: datetime) -> list:
+        """Assign each row of `vectors` to a story.
+
+        Returns (row_index, similarity, is_new) per vector; row_index points
+        into keys, where new stories are appended with key None.
+        """
+        existing = len(self.keys)
+
+        new_sums = []
+        assignments = []
+        for vec in vectors:
+            best, score = -1, self.threshold
+            if existing:
+                j, sim = self.best(vec)
+                if sim >= score:
+                    best, score = j, sim
+
+            # stories opened earlier in this batch
+            for k, s in enumerate(new_sums):
+                sim = float(vec @ s) / float(np.linalg.norm(s))
+                if sim >= score:
+                    best, score = existing + k, sim
+
+            if best < 0:
+                new_sums.append(vec.copy())
+                assignments.append((existing + len(new_sums) - 1, 1.0, True))
+            else:
+                if best >= existing:
+                    new_sums[best - existing] += vec
+                assignments.append((best, score, False))
+
+        # mini-batch update of the existing centroids
+        members = [n for n, a in enumerate(assignments) if a[0] < existing]
+        if members:
+            idx = np.array([assignments[n][0] for n in members])
+            rows = np.unique(idx)
+            sums = self._centroids[:, rows].T * self._norms[rows, None]
+            np.add.at(sums, np.searchsorted(rows, idx), vectors[members])
+            norms = np.linalg.norm(sums, axis=1)
+            self._centroids[:, rows] = (sums / np.where(norms, norms, 1.0)[:, None]).T
+            self._norms[rows] = norms
+            for r in rows:
+                self.last_seen[r] = now
+
+        if new_sums:
+            self._append([None] * len(new_sums), np.vstack(new_sums), [now] * len(new_sums))
+
+        return assignments
+
+
+# -------------------------
+# Persistence
+# -------------------------
+_clusterer = None
+_clusterer_lock = threading.Lock()
+
+
+def get_clusterer(db) -> StoryClusterer:
+    """Process-wide clusterer, loaded from open stories on first use."""
+    global _clusterer
+    if _clusterer is None:
+        with _clusterer_lock:
+            if _clusterer is None:
+                clusterer = StoryClusterer()
+                since = datetime.utcnow() - clusterer.window
+                clusterer.load([
+                    (story.id, np.frombuffer(story.centroid, dtype=np.float32), story.last_seen_at)
+                    for story in db.query(Story).filter(Story.last_seen_at >= since).all()
+                    if story.centroid
+                ])
+                print(f"[STORIES] Loaded {len(clusterer)} open stories")
+                _clusterer = clusterer
+    return _clusterer
+
+
+def assign_stories(db, articles: list) -> int:
+    """Cluster freshly enriched articles into stories; returns how many were assigned.
+
+    Near-duplicates (canonical_id set) are skipped: they count toward their
+    canonical article's story.
+    """
+    articles = [a for a in articles if a.id is not None and a.canonical_id is None]
+    if not articles:
+        return 0
+
+    clusterer = get_clusterer(db)
+    now = datetime.utcnow()
+
+    try:
+        with clusterer.lock, span("stories.assign", n=len(articles)):
+            _assign(db, clusterer, articles, now)
+    except Exception:
+        # in-memory centroids may now disagree with the database; reload next time
+        _reset()
+        raise
+
+    return len(articles)
+
+
+def _reset():
+    global _clusterer
+    _clusterer = None
+
+
+def _assign(db, clusterer: StoryClusterer, articles: list, now: datetime):
+    clusterer.retire(now)
+
+    vectors = np.vstack([vectorize(a.title, a.content) for a in articles])
+    with STORY_ASSIGN_SECONDS.time():
+        assignments = clusterer.assign(vectors, now)
+
+    # open new stories first so their ids exist
+    stories = {}
+    for article, (row, _, is_new) in zip(articles, assignments):
+        if is_new:
+            story = Story(title=article.title, article_count=0, first_seen_at=now, last_seen_at=now)
+            db.add(story)
+            db.flush()
+            clusterer.keys[row] = story.id
+            stories[story.id] = story
+
+    missing = {clusterer.keys[row] for row, _, _ in assignments} - set(stories)
+    if missing:
+        stories.update({s.id: s for s in db.query(Story).filter(Story.id.in_(missing)).all()})
+
+    touched = set()
+    for article, (row, similarity, _) in zip(articles, assignments):
+        story = stories[clusterer.keys[row]]
+        story.article_count = (story.article_count or 0) + 1
+        story.last_seen_at = now
+        touched.add(row)
+        db.merge(ArticleStory(article_id=article.id, story_id=story.id, similarity=similarity, assigned_at=now))
+
+    for row in touched:
+        stories[clusterer.keys[row]].centroid = clusterer.sum_of(row).tobytes()
+
+    db.commit()
+    STORIES_ACTIVE.set(len(clusterer))
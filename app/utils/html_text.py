@@ -0,0 +1,144 @@
+# app/utils/html_text.py
+
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+
+# Same tables BeautifulSoup's html.parser builder uses, so output matches
+# BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+_builder = HTMLParserTreeBuilder()
+EMPTY_ELEMENT_TAGS = frozenset(_builder.empty_element_tags)
+STRING_CONTAINER_TAGS = frozenset(_builder.string_containers)
+ENTITIES = EntitySubstitution.HTML_ENTITY_TO_CHARACTER
+
+
+class _TextExtractor(HTMLParser):
+    """Event-mode parser that keeps only the text get_text() would return.
+
+    Mirrors bs4's tree builder without building a tree: a text run ends at
+    every tag / comment / declaration, text inside <script>, <style>,
+    <template>, <rt> and <rp> is dropped, and end tags pop back to the most
+    recent open tag of the same name.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts = []
+        self._data = []
+        self._stack = []
+        self._open = {}
+        self._containers = 0
+        self._closed_empty = []
+
+    # -- text runs --
+    def _end_data(self):
+        if not self._data:
+            return
+        text = "".join(self._data).strip()
+        self._data = []
+        if text and not self._containers:
+            self.parts.append(text)
+
+    # -- tag stack --
+    def _push(self, tag: str):
+        self._stack.append(tag)
+        self._open[tag] = self._open.get(tag, 0) + 1
+        if tag in STRING_CONTAINER_TAGS:
+            self._containers += 1
+
+    def _pop_to(self, tag: str):
+        if not self._open.get(tag):
+            return
+        while self._stack:
+            name = self._stack.pop()
+            self._open[name] -= 1
+            if name in STRING_CONTAINER_TAGS:
+                self._containers -= 1
+            if name == tag:
+                return
+
+    # -- HTMLParser events --
+    def handle_starttag(self, tag, attrs):
+        self._end_data()
+        self._push(tag)
+        if tag in EMPTY_ELEMENT_TAGS:
+            self._pop_to(tag)
+            self._closed_empty.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_data()
+        self._push(tag)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_empty:
+            # </br> after <br>: bs4 swallows it without ending the text run
+            self._closed_empty.remove(tag)
+            return
+        self._end_data()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        base = 10
+        digits = name
+        if name[:1] in ("x", "X"):
+            base = 16
+            digits = name[1:]
+
+        valid = "0123456789abcdefABCDEF" if base == 16 else "0123456789"
+        end = 0
+        while end < len(digits) and digits[end] in valid:
+            end += 1
+
+        if end == 0:
+            self._data.append(digits)
+            return
+
+        char, _ = UnicodeDammit.numeric_character_reference(int(digits[:end], base))
+        self._data.append(char)
+        self._data.append(digits[end:])
+
+    def handle_entityref(self, name):
+        char = ENTITIES.get(name)
+        self._data.append(char if char is not None else f"&{name}")
+
+    def handle_comment(self, data):
+        self._end_data()
+
+    def handle_decl(self, decl):
+        self._end_data()
+
+    def handle_pi(self, data):
+        self._end_data()
+
+    def unknown_decl(self, data):
+        self._end_data()
+        if data.upper().startswith("CDATA["):
+            # CDATA text is kept even inside string containers
+            text = data[len("CDATA["):].strip()
+            if text:
+                self.parts.append(text)
+
+
+def strip_html(text: str) -> str:
+    """Visible text of an HTML fragment, space-joined, like bs4 get_text(" ", strip=True)."""
+    if not text:
+        return ""
+
+    # plain text: nothing to parse or decode
+    if "<" not in text and "&" not in text:
+        return text.strip()
+
+    try:
+        parser = _TextExtractor()
+        parser.feed(text)
+        parser.close()
+        parser._end_data()
+        return " ".join(parser.parts)
+    except Exception:
+        return BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
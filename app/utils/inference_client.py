@@ -0,0 +1,66 @@
+# app/utils/inference_client.py
+"""Client for the local model server (app/services/inference_server.py)."""
+
+import http.client
+import json
+import os
+import socket
+import threading
+
+TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", 60))
+
+_local = threading.local()
+
+
+class InferenceError(Exception):
+    pass
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float = TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def _connect(url: str):
+    if url.startswith("unix://"):
+        return UnixHTTPConnection(url[len("unix://"):])
+    host, port = url.split("://", 1)[-1].rstrip("/").rsplit(":", 1)
+    return http.client.HTTPConnection(host, int(port), timeout=TIMEOUT)
+
+
+def _connection(url: str):
+    """One keep-alive connection per thread and server."""
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    if url not in conns:
+        conns[url] = _connect(url)
+    return conns[url]
+
+
+def call(url: str, model: str, texts: list) -> list:
+    """Results of `model` ("sentiment" or "ner") for each text, from the server at `url`."""
+    body = json.dumps({"texts": texts})
+    for attempt in (1, 2):
+        conn = _connection(url)
+        try:
+            conn.request("POST", f"/{model}", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            payload = json.loads(response.read())
+            break
+        except (ConnectionError, http.client.HTTPException, socket.timeout, OSError):
+            # the server closed an idle keep-alive connection or restarted
+            conn.close()
+            _local.conns.pop(url, None)
+            if attempt == 2:
+                raise
+
+    if response.status != 200:
+        raise InferenceError(payload.get("error", f"HTTP {response.status}"))
+    return payload["results"]
@@ -0,0 +1,114 @@
+# app/utils/keywords.py
+"""
+Keyword extraction shared by the API, DuckDB analytics and ingest-time indexing.
+
+A keyword is a run of ASCII letters, lowercased, longer than three
+characters and not a stopword; a bigram is two keywords that are adjacent
+in the text (nothing but non-letters between them).
+
+count_keywords() works on many documents at once: each block of documents
+is tokenized with a few whole-block string operations and counted in C by
+Counter, and length and stopword rules are applied to the vocabulary
+afterwards rather than to every token.
+"""
+
+import re
+from collections import Counter
+from itertools import islice
+
+MIN_LENGTH = 4
+BLOCK = 10_000  # documents tokenized together
+
+STOPWORDS = set("""
+                will first content post time need cent people like other when appeared best features million free high plan help country back billion make tool online years
+a an the and or but if while then than
+of for with without within
+to from in on at by about into onto upon
+is was are were be been being
+it this that these those
+you your yours we our us they them their
+as so just very really
+what which who whom whose
+also too much many most
+can could should would may might
+do does did doing done
+has have had having
+not no yes
+all any each every some
+there here after before during
+such though although however still
+because since until
+over under again once even only
+more less few several
+out up down off
+i me my mine
+he him his she her hers
+one two three four five
+really actually basically literally kinda sort maybe probably
+new latest update report reports reporting
+breaking developing announced announcement
+news article media sources source experts
+today yesterday tomorrow week month year
+said says saying according
+company companies firm firms organization organizations
+market markets
+global international world national
+industry industries sector sectors
+single game review read
+""".split())
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Batched path: lowercase a block, encode, and turn every byte that is not
+# a-z into a space, so bytes.split() yields the same tokens as _WORD_RE
+# (non-ASCII letters are separators in both). Documents are joined around
+# a one-letter token, never a keyword, so no bigram spans two of them.
+_SEP = " x "
+_TABLE = bytes(c if 97 <= c <= 122 else 32 for c in range(256))
+
+
+def is_keyword(word: str) -> bool:
+    return len(word) >= MIN_LENGTH and word not in STOPWORDS
+
+
+def extract_keywords(text: str, ngram: int = 1) -> list:
+    """Keywords of one text in order; ngram=2 gives "word word" bigrams instead."""
+    if not text:
+        return []
+    words = _WORD_RE.findall(text.lower())
+    if ngram == 2:
+        return [f"{a} {b}" for a, b in zip(words, words[1:]) if is_keyword(a) and is_keyword(b)]
+    return [w for w in words if is_keyword(w)]
+
+
+def _token_blocks(texts, size: int):
+    texts = iter(texts)
+    while True:
+        block = list(islice(texts, size))
+        if not block:
+            return
+        yield _SEP.join(t for t in block if t).lower().encode("utf-8").translate(_TABLE).split()
+
+
+def count_keywords(texts, top: int = 50, ngram: int = 1, block: int = BLOCK) -> list:
+    """[(keyword, count)] over an iterable of texts, most common first.
+
+    Every token (or adjacent pair) is counted, then the vocabulary is
+    filtered, so ties keep first-seen order as Counter(extract_keywords())
+    would.
+    """
+    counts = Counter()
+    for tokens in _token_blocks(texts, block):
+        counts.update(zip(tokens, tokens[1:]) if ngram == 2 else tokens)
+
+    kept = Counter()
+    for key, n in counts.items():
+        if ngram == 2:
+            a, b = key[0].decode("ascii"), key[1].decode("ascii")
+            if is_keyword(a) and is_keyword(b):
+                kept[f"{a} {b}"] = n
+        else:
+            word = key.decode("ascii")
+            if is_keyword(word):
+                kept[word] = n
+    return kept.most_common(top)
@@ -0,0 +1,267 @@
+# app/utils/metrics.py
+
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+
+# -------------------------
+# Scraper
+# -------------------------
+FEED_FETCHES = Counter(
+    "gp_feed_fetches_total",
+    "Feed fetch attempts by outcome.",
+    ["status"],
+)
+FEED_FETCH_OK = FEED_FETCHES.labels("ok")
+FEED_FETCH_ERROR = FEED_FETCHES.labels("error")
+
+FEED_FETCH_SECONDS = Histogram(
+    "gp_feed_fetch_seconds",
+    "Feed fetch time (download + feedparser in sequential mode, download only in pipeline mode).",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+FEED_PARSE_SECONDS = Histogram(
+    "gp_feed_parse_seconds",
+    "feedparser + clean_html time per feed in the parse process pool.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+FEED_BYTES_WIRE = Counter(
+    "gp_feed_bytes_wire_total",
+    "Feed body bytes received over the network (compressed when negotiated).",
+)
+
+FEED_BYTES_DECODED = Counter(
+    "gp_feed_bytes_decoded_total",
+    "Feed body bytes after Content-Encoding was decoded.",
+)
+
+HOST_WAIT_SECONDS = Histogram(
+    "gp_host_wait_seconds",
+    "Time a fetch waited for its host's rate limit / concurrency slot.",
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+HOST_THROTTLED = Counter(
+    "gp_host_throttled_total",
+    "429/503 responses that put a host into backoff.",
+)
+
+FEEDS_QUARANTINE_SKIPPED = Counter(
+    "gp_feeds_quarantine_skipped_total",
+    "Feeds skipped because they are quarantined after repeated failures.",
+)
+
+FEED_ENTRIES = Counter(
+    "gp_feed_entries_total",
+    "Feed entries seen by the scraper.",
+)
+
+ARTICLES_INSERTED = Counter(
+    "gp_articles_inserted_total",
+    "New articles written by the scraper.",
+)
+
+ARTICLES_DUPLICATE = Counter(
+    "gp_articles_near_duplicate_total",
+    "New articles linked to an earlier canonical article by the near-duplicate index.",
+)
+
+SPOOL_RECORDS = Counter(
+    "gp_spool_records_total",
+    "Feed entries appended to the write-ahead spool and loaded from it into the database.",
+    ["stage"],
+)
+SPOOL_WRITTEN = SPOOL_RECORDS.labels("written")
+SPOOL_LOADED = SPOOL_RECORDS.labels("loaded")
+
+SPOOL_BACKLOG_BYTES = Gauge(
+    "gp_spool_backlog_bytes",
+    "Spooled bytes not yet loaded into the database.",
+)
+
+ARTICLE_INSERT_SECONDS = Histogram(
+    "gp_article_insert_seconds",
+    "Duplicate check + insert + commit time per entry.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+# -------------------------
+# Models
+# -------------------------
+SENTIMENT_SECONDS = Histogram(
+    "gp_sentiment_inference_seconds",
+    "analyze_sentiment latency.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+SENTIMENT_LABELS = Counter(
+    "gp_sentiment_results_total",
+    "Sentiment results by label.",
+    ["label"],
+)
+
+SENTIMENT_CHUNKS = Histogram(
+    "gp_sentiment_chunks",
+    "Token windows scored per article in long-document sentiment mode.",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16),
+)
+
+NER_SECONDS = Histogram(
+    "gp_ner_inference_seconds",
+    "extract_entities latency.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+INFERENCE_BATCH_SIZE = Histogram(
+    "gp_inference_batch_size",
+    "Texts per dynamic batch in the inference server.",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+INFERENCE_QUEUE_SECONDS = Histogram(
+    "gp_inference_queue_seconds",
+    "Time a request waited in the inference server before its batch ran.",
+    ["model"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+STORY_ASSIGN_SECONDS = Histogram(
+    "gp_story_assign_seconds",
+    "Centroid matching time per story-clustering batch.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1),
+)
+
+STORIES_ACTIVE = Gauge(
+    "gp_stories_active",
+    "Open stories held in the clusterer.",
+)
+
+# -------------------------
+# Workers
+# -------------------------
+WORKER_BATCH_SIZE = Histogram(
+    "gp_worker_batch_size",
+    "Articles picked up per sentiment worker batch.",
+    buckets=(1, 5, 10, 25, 50, 100),
+)
+
+WORKER_QUEUE_DEPTH = Gauge(
+    "gp_worker_queue_depth",
+    "Articles still waiting for sentiment.",
+)
+
+WORKER_ARTICLES = Counter(
+    "gp_worker_articles_total",
+    "Articles handled by the sentiment worker by outcome.",
+    ["status"],
+)
+
+SCRAPE_SWEEP_SECONDS = Gauge(
+    "gp_scrape_sweep_seconds",
+    "Duration of the last full RSS sweep.",
+)
+
+SHARD_FEEDS_OWNED = Gauge(
+    "gp_shard_feeds_owned",
+    "Feeds assigned to this scraper node in the current sweep.",
+)
+
+SHARD_FEEDS_DONE = Gauge(
+    "gp_shard_feeds_done",
+    "Feeds this scraper node has finished in the current sweep.",
+)
+
+# -------------------------
+# API
+# -------------------------
+HTTP_REQUEST_SECONDS = Histogram(
+    "gp_http_request_seconds",
+    "API request latency by route.",
+    ["route"],
+)
+
+HTTP_DB_SECONDS = Histogram(
+    "gp_http_db_seconds",
+    "Database time spent per API request by route.",
+    ["route"],
+)
+
+LIVE_SUBSCRIBERS = Gauge(
+    "gp_live_subscribers",
+    "Open /live/stream connections in this API process.",
+)
+
+LIVE_EVENTS_PUBLISHED = Counter(
+    "gp_live_events_published_total",
+    "Article and delta events published to the live bus.",
+)
+
+LIVE_EVENTS_DROPPED = Counter(
+    "gp_live_events_dropped_total",
+    "Live events dropped because a subscriber's buffer was full.",
+)
+
+
+# -------------------------
+# DB pool (read on scrape)
+# -------------------------
+class PoolCollector:
+    """Expose get_pool_status() as gauges at scrape time."""
+
+    def collect(self):
+        from app.db.database import get_pool_status
+
+        status = get_pool_status()
+        role = status["role"]
+
+        for key in ("size", "checked_in", "checked_out", "overflow"):
+            if key in status:
+                g = GaugeMetricFamily(f"gp_db_pool_{key}", f"Connection pool {key}.", labels=["role"])
+                g.add_metric([role], status[key])
+                yield g
+
+        if "checkouts" in status:
+            c = CounterMetricFamily("gp_db_pool_checkouts", "Connection checkouts.", labels=["role"])
+            c.add_metric([role], status["checkouts"])
+            yield c
+
+            c = CounterMetricFamily("gp_db_pool_timeouts", "Connection checkout timeouts.", labels=["role"])
+            c.add_metric([role], status["timeouts"])
+            yield c
+
+            c = CounterMetricFamily("gp_db_pool_wait_seconds", "Total time spent waiting for a connection.", labels=["role"])
+            c.add_metric([role], status["wait_seconds_total"])
+            yield c
+
+
+REGISTRY.register(PoolCollector())
+
+
+def render_latest():
+    """Body + content type for a /metrics response."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(env_var: str, default_port: int):
+    """Serve /metrics on a side port for worker processes (0 disables)."""
+    port = int(os.getenv(env_var, default_port))
+    if port <= 0:
+        return
+
+    try:
+        start_http_server(port)
+        print(f"[METRICS] Serving metrics on :{port}")
+    except OSError as e:
+        print(f"[WARN] Could not start metrics server on :{port}: {e}")
@@ -1,14 +1,33 @@
 # app/utils/ner.py
 
+import os
 import re
-from transformers import pipeline
+from app.utils import inference_client
+from app.utils.metrics import NER_SECONDS
+from app.utils.tracing import span
 
-# Load one time
-ner_model = pipeline(
-    "ner",
-    model="dslim/bert-base-NER",
-    aggregation_strategy="simple"
-)
+MODEL_NAME = "dslim/bert-base-NER"
+FORWARD_BATCH = int(os.getenv("NER_FORWARD_BATCH", 32))
+
+# Bump when clean_entity() or group_entities() change what is extracted;
+# stored with every result so app/services/backfill.py can re-run history
+HEURISTICS_VERSION = 1
+MODEL_VERSION = f"{MODEL_NAME}/heuristics-{HEURISTICS_VERSION}"
+
+# Client mode: the model lives in app/services/inference_server.py
+INFERENCE_URL = os.getenv("INFERENCE_URL", "")
+
+if INFERENCE_URL:
+    ner_model = None
+else:
+    from transformers import pipeline
+
+    # Load one time
+    ner_model = pipeline(
+        "ner",
+        model=MODEL_NAME,
+        aggregation_strategy="simple"
+    )
 
 def clean_entity(text: str) -> str:
     """
@@ -30,28 +49,17 @@ def clean_entity(text: str) -> str:
     return text.title()
 
 
-def extract_entities(text: str) -> dict:
-    """
-    Extract structured entities from raw text with cleanup.
-    Returns:
-    {
-        "people": [...],
-        "organizations": [...],
-        "locations": [...],
-        "products": [...],  # loosely inferred
+def _empty() -> dict:
+    return {
+        "people": [],
+        "organizations": [],
+        "locations": [],
+        "products": [],
     }
-    """
-
-    if not text:
-        return {
-            "people": [],
-            "organizations": [],
-            "locations": [],
-            "products": [],
-        }
 
-    ner_results = ner_model(text)
 
+def group_entities(ner_results: list) -> dict:
+    """Raw pipeline output for one text -> cleaned entity sets by type."""
     people = set()
     orgs = set()
     locs = set()
@@ -84,4 +92,47 @@ def extract_entities(text: str) -> dict:
         "organizations": sorted(orgs),
         "locations": sorted(locs),
         "products": sorted(prods),
-    }
\ No newline at end of file
+    }
+
+
+def extract_entities(text: str) -> dict:
+    """
+    Extract structured entities from raw text with cleanup.
+    Returns:
+    {
+        "people": [...],
+        "organizations": [...],
+        "locations": [...],
+        "products": [...],  # loosely inferred
+    }
+    """
+
+    if not text:
+        return _empty()
+
+    if INFERENCE_URL:
+        return extract_entities_batch([text])[0]
+
+    with NER_SECONDS.time(), span("ner.inference"):
+        ner_results = ner_model(text)
+
+    return group_entities(ner_results)
+
+
+def extract_entities_batch(texts: list) -> list:
+    """extract_entities() for many texts with padded, batched forward passes."""
+    if INFERENCE_URL:
+        with NER_SECONDS.time(), span("ner.inference", n=len(texts), remote=True):
+            return inference_client.call(INFERENCE_URL, "ner", texts)
+
+    results = [_empty() for _ in texts]
+    todo = [i for i, text in enumerate(texts) if text]
+    if not todo:
+        return results
+
+    with NER_SECONDS.time(), span("ner.inference", n=len(todo)):
+        outputs = ner_model([texts[i] for i in todo], batch_size=FORWARD_BATCH)
+
+    for i, ner_results in zip(todo, outputs):
+        results[i] = group_entities(ner_results)
+    return results
@@ -1,18 +1,51 @@
 # app/utils/nlp.py
 
+import os
 import re
-from transformers import pipeline, AutoTokenizer
+from app.utils import inference_client
+from app.utils.metrics import SENTIMENT_SECONDS, SENTIMENT_LABELS, SENTIMENT_CHUNKS
+from app.utils.tracing import span
 
 
 MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+# Long-document mode: overlapping windows over the whole text
+CHUNK_TOKENS = int(os.getenv("SENTIMENT_CHUNK_TOKENS", 510))    # + [CLS]/[SEP] = model max
+CHUNK_OVERLAP = int(os.getenv("SENTIMENT_CHUNK_OVERLAP", 64))
+MAX_CHUNKS = int(os.getenv("SENTIMENT_MAX_CHUNKS", 8))           # per article, bounds latency
+FORWARD_BATCH = int(os.getenv("SENTIMENT_FORWARD_BATCH", 32))    # chunks per padded forward pass
 
-sentiment_analyzer = pipeline(
-    "sentiment-analysis",
-    model=MODEL_NAME,
-    tokenizer=tokenizer
-)
+# Binary scores inside this band are labelled neutral
+NEUTRAL_BAND = (0.45, 0.55)
+
+# Enrichment scores title + full content in overlapping windows
+# (SENTIMENT_LONG_TEXT=0: first 512 tokens of content or title)
+LONG_TEXT = os.getenv("SENTIMENT_LONG_TEXT", "1") == "1"
+
+# Stored with every result; a change re-scores history (app/services/backfill.py).
+# The two modes score the same article differently, so each has its own.
+_BASE_VERSION = f"{MODEL_NAME}/neutral-{NEUTRAL_BAND[0]}-{NEUTRAL_BAND[1]}"
+TRUNCATED_VERSION = f"{_BASE_VERSION}/truncate-512"
+LONG_TEXT_VERSION = f"{_BASE_VERSION}/chunks-{CHUNK_TOKENS}-{CHUNK_OVERLAP}-{MAX_CHUNKS}"
+MODEL_VERSION = LONG_TEXT_VERSION if LONG_TEXT else TRUNCATED_VERSION
+
+# Client mode: the models live in app/services/inference_server.py and this
+# process never imports transformers/torch (~700 MB before any weights)
+INFERENCE_URL = os.getenv("INFERENCE_URL", "")
+
+if INFERENCE_URL:
+    tokenizer = sentiment_analyzer = None
+else:
+    import torch
+    from transformers import pipeline, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+
+    sentiment_analyzer = pipeline(
+        "sentiment-analysis",
+        model=MODEL_NAME,
+        tokenizer=tokenizer
+    )
 
 def clean_text(text: str) -> str:
     """Remove URLs + normalize whitespace."""
@@ -41,8 +74,11 @@ def analyze_sentiment(text: str) -> dict:
     - negative
     - neutral (custom threshold)
     """
+    if INFERENCE_URL:
+        return _remote_sentiment("sentiment", [text])[0]
 
-    cleaned = clean_text(text)
+    with span("sentiment.clean_text"):
+        cleaned = clean_text(text)
 
     if cleaned == "":
         return {
@@ -51,17 +87,17 @@ def analyze_sentiment(text: str) -> dict:
             "cleaned_text": ""
         }
 
-    safe_text = truncate_text(cleaned)
+    with span("sentiment.tokenize"):
+        safe_text = truncate_text(cleaned)
 
     try:
-        result = sentiment_analyzer(safe_text)[0]
+        with SENTIMENT_SECONDS.time(), span("sentiment.inference"):
+            result = sentiment_analyzer(safe_text)[0]
         raw_label = result["label"].lower()  # "positive" or "negative"
         score = float(result["score"])
+        mapped_label = map_label(raw_label, score)
 
-        if 0.45 < score < 0.55:
-            mapped_label = "neutral"
-        else:
-            mapped_label = raw_label
+        SENTIMENT_LABELS.labels(mapped_label).inc()
 
         return {
             "label": mapped_label,
@@ -70,9 +106,147 @@ def analyze_sentiment(text: str) -> dict:
         }
 
     except Exception as e:
+        SENTIMENT_LABELS.labels("error").inc()
         return {
             "label": "error",
             "score": 0.0,
             "cleaned_text": safe_text,
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+
+# -------------------------
+# Long-document mode
+# -------------------------
+def map_label(raw_label: str, score: float) -> str:
+    """Binary model output -> positive / negative / neutral."""
+    if NEUTRAL_BAND[0] < score < NEUTRAL_BAND[1]:
+        return "neutral"
+    return raw_label
+
+
+def token_windows(n_tokens: int, size: int = CHUNK_TOKENS, overlap: int = CHUNK_OVERLAP,
+                  max_chunks: int = MAX_CHUNKS) -> list:
+    """(start, end) token windows covering a text, at most max_chunks of them.
+
+    Longer texts keep evenly spaced windows, so the whole article is sampled
+    rather than just its beginning.
+    """
+    if n_tokens <= size:
+        return [(0, n_tokens)]
+
+    # fewest windows that overlap by at least `overlap`, spread evenly
+    count = min(-(-(n_tokens - overlap) // (size - overlap)), max_chunks)
+    if count == 1:
+        return [(0, size)]
+    starts = [round(i * (n_tokens - size) / (count - 1)) for i in range(count)]
+    return [(s, s + size) for s in starts]
+
+
+def aggregate_chunks(chunks: list) -> tuple:
+    """Token-weighted mean P(positive) over (p_positive, n_tokens) chunks -> (label, score)."""
+    total = sum(n for _, n in chunks)
+    p_positive = sum(p * n for p, n in chunks) / total
+    raw_label = "positive" if p_positive >= 0.5 else "negative"
+    score = max(p_positive, 1 - p_positive)
+    return map_label(raw_label, score), score
+
+
+def _forward(chunk_ids: list) -> list:
+    """P(positive) per chunk; chunks are length-sorted so each pass pads little."""
+    model = sentiment_analyzer.model
+    positive = next(i for i, name in model.config.id2label.items() if name.lower() == "positive")
+    order = sorted(range(len(chunk_ids)), key=lambda i: len(chunk_ids[i]))
+    probs = [0.0] * len(chunk_ids)
+
+    for start in range(0, len(order), FORWARD_BATCH):
+        batch = order[start:start + FORWARD_BATCH]
+        encoded = tokenizer.pad({"input_ids": [chunk_ids[i] for i in batch]}, return_tensors="pt")
+        encoded = {k: v.to(model.device) for k, v in encoded.items()}
+        with torch.inference_mode():
+            logits = model(**encoded).logits
+        for i, p in zip(batch, logits.softmax(dim=-1)[:, positive].tolist()):
+            probs[i] = p
+    return probs
+
+
+def analyze_sentiment_batch(texts: list, cleaned: bool = False) -> list:
+    """analyze_sentiment() over full texts, all chunks of all texts scored together.
+
+    Each text is split into overlapping windows of CHUNK_TOKENS (at most
+    MAX_CHUNKS), and chunk probabilities are averaged weighted by length.
+    cleaned=True skips clean_text() for texts that already went through it.
+    """
+    if INFERENCE_URL:
+        return _remote_sentiment("sentiment_long", texts)
+
+    if cleaned:
+        cleaned = [t or "" for t in texts]
+    else:
+        with span("sentiment.clean_text", n=len(texts)):
+            cleaned = [clean_text(t) for t in texts]
+
+    results = [None] * len(texts)
+    chunk_ids, owners = [], []
+
+    with span("sentiment.tokenize", n=len(texts)):
+        encoded = tokenizer([c for c in cleaned if c], add_special_tokens=False, verbose=False)["input_ids"]
+        ids_iter = iter(encoded)
+        for i, text in enumerate(cleaned):
+            if not text:
+                results[i] = {"label": "neutral", "score": 0.0, "cleaned_text": "", "chunks": 0}
+                continue
+            ids = next(ids_iter)
+            for start, end in token_windows(len(ids)):
+                chunk_ids.append([tokenizer.cls_token_id] + ids[start:end] + [tokenizer.sep_token_id])
+                owners.append((i, end - start))
+
+    if not chunk_ids:
+        return results
+
+    try:
+        with SENTIMENT_SECONDS.time(), span("sentiment.inference", chunks=len(chunk_ids)):
+            probs = _forward(chunk_ids)
+    except Exception as e:
+        for i, text in enumerate(cleaned):
+            if results[i] is None:
+                SENTIMENT_LABELS.labels("error").inc()
+                results[i] = {"label": "error", "score": 0.0, "cleaned_text": text, "error": str(e)}
+        return results
+
+    per_text = {}
+    for (i, n_tokens), p in zip(owners, probs):
+        per_text.setdefault(i, []).append((p, n_tokens))
+
+    for i, chunks in per_text.items():
+        label, score = aggregate_chunks(chunks)
+        SENTIMENT_LABELS.labels(label).inc()
+        SENTIMENT_CHUNKS.observe(len(chunks))
+        results[i] = {"label": label, "score": round(score, 4), "cleaned_text": cleaned[i], "chunks": len(chunks)}
+    return results
+
+
+# -------------------------
+# Client mode
+# -------------------------
+def _remote_sentiment(endpoint: str, texts: list) -> list:
+    """Sentiment on the inference server, in the mode the caller asked for.
+
+    The "sentiment" endpoint runs analyze_sentiment() per text and
+    "sentiment_long" runs analyze_sentiment_batch().
+
+    Model failures become "error" results as locally; an unreachable server
+    raises, so the worker retries the articles instead of storing errors.
+    """
+    try:
+        with SENTIMENT_SECONDS.time(), span("sentiment.inference", n=len(texts), remote=True):
+            results = inference_client.call(INFERENCE_URL, endpoint, texts)
+    except inference_client.InferenceError as e:
+        results = [
+            {"label": "error", "score": 0.0, "cleaned_text": clean_text(t), "error": str(e)}
+            for t in texts
+        ]
+
+    for r in results:
+        SENTIMENT_LABELS.labels(r["label"]).inc()
+    return results
@@ -0,0 +1,174 @@
+# app/utils/tracing.py
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+
+# -------------------------
+# Global switch
+# -------------------------
+# Off by default: span() then hands back one shared no-op context manager,
+# so an instrumented hot loop pays a single function call per stage.
+_enabled = False
+_events = []
+_events_lock = threading.Lock()
+_local = threading.local()
+_origin = time.perf_counter()
+_NOOP = nullcontext()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        stack = _local.stack
+        path = ";".join(stack)
+        stack.pop()
+
+        event = {
+            "name": self.name,
+            "ph": "X",
+            "ts": (self.start - _origin) * 1e6,
+            "dur": (end - self.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "stack": path,
+        }
+        if self.args:
+            event["args"] = self.args
+        if exc_type is not None:
+            event.setdefault("args", {})["error"] = exc_type.__name__
+
+        with _events_lock:
+            _events.append(event)
+        return False
+
+
+def span(name: str, **args):
+    """Time one pipeline stage. Free when tracing is disabled."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, args)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable_tracing():
+    global _enabled
+    _enabled = True
+
+
+def disable_tracing():
+    global _enabled
+    _enabled = False
+
+
+def reset_trace():
+    with _events_lock:
+        _events.clear()
+
+
+def get_events() -> list:
+    with _events_lock:
+        return list(_events)
+
+
+# -------------------------
+# Exporters
+# -------------------------
+def dump_chrome_trace(path: str):
+    """Write a Chrome trace (chrome://tracing, Perfetto, speedscope)."""
+    events = []
+    for e in get_events():
+        e = dict(e)
+        e.pop("stack", None)
+        e["cat"] = e["name"].split(".", 1)[0]
+        events.append(e)
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def dump_folded_stacks(path: str):
+    """Write folded stacks for flamegraph.pl / inferno (self time, in µs)."""
+    totals = {}
+    child_time = {}
+
+    for e in get_events():
+        totals[e["stack"]] = totals.get(e["stack"], 0.0) + e["dur"]
+        parent = e["stack"].rpartition(";")[0]
+        if parent:
+            child_time[parent] = child_time.get(parent, 0.0) + e["dur"]
+
+    with open(path, "w") as f:
+        for stack, total in sorted(totals.items()):
+            self_time = max(total - child_time.get(stack, 0.0), 0.0)
+            f.write(f"{stack} {int(self_time)}\n")
+
+
+def summarize() -> list:
+    """Per-stage count / total / mean / p95 / max, slowest total first."""
+    by_name = {}
+    for e in get_events():
+        by_name.setdefault(e["name"], []).append(e["dur"] / 1000.0)
+
+    rows = []
+    for name, durations in by_name.items():
+        durations.sort()
+        total = sum(durations)
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        rows.append({
+            "stage": name,
+            "count": len(durations),
+            "total_ms": round(total, 3),
+            "mean_ms": round(total / len(durations), 3),
+            "p95_ms": round(p95, 3),
+            "max_ms": round(durations[-1], 3),
+        })
+
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def format_summary(rows: list) -> str:
+    header = f"{'stage':<40} {'count':>8} {'total ms':>12} {'mean ms':>10} {'p95 ms':>10} {'max ms':>10}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['stage']:<40} {r['count']:>8} {r['total_ms']:>12.1f} "
+            f"{r['mean_ms']:>10.3f} {r['p95_ms']:>10.3f} {r['max_ms']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def write_trace_outputs(prefix: str):
+    """Dump <prefix>.trace.json and <prefix>.folded and print the summary."""
+    dump_chrome_trace(f"{prefix}.trace.json")
+    dump_folded_stacks(f"{prefix}.folded")
+    print(format_summary(summarize()))
+    print(f"[TRACE] Wrote {prefix}.trace.json and {prefix}.folded")
+
+
+# GP_TRACE=1 turns tracing on for a whole process; outputs are written on exit
+if os.getenv("GP_TRACE") == "1":
+    enable_tracing()
+    atexit.register(write_trace_outputs, os.getenv("GP_TRACE_PREFIX", f"gp-trace-{os.getpid()}"))
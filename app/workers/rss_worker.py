@@ -1,25 +1,238 @@
 # app/workers/rss_worker.py
 
+import argparse
+import os
+import signal
+import sys
+import threading
 import time
 from datetime import datetime
-from app.scrapers.rss_scraper import scrape_rss
+from app.db.database import SessionLocal, call_with_timeout, init_db
+from app.db import models  # noqa: F401  (register tables)
+from app.scrapers.rss_loader import load_feeds
+from app.scrapers.rss_scraper import ScrapeResult, scrape_rss
+from app.scrapers.rss_pipeline import scrape_rss_pipelined
+from app.scrapers import sharding, spool
+from app.scrapers.politeness import install_dns_cache
+from app.utils.metrics import (
+    SCRAPE_SWEEP_SECONDS,
+    SHARD_FEEDS_OWNED,
+    SHARD_FEEDS_DONE,
+    start_metrics_server,
+)
 
 # How often the scraper runs (in seconds)
 SCRAPE_INTERVAL = 1800  # 30 minutes
+METRICS_PORT_DEFAULT = 9102
 
-def run_worker():
-    while True:
-        print(f"\n[{datetime.utcnow()}] Running RSS scraper...")
-        
-        try:
-            articles = scrape_rss()
-            print(f"[✓] Scraped {len(articles)} articles.")
+# RSS_PIPELINE=1: concurrent fetch + process-pool parsing (see rss_pipeline.py)
+USE_PIPELINE = os.getenv("RSS_PIPELINE") == "1"
+
+# Sharding across several rss_worker instances:
+#   static:     RSS_SHARD_ID=0..N-1 and RSS_SHARD_COUNT=N
+#   membership: RSS_SHARD_MODE=membership; live nodes found via scraper_nodes heartbeats
+SHARD_MODE = os.getenv("RSS_SHARD_MODE", "static")
+SHARD_ID = int(os.getenv("RSS_SHARD_ID", 0))
+SHARD_COUNT = int(os.getenv("RSS_SHARD_COUNT", 1))
+
+# Progress is logged after every chunk of this many feeds
+PROGRESS_CHUNK = int(os.getenv("RSS_PROGRESS_CHUNK", 500))
+# scraper_nodes is written this often, during sweeps and between them
+HEARTBEAT_EVERY = max(sharding.HEARTBEAT_TTL // 3, 1)
+
+
+def node_id() -> str:
+    if SHARD_MODE == "static" and SHARD_COUNT > 1:
+        return sharding.static_node_name(SHARD_ID)
+    return sharding.default_node_id()
+
+
+# live nodes at the last membership read, reused while spooling if the database is slow
+_peers = None
+
+
+def read_peers(node: str) -> list:
+    with SessionLocal() as db:
+        return sharding.members(db, node)
+
+
+def peers(node: str) -> list:
+    """Live nodes for the hash ring.
+
+    While spooling the database gets spool.DB_TIMEOUT seconds, after which
+    the last list read is reused; only a sweep with none to reuse fails.
+    """
+    global _peers
+    if not spool.ENABLED:
+        return read_peers(node)
+    try:
+        _peers = call_with_timeout(lambda: read_peers(node), spool.DB_TIMEOUT)
+    except Exception as e:
+        if _peers is None:
+            raise
+        print(f"[WARN] Could not read scraper membership, using the last one: {e}")
+    return _peers
 
+
+def select_feeds(node: str) -> dict:
+    feeds = load_feeds()
+    if SHARD_MODE == "membership":
+        return sharding.filter_feeds(feeds, sharding.HashRing(peers(node)), node)
+    if SHARD_COUNT > 1:
+        return sharding.shard_feeds(feeds, SHARD_ID, SHARD_COUNT)
+    return feeds
+
+
+class Heartbeat:
+    """Writes this node's heartbeat and latest progress every HEARTBEAT_EVERY seconds.
+
+    Runs in its own thread, so a sweep slower than HEARTBEAT_TTL keeps the
+    node in its peers' live_nodes, and the scraper only updates a dict.
+    While spooling, stop() waits at most spool.DB_TIMEOUT for the last write.
+    """
+
+    def __init__(self, node: str):
+        self.node = node
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def update(self, **progress):
+        with self._lock:
+            self._progress.update(progress)
+
+    def beat(self):
+        with self._lock:
+            progress, self._progress = self._progress, {}
+        try:
+            with SessionLocal() as db:
+                sharding.heartbeat(db, self.node, **progress)
         except Exception as e:
-            print(f"[ERROR] RSS scrape failed: {e}")
+            print(f"[WARN] Could not record progress for {self.node}: {e}")
+            # keep it for the next beat, under anything newer
+            with self._lock:
+                self._progress = {**progress, **self._progress}
+
+    def _run(self):
+        self.beat()
+        while not self._stopped.wait(HEARTBEAT_EVERY):
+            self.beat()
+        # whatever progress is still pending
+        self.beat()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join(spool.DB_TIMEOUT if spool.ENABLED else None)
+        if self._thread.is_alive():
+            print(f"[WARN] Progress for {self.node} still saving after {spool.DB_TIMEOUT}s; not waiting for it")
 
-        print(f"Sleeping for {SCRAPE_INTERVAL/60} minutes...\n")
+
+def run_sweep(node: str) -> int:
+    """Scrape this node's share of the feeds in one pass, reporting progress as it goes."""
+    scrape = scrape_rss_pipelined if USE_PIPELINE else scrape_rss
+
+    feeds = select_feeds(node)
+    total = sum(len(urls) for urls in feeds.values())
+    SHARD_FEEDS_OWNED.set(total)
+    SHARD_FEEDS_DONE.set(0)
+    print(f"[SHARD {node}] Owns {total} feeds")
+
+    beats = Heartbeat(node)
+    beats.update(
+        feeds_owned=total, feeds_done=0, articles_inserted=0,
+        sweep_started_at=datetime.utcnow(), sweep_finished_at=None,
+    )
+    beats.start()
+
+    def progress(done, result):
+        SHARD_FEEDS_DONE.set(done)
+        beats.update(feeds_done=done, articles_inserted=result.inserted)
+        if done % PROGRESS_CHUNK == 0:
+            if spool.ENABLED:
+                print(f"[SHARD {node}] {done}/{total} feeds, {result.spooled} entries spooled")
+            else:
+                print(f"[SHARD {node}] {done}/{total} feeds, {result.inserted} new articles")
+
+    try:
+        # no feeds would mean every feed to the scrapers
+        result = scrape(feeds, progress=progress) if feeds else ScrapeResult()
+        # quarantined feeds were skipped, not left over
+        SHARD_FEEDS_DONE.set(total)
+        beats.update(
+            feeds_done=total, articles_inserted=result.inserted,
+            sweep_finished_at=datetime.utcnow(),
+        )
+    finally:
+        beats.stop()
+
+    return result.spooled if spool.ENABLED else result.inserted
+
+
+def sleep_between_sweeps(node: str):
+    """Sleep until the next sweep, heartbeating so membership peers keep us."""
+    if SHARD_MODE != "membership":
         time.sleep(SCRAPE_INTERVAL)
+        return
+
+    beats = Heartbeat(node)
+    beats.start()
+    try:
+        time.sleep(SCRAPE_INTERVAL)
+    finally:
+        beats.stop()
+
+
+def run_worker(once: bool = False):
+    start_metrics_server("METRICS_PORT", METRICS_PORT_DEFAULT)
+    install_dns_cache()
+    init_db()
+    node = node_id()
+
+    # docker stop sends SIGTERM; turn it into SystemExit so we leave the ring
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    try:
+        while True:
+            print(f"\n[{datetime.utcnow()}] Running RSS scraper...")
+
+            try:
+                sweep_start = time.perf_counter()
+                inserted = run_sweep(node)
+                SCRAPE_SWEEP_SECONDS.set(time.perf_counter() - sweep_start)
+                print(f"[✓] Scraped {inserted} articles.")
+
+            except Exception as e:
+                print(f"[ERROR] RSS scrape failed: {e}")
+
+            if once:
+                return
+
+            print(f"Sleeping for {SCRAPE_INTERVAL/60} minutes...\n")
+            sleep_between_sweeps(node)
+
+    finally:
+        if SHARD_MODE == "membership":
+            with SessionLocal() as db:
+                sharding.leave(db, node)
+
 
 if __name__ == "__main__":
-    run_worker()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="RSS scraper worker.")
+    parser.add_argument("--once", action="store_true", help="run a single sweep and exit")
+    parser.add_argument("--shard-id", type=int, help="static shard id (overrides RSS_SHARD_ID)")
+    parser.add_argument("--shard-count", type=int, help="static shard count (overrides RSS_SHARD_COUNT)")
+    parser.add_argument("--membership", action="store_true", help="discover peers via scraper_nodes heartbeats")
+    args = parser.parse_args()
+
+    if args.shard_id is not None:
+        SHARD_ID = args.shard_id
+    if args.shard_count is not None:
+        SHARD_COUNT = args.shard_count
+    if args.membership:
+        SHARD_MODE = "membership"
+
+    run_worker(once=args.once)
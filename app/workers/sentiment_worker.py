@@ -1,11 +1,23 @@
 # app/workers/sentiment_worker.py
 
+import os
 import time
 from datetime import datetime
+from sqlalchemy import func
 from app.db.database import SessionLocal
 from app.db.models import Article
 from app.services.sentiment_service import process_sentiment_for_article
 from app.services.entity_service import process_entities_for_article
+from app.services.enrichment import BATCH_SIZE, enrich_batch, load_pending
+from app.services import entity_graph, entity_sentiment
+from app.services.stories import assign_stories
+from app.services.live import publish_articles
+from app.utils.metrics import (
+    WORKER_BATCH_SIZE,
+    WORKER_QUEUE_DEPTH,
+    WORKER_ARTICLES,
+    start_metrics_server,
+)
 
 def wait_for_database():
     import time
@@ -24,20 +36,74 @@ def wait_for_database():
             time.sleep(3)
 
 SLEEP_SECONDS = 10  
+METRICS_PORT_DEFAULT = 9101
+QUEUE_DEPTH_INTERVAL = int(os.getenv("WORKER_QUEUE_DEPTH_INTERVAL", 60))  # seconds between full counts
+
+
+def enrich_one_by_one(articles: list, db) -> list:
+    """Per-article fallback when a batch fails: one bad article costs only itself."""
+    enriched = []
+    for article in articles:
+        try:
+            process_sentiment_for_article(article, db)
+            process_entities_for_article(article, db)
+            print(f"✓ Processed sentiment for Article {article.id}")
+            WORKER_ARTICLES.labels("ok").inc()
+            enriched.append(article)
+        except Exception as e:
+            print(f"[ERROR] Could not process Article {article.id}: {e}")
+            WORKER_ARTICLES.labels("error").inc()
+            db.rollback()
+    return enriched
+
+
+def prune_rollups(db, last_pruned: float) -> float:
+    """Prune the entity graph and sentiment rollup every GRAPH_PRUNE_INTERVAL seconds."""
+    if time.monotonic() - last_pruned < entity_graph.PRUNE_INTERVAL:
+        return last_pruned
+    try:
+        print(f"[GRAPH] Pruned {entity_graph.prune(db)} weak edges, "
+              f"{entity_sentiment.prune(db)} expired sentiment rollup rows")
+    except Exception as e:
+        print(f"[ERROR] Rollup pruning failed: {e}")
+        db.rollback()
+    return time.monotonic()
+
+
+def update_queue_depth(db, batch: int, last_counted: float) -> float:
+    """Set WORKER_QUEUE_DEPTH without counting the backlog on every loop.
+
+    A short batch is everything that was waiting. A full one only says
+    there are at least BATCH_SIZE, so the backlog is counted, at most every
+    QUEUE_DEPTH_INTERVAL seconds.
+    """
+    if batch < BATCH_SIZE:
+        WORKER_QUEUE_DEPTH.set(batch)
+        return last_counted
+    if time.monotonic() - last_counted < QUEUE_DEPTH_INTERVAL:
+        return last_counted
+    # near-duplicates share their canonical article's results
+    WORKER_QUEUE_DEPTH.set(
+        db.query(func.count(Article.id))
+          .filter(Article.sentiment == None, Article.canonical_id == None)
+          .scalar()
+    )
+    return time.monotonic()
+
 
 def run_worker():
     wait_for_database()
     """Continuously process articles missing sentiment."""
+    start_metrics_server("METRICS_PORT", METRICS_PORT_DEFAULT)
+    last_pruned = last_counted = float("-inf")
 
     while True:
-        with SessionLocal() as db:
+        # the batch stays usable after commit for stories and live events
+        with SessionLocal(expire_on_commit=False) as db:
+            last_pruned = prune_rollups(db, last_pruned)
 
-            articles = (
-                db.query(Article)
-                  .filter(Article.sentiment == None)
-                  .limit(25)
-                  .all()
-            )
+            articles = load_pending(db)
+            last_counted = update_queue_depth(db, len(articles), last_counted)
 
             if not articles:
                 print(f"[{datetime.utcnow()}] No new articles. Sleeping...")
@@ -45,15 +111,24 @@ def run_worker():
                 continue
 
             print(f"[{datetime.utcnow()}] Processing {len(articles)} articles...")
+            WORKER_BATCH_SIZE.observe(len(articles))
+
+            try:
+                enrich_batch(articles, db)
+                enriched = articles
+                WORKER_ARTICLES.labels("ok").inc(len(articles))
+                print(f"✓ Processed sentiment for {len(articles)} articles")
+            except Exception as e:
+                print(f"[ERROR] Batch enrichment failed, retrying one by one: {e}")
+                enriched = enrich_one_by_one(articles, db)
+
+            try:
+                assign_stories(db, enriched)
+            except Exception as e:
+                print(f"[ERROR] Story clustering failed: {e}")
+                db.rollback()
 
-            for article in articles:
-                try:
-                    process_sentiment_for_article(article, db)
-                    process_entities_for_article(article, db)
-                    print(f"✓ Processed sentiment for Article {article.id}")
-                except Exception as e:
-                    print(f"[ERROR] Could not process Article {article.id}: {e}")
-                    db.rollback()
+            publish_articles(enriched)
 
         time.sleep(SLEEP_SECONDS)
 
@@ -0,0 +1,59 @@
+# app/workers/trace_pipeline.py
+
+import argparse
+from sqlalchemy.orm import selectinload
+
+from app.utils import tracing
+from app.db.database import SessionLocal
+from app.db.models import Article
+from app.scrapers.rss_loader import load_feeds
+from app.scrapers.rss_scraper import scrape_rss
+from app.services.enrichment import enrich_batch
+
+
+def limit_feeds(feeds: dict, max_feeds: int) -> dict:
+    """Keep the first max_feeds URLs across categories."""
+    limited = {}
+    remaining = max_feeds
+
+    for category, urls in feeds.items():
+        if remaining <= 0:
+            break
+        limited[category] = urls[:remaining]
+        remaining -= len(limited[category])
+
+    return limited
+
+
+def run_traced_pipeline(max_feeds: int = 20, output_prefix: str = "gp-trace"):
+    """Run one scrape -> sentiment -> entities pass with tracing enabled."""
+    tracing.enable_tracing()
+    tracing.reset_trace()
+
+    feeds = limit_feeds(load_feeds(), max_feeds)
+    article_ids = list(scrape_rss(feeds).article_ids)
+    print(f"[TRACE] Scraped {len(article_ids)} new articles from {max_feeds} feeds")
+
+    with SessionLocal() as db:
+        articles = (
+            db.query(Article)
+              .options(selectinload(Article.sentiment), selectinload(Article.entities))
+              .filter(Article.id.in_(article_ids))
+              .all()
+        )
+        try:
+            enrich_batch(articles, db)
+        except Exception as e:
+            print(f"[ERROR] Could not enrich {len(articles)} articles: {e}")
+
+    tracing.write_trace_outputs(output_prefix)
+    tracing.disable_tracing()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trace one scrape-to-entity pipeline run.")
+    parser.add_argument("--feeds", type=int, default=20, help="number of feed URLs to scrape")
+    parser.add_argument("--out", default="gp-trace", help="output prefix for .trace.json / .folded")
+    args = parser.parse_args()
+
+    run_traced_pipeline(args.feeds, args.out)
@@ -0,0 +1,73 @@
+# benchmarks/bench_analytics.py
+
+import time
+
+from benchmarks.common import percentile
+from benchmarks.fixtures import populate_database
+
+PATH_PARAMS = {
+    "{entity_name}": "Elon Musk",
+    "{entity}": "Elon Musk",
+    "{article_id}": "1",
+}
+
+
+def _ensure_corpus(engine, n_articles: int):
+    from sqlalchemy import func
+    from app.db.database import SessionLocal, init_db
+    from app.db.models import Article
+    from app.services import entity_graph, entity_sentiment
+
+    init_db(engine)
+    with SessionLocal() as db:
+        existing = db.query(func.count(Article.id)).filter(Article.url.like("https://bench.local/article/%")).scalar()
+
+    if existing < n_articles:
+        print(f"[BENCH] Loading {n_articles - existing} synthetic articles...")
+        populate_database(engine, n_articles - existing, seed=42 + existing)
+        # the fixture bypasses the services that maintain the rollups
+        entity_graph.rebuild(engine)
+        entity_sentiment.rebuild(engine)
+
+
+def analytics_paths(router) -> list:
+    """Every GET /analytics route with its path parameters filled in."""
+    paths = []
+    for route in router.routes:
+        path = getattr(route, "path", "")
+        if not path.startswith("/analytics") or "GET" not in getattr(route, "methods", ()):
+            continue
+        for placeholder, value in PATH_PARAMS.items():
+            path = path.replace(placeholder, value)
+        paths.append(path)
+    return paths
+
+
+def run(ctx) -> dict:
+    """Latency of every /analytics endpoint over a SQLite corpus at ctx.scale."""
+    from fastapi.testclient import TestClient
+    from app.db.database import engine
+    from app.main import app
+    from app.routers.analytics import router
+
+    _ensure_corpus(engine, ctx.n_articles)
+
+    client = TestClient(app)
+    repeat = 3 if ctx.quick else 10
+    results = {}
+
+    for path in analytics_paths(router):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+        results[f"analytics.{path}"] = {
+            "p50_ms": round(percentile(samples, 0.5), 3),
+            "p95_ms": round(percentile(samples, 0.95), 3),
+            "max_ms": round(max(samples), 3),
+        }
+
+    return results
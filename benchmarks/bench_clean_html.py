@@ -0,0 +1,41 @@
+# benchmarks/bench_clean_html.py
+
+import random
+import time
+
+from benchmarks.fixtures import synthetic_summary
+
+
+def _rate(fn, docs) -> float:
+    start = time.perf_counter()
+    for d in docs:
+        fn(d)
+    return len(docs) / (time.perf_counter() - start)
+
+
+def run(ctx) -> dict:
+    """clean_html entries/sec vs. the BeautifulSoup tree path it replaced."""
+    from bs4 import BeautifulSoup
+    from app.scrapers.rss_scraper import clean_html
+
+    rng = random.Random(3)
+    n = 2_000 if ctx.quick else 20_000
+    html_docs = [synthetic_summary(rng) for _ in range(n)]
+    plain_docs = [synthetic_summary(rng, html=False) for _ in range(n)]
+
+    def soup(text):
+        return BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+
+    mismatches = sum(1 for d in html_docs if clean_html(d) != soup(d))
+
+    return {
+        "clean_html.html": {
+            "entries_per_sec": round(_rate(clean_html, html_docs), 1),
+            "beautifulsoup_entries_per_sec": round(_rate(soup, html_docs), 1),
+            "mismatches": mismatches,
+        },
+        "clean_html.plain_text": {
+            "entries_per_sec": round(_rate(clean_html, plain_docs), 1),
+            "beautifulsoup_entries_per_sec": round(_rate(soup, plain_docs), 1),
+        },
+    }
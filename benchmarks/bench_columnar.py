@@ -0,0 +1,80 @@
+# benchmarks/bench_columnar.py
+
+import os
+import shutil
+import time
+
+from benchmarks.bench_analytics import _ensure_corpus
+from benchmarks.common import percentile
+
+QUERIES = {
+    "sentiment_summary": (),
+    "top_sources": (),
+    "daily_sentiment": (),
+    "source_sentiment": (),
+    "keyword_frequency": (),
+    "top_entities": (100,),
+}
+
+
+def _same(name: str, a, b) -> bool:
+    if name == "keyword_frequency":
+        # ties at the 50th word may resolve differently
+        return [r["count"] for r in a] == [r["count"] for r in b]
+    if isinstance(a, list):
+        return sorted(map(str, a)) == sorted(map(str, b))
+    return a == b
+
+
+def _latency(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, samples
+
+
+def run(ctx) -> dict:
+    """SQL vs DuckDB-over-Parquet for the heavy /analytics aggregates.
+
+    --scale 2m is ~10M rows (articles + sentiments + 3 entities each).
+    """
+    from app.db.database import SessionLocal, engine
+    from app.routers import analytics
+    from app.services import duckdb_analytics
+    from app.services.parquet_export import export_all
+
+    _ensure_corpus(engine, ctx.n_articles)
+
+    export_dir = os.path.join(ctx.workdir, f"parquet-{ctx.scale}")
+    shutil.rmtree(export_dir, ignore_errors=True)
+    start = time.perf_counter()
+    exported = sum(export_all(engine, export_dir, lag_seconds=0).values())
+    export_seconds = time.perf_counter() - start
+
+    results = {"columnar.export": {
+        "rows": exported,
+        "rows_per_sec": round(exported / export_seconds, 1),
+    }}
+
+    duck = duckdb_analytics.connect(export_dir)
+    cutoff = analytics.resolve_cutoff(None, None)
+    repeat = 2 if ctx.quick else 5
+
+    with SessionLocal() as db:
+        for name, args in QUERIES.items():
+            endpoint = getattr(analytics, name)
+            sql_kwargs = {"limit": args[0]} if args else {}
+            sql_result, sql_ms = _latency(lambda: endpoint(db=db, **sql_kwargs), repeat)
+            duck_result, duck_ms = _latency(lambda: duckdb_analytics.QUERIES[name](duck, cutoff, *args), repeat)
+
+            results[f"columnar.{name}"] = {
+                "sql_p50_ms": round(percentile(sql_ms, 0.5), 3),
+                "duckdb_p50_ms": round(percentile(duck_ms, 0.5), 3),
+                "speedup_ratio": round(percentile(sql_ms, 0.5) / percentile(duck_ms, 0.5), 2),
+                "match": _same(name, sql_result, duck_result),
+            }
+
+    duck.close()
+    return results
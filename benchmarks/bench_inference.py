@@ -0,0 +1,88 @@
+# benchmarks/bench_inference.py
+
+import itertools
+import time
+
+from benchmarks.fixtures import generate_articles
+
+
+def _texts(n: int):
+    return [
+        (a["title"], a["content"])
+        for a in itertools.islice(generate_articles(n, seed=11), n)
+    ]
+
+
+def _long_texts(n: int, paragraphs: int = 12):
+    """Articles of roughly 1.5k tokens: several synthetic summaries joined."""
+    docs = [a["content"] for a in generate_articles(n * paragraphs, seed=13)]
+    return [" ".join(docs[i:i + paragraphs]) for i in range(0, len(docs), paragraphs)]
+
+
+def _long_document(ctx) -> dict:
+    """Full-content chunked batch scoring vs the truncating per-article path."""
+    from app.utils.nlp import analyze_sentiment, analyze_sentiment_batch
+
+    n = 25 if ctx.quick else 200
+    batch = 25  # the sentiment worker's batch size
+    texts = _long_texts(n)
+    analyze_sentiment_batch(texts[:2])
+
+    start = time.perf_counter()
+    for text in texts:
+        analyze_sentiment(text)
+    truncated_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = 0
+    for i in range(0, n, batch):
+        chunks += sum(r["chunks"] for r in analyze_sentiment_batch(texts[i:i + batch]))
+    long_seconds = time.perf_counter() - start
+
+    return {
+        "inference.sentiment_long": {
+            "articles": n,
+            "chunks_per_article": round(chunks / n, 2),
+            "truncated_articles_per_sec": round(n / truncated_seconds, 2),
+            "articles_per_sec": round(n / long_seconds, 2),
+            "chunks_per_sec": round(chunks / long_seconds, 2),
+        },
+    }
+
+
+def run(ctx) -> dict:
+    """Sentiment and NER articles per second on synthetic articles."""
+    from app.utils.nlp import analyze_sentiment
+    from app.utils.ner import extract_entities
+
+    n = 50 if ctx.quick else 500
+    texts = _texts(n)
+
+    # warm-up so lazy init isn't billed to the first article
+    analyze_sentiment(texts[0][1])
+    extract_entities(texts[0][0])
+
+    start = time.perf_counter()
+    for _, content in texts:
+        analyze_sentiment(content)
+    sentiment_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for title, _ in texts:
+        extract_entities(title)
+    ner_seconds = time.perf_counter() - start
+
+    results = {
+        "inference.sentiment": {
+            "articles": n,
+            "seconds": round(sentiment_seconds, 4),
+            "articles_per_sec": round(n / sentiment_seconds, 2),
+        },
+        "inference.ner": {
+            "articles": n,
+            "seconds": round(ner_seconds, 4),
+            "articles_per_sec": round(n / ner_seconds, 2),
+        },
+    }
+    results.update(_long_document(ctx))
+    return results
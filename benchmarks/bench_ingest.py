@@ -0,0 +1,107 @@
+# benchmarks/bench_ingest.py
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from benchmarks.common import timed
+from benchmarks.feed_server import FeedServer
+
+ENTRIES_PER_FEED = 25
+SLOW_DB_MS = 2  # added to every statement in the slow-database runs
+
+
+@contextmanager
+def slow_database(engine, ms: float):
+    from sqlalchemy import event
+
+    def delay(*args):
+        time.sleep(ms / 1000)
+
+    event.listen(engine, "before_cursor_execute", delay)
+    try:
+        yield
+    finally:
+        event.remove(engine, "before_cursor_execute", delay)
+
+
+@contextmanager
+def spooling(spool_dir: str):
+    from app.scrapers import spool
+
+    spool._writer = spool.SpoolWriter(spool_dir)
+    try:
+        yield
+    finally:
+        spool._writer.close()
+        spool._writer = None
+
+
+def run(ctx) -> dict:
+    """scrape_rss throughput against the local feed server."""
+    from app.db.database import engine, init_db
+    from app.db import models  # noqa: F401  (register tables)
+    from app.scrapers.rss_scraper import scrape_rss
+    from app.scrapers.rss_pipeline import scrape_rss_pipelined
+    from app.scrapers import spool
+
+    init_db(engine)
+
+    n_feeds = 20 if ctx.quick else 200
+    entries = n_feeds * ENTRIES_PER_FEED
+
+    with FeedServer(entries_per_feed=ENTRIES_PER_FEED) as server:
+        feeds = {"bench": server.feed_urls(n_feeds)}
+
+        # first pass inserts everything, second pass is all duplicates
+        first, first_seconds = timed(scrape_rss, feeds)
+        _, rescrape_seconds = timed(scrape_rss, feeds)
+
+        # same volume on fresh feed ids through the fetch/parse/write pipeline
+        pipelined_feeds = {"bench": server.feed_urls(n_feeds, start=n_feeds)}
+        pipelined, pipelined_seconds = timed(scrape_rss_pipelined, pipelined_feeds)
+
+        # a slow database: direct writes vs the write-ahead spool + loader
+        n_slow = n_feeds // 5
+        slow_entries = n_slow * ENTRIES_PER_FEED
+        direct_feeds = {"bench": server.feed_urls(n_slow, start=2 * n_feeds)}
+        spooled_feeds = {"bench": server.feed_urls(n_slow, start=2 * n_feeds + n_slow)}
+        with slow_database(engine, SLOW_DB_MS), tempfile.TemporaryDirectory() as spool_dir:
+            _, direct_seconds = timed(scrape_rss, direct_feeds)
+            with spooling(os.path.join(spool_dir, "spool")):
+                _, spooled_seconds = timed(scrape_rss, spooled_feeds)
+            drained, drain_seconds = timed(spool.drain, engine, os.path.join(spool_dir, "spool"))
+
+    return {
+        "ingest.scrape_rss": {
+            "feeds": n_feeds,
+            "entries": entries,
+            "articles_inserted": first.inserted,
+            "seconds": round(first_seconds, 4),
+            "feeds_per_sec": round(n_feeds / first_seconds, 2),
+            "entries_per_sec": round(entries / first_seconds, 2),
+        },
+        "ingest.scrape_rss_duplicates": {
+            "seconds": round(rescrape_seconds, 4),
+            "entries_per_sec": round(entries / rescrape_seconds, 2),
+        },
+        "ingest.scrape_rss_pipelined": {
+            "articles_inserted": pipelined.inserted,
+            "seconds": round(pipelined_seconds, 4),
+            "feeds_per_sec": round(n_feeds / pipelined_seconds, 2),
+            "entries_per_sec": round(entries / pipelined_seconds, 2),
+        },
+        "ingest.slow_db_direct": {
+            "db_latency_ms": SLOW_DB_MS,
+            "entries": slow_entries,
+            "seconds": round(direct_seconds, 4),
+            "entries_per_sec": round(slow_entries / direct_seconds, 2),
+        },
+        "ingest.slow_db_spooled": {
+            "seconds": round(spooled_seconds, 4),
+            "entries_per_sec": round(slow_entries / spooled_seconds, 2),
+            "drain_seconds": round(drain_seconds, 4),
+            "articles_inserted": drained["inserted"],
+        },
+    }
@@ -0,0 +1,56 @@
+# benchmarks/bench_keywords.py
+
+import itertools
+import re
+import time
+from collections import Counter
+
+from benchmarks.fixtures import generate_articles
+
+DOCUMENTS = 1_000_000
+
+
+def _per_document(texts: list, stopwords: set) -> list:
+    """The previous /analytics/keyword-frequency loop."""
+    words = []
+    for text in texts:
+        found = re.findall(r"[a-zA-Z]+", text.lower())
+        words.extend(w for w in found if w not in stopwords and len(w) > 3)
+    return Counter(words).most_common(50)
+
+
+def run(ctx) -> dict:
+    """Keyword counting over 1M title/content documents (100k with --quick)."""
+    from app.utils.keywords import STOPWORDS, count_keywords
+
+    n = DOCUMENTS // 10 if ctx.quick else DOCUMENTS
+    # 100k distinct articles, repeated: counting cost doesn't depend on uniqueness
+    articles = list(itertools.islice(generate_articles(50_000, seed=17), 50_000))
+    distinct = [text for a in articles for text in (a["title"], a["content"])]
+    texts = list(itertools.islice(itertools.cycle(distinct), n))
+
+    start = time.perf_counter()
+    baseline = _per_document(texts, STOPWORDS)
+    baseline_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    unigrams = count_keywords(texts)
+    unigram_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count_keywords(texts, ngram=2)
+    bigram_seconds = time.perf_counter() - start
+
+    return {
+        "keywords.count": {
+            "documents": n,
+            "per_document_docs_per_sec": round(n / baseline_seconds, 1),
+            "docs_per_sec": round(n / unigram_seconds, 1),
+            "speedup_ratio": round(baseline_seconds / unigram_seconds, 2),
+            "match": unigrams == baseline,
+        },
+        "keywords.bigrams": {
+            "documents": n,
+            "docs_per_sec": round(n / bigram_seconds, 1),
+        },
+    }
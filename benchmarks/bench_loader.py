@@ -0,0 +1,49 @@
+# benchmarks/bench_loader.py
+
+import json
+import os
+
+from benchmarks.common import traced_memory
+
+
+def _write_feed_file(path: str, n_urls: int, categories: int = 500):
+    data = {}
+    for i in range(n_urls):
+        data.setdefault(f"CATEGORY_{i % categories}_RSS_FEEDS", []).append(
+            f"https://publisher{i % 5000}.example/feeds/{i}.xml"
+        )
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def run(ctx) -> dict:
+    """load_feeds time and peak memory, on the shipped file and a synthetic one."""
+    from app.scrapers import rss_loader
+
+    results = {}
+
+    feeds, seconds, peak = traced_memory(rss_loader.load_feeds)
+    results["loader.load_feeds_shipped"] = {
+        "urls": sum(len(v) for v in feeds.values()),
+        "seconds": round(seconds, 4),
+        "peak_bytes": peak,
+    }
+
+    n_urls = min(ctx.n_articles, 200_000)
+    path = os.path.join(ctx.workdir, f"feeds-{n_urls}.json")
+    if not os.path.exists(path):
+        _write_feed_file(path, n_urls)
+
+    original = rss_loader.JSON_FEED_FILE
+    rss_loader.JSON_FEED_FILE = path
+    try:
+        feeds, seconds, peak = traced_memory(rss_loader.load_feeds)
+    finally:
+        rss_loader.JSON_FEED_FILE = original
+
+    results["loader.load_feeds_synthetic"] = {
+        "urls": sum(len(v) for v in feeds.values()),
+        "seconds": round(seconds, 4),
+        "peak_bytes": peak,
+    }
+    return results
@@ -0,0 +1,35 @@
+# benchmarks/bench_parse_pool.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.fixtures import build_rss
+
+
+def run(ctx) -> dict:
+    """Parse-stage throughput (feedparser + clean_html) by process count."""
+    from app.scrapers.rss_pipeline import parse_feed_bytes
+
+    n_feeds = 100 if ctx.quick else 1_000
+    docs = [build_rss(i, 25) for i in range(n_feeds)]
+    cpus = os.cpu_count() or 1
+
+    results = {}
+    for workers in sorted({1, 2, 4, cpus}):
+        if workers > cpus:
+            continue
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # spin the workers up before timing
+            list(pool.map(parse_feed_bytes, docs[:workers]))
+
+            start = time.perf_counter()
+            entries = sum(len(r[2]) for r in pool.map(parse_feed_bytes, docs, chunksize=4))
+            seconds = time.perf_counter() - start
+
+        results[f"parse_pool.workers_{workers}"] = {
+            "feeds_per_sec": round(n_feeds / seconds, 2),
+            "entries_per_sec": round(entries / seconds, 2),
+        }
+
+    return results
@@ -0,0 +1,54 @@
+# benchmarks/bench_scrape_memory.py
+
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.feed_server import FeedServer
+
+ENTRIES_PER_FEED = 50
+
+# One sweep in a fresh process, so VmHWM is that sweep's peak alone
+_SWEEP = """
+import json, sys
+from app.db.database import engine, init_db
+from app.db import models
+from app.scrapers.rss_pipeline import scrape_rss_pipelined
+from app.scrapers.rss_scraper import scrape_rss
+from benchmarks.common import rss_mb
+
+mode, feeds = json.loads(sys.stdin.read())
+init_db(engine)
+scrape = scrape_rss_pipelined if mode == "pipelined" else scrape_rss
+kwargs = {"parse_workers": 2} if mode == "pipelined" else {}
+baseline = rss_mb()
+result = scrape(feeds, **kwargs)
+print(json.dumps({"baseline_mb": baseline, "peak_mb": rss_mb(field="VmHWM"), "inserted": result.inserted}))
+"""
+
+
+def _sweep(ctx, mode: str, urls: list) -> dict:
+    path = os.path.join(ctx.workdir, f"scrape_memory_{mode}.db")
+    if os.path.exists(path):
+        os.remove(path)
+    # the near-duplicate index is bounded by its own window; leave it out
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", DEDUP_ENABLED="0", RSS_SPOOL="0")
+    out = subprocess.run(
+        [sys.executable, "-c", _SWEEP], input=json.dumps([mode, {"bench": urls}]),
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["growth_mb"] = round(result["peak_mb"] - result["baseline_mb"], 1)
+    return result
+
+
+def run(ctx) -> dict:
+    """Peak RSS of one scrape sweep into a fresh SQLite database, per scraper."""
+    sizes = {"sequential": 10 if ctx.quick else 100, "pipelined": 40 if ctx.quick else 400}
+    results = {}
+    with FeedServer(entries_per_feed=ENTRIES_PER_FEED) as server:
+        for mode, n_feeds in sizes.items():
+            result = _sweep(ctx, mode, server.feed_urls(n_feeds))
+            results[f"scrape_memory.{mode}"] = dict(result, feeds=n_feeds, entries=n_feeds * ENTRIES_PER_FEED)
+    return results
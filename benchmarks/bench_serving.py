@@ -0,0 +1,115 @@
+# benchmarks/bench_serving.py
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.bench_inference import _texts
+from benchmarks.common import percentile, rss_mb
+
+CLIENT_COUNTS = (1, 2, 4, 8, 16)
+STARTUP_TIMEOUT = 600  # first run may download both models
+
+# RSS of a bare worker process with the model modules imported in either mode
+_WORKER_RSS = """
+import json
+from app.utils import nlp, ner
+from benchmarks.common import rss_mb
+print(json.dumps(rss_mb()))
+"""
+
+
+def _worker_rss(env: dict) -> float:
+    out = subprocess.check_output([sys.executable, "-c", _WORKER_RSS], env=env, text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _start_server(url: str, env: dict):
+    from app.utils import inference_client
+
+    proc = subprocess.Popen([sys.executable, "-m", "app.services.inference_server"], env=env)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("inference server exited during startup")
+        try:
+            inference_client.call(url, "sentiment", ["warm-up"])
+            inference_client.call(url, "ner", ["Warm Up"])
+            return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("inference server did not start")
+
+
+def _load(url: str, texts: list, clients: int) -> dict:
+    """`clients` threads, each enriching its share of articles one at a time like a worker."""
+    from app.utils import inference_client
+
+    latencies = []
+    lock = threading.Lock()
+
+    def client(share):
+        mine = []
+        for title, content in share:
+            start = time.perf_counter()
+            inference_client.call(url, "sentiment", [content])
+            inference_client.call(url, "ner", [title])
+            mine.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(texts[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+
+    return {
+        "articles_per_sec": round(len(texts) / seconds, 2),
+        "p50_ms": round(percentile(latencies, 0.5), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+    }
+
+
+def run(ctx) -> dict:
+    """Shared inference server: memory per node and throughput vs concurrent clients.
+
+    Memory compares N workers that each load both models with one server
+    plus N client-mode workers.
+    """
+    sock = os.path.join(os.path.abspath(ctx.workdir), "inference.sock")
+    url = f"unix://{sock}"
+    counts = (1, 4) if ctx.quick else CLIENT_COUNTS
+    texts = _texts(64 if ctx.quick else 400)
+
+    env = {k: v for k, v in os.environ.items() if k != "INFERENCE_URL"}
+    env.update({"INFERENCE_LISTEN": url, "METRICS_PORT": "0"})
+    local_rss = _worker_rss(env)
+    client_rss = _worker_rss(dict(env, INFERENCE_URL=url))
+
+    results = {}
+    server = _start_server(url, env)
+    try:
+        for clients in counts:
+            results[f"serving.clients_{clients}"] = _load(url, texts, clients)
+        server_rss = rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    workers = max(counts)
+    results["serving.memory"] = {
+        "workers": workers,
+        "local_worker_rss_mb": local_rss,
+        "client_worker_rss_mb": client_rss,
+        "server_rss_mb": server_rss,
+        "node_local_mb": round(workers * local_rss, 1),
+        "node_served_mb": round(server_rss + workers * client_rss, 1),
+    }
+    return results
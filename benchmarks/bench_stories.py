@@ -0,0 +1,63 @@
+# benchmarks/bench_stories.py
+
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.common import percentile
+from benchmarks.fixtures import generate_articles
+
+
+def run(ctx) -> dict:
+    """Story assignment latency per article against a full set of open stories."""
+    from app.services.stories import MAX_OPEN, StoryClusterer, vectorize
+
+    n = 5_000 if ctx.quick else 50_000
+    docs = list(generate_articles(n, seed=11))
+
+    start = time.perf_counter()
+    vectors = np.vstack([vectorize(d["title"], d["content"]) for d in docs])
+    vectorize_seconds = time.perf_counter() - start
+
+    clusterer = StoryClusterer()
+    now = datetime.utcnow()
+
+    # synthetic text shares one small vocabulary, so it collapses into a few
+    # stories; open as many stories as the cap allows, one other article each
+    open_docs = generate_articles(MAX_OPEN, seed=12)
+    clusterer.load([(None, vectorize(d["title"], d["content"]), now) for d in open_docs])
+
+    warm = n - 1_000
+    start = time.perf_counter()
+    for i in range(0, warm, 256):
+        clusterer.retire(now)
+        clusterer.assign(vectors[i:min(i + 256, warm)], now)
+    batch_seconds = time.perf_counter() - start
+    clusterer.retire(now)
+
+    # how often the shortlist holds the story an exact scan picks
+    centroids = clusterer.centroids
+    found = 0
+    for vec in vectors[warm:warm + 200]:
+        row, _ = clusterer.best(vec)
+        exact = centroids @ vec
+        found += bool(exact[row] >= exact.max() - 1e-5)
+
+    latencies = []
+    for i in range(warm, n):
+        start = time.perf_counter()
+        clusterer.assign(vectors[i:i + 1], now)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "stories.assign": {
+            "open_stories": len(clusterer),
+            "centroids_mb": round(clusterer._centroids.nbytes / 1e6, 1),
+            "vectorize_per_sec": round(n / vectorize_seconds, 1),
+            "batch_articles_per_sec": round(warm / batch_seconds, 1),
+            "single_p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+            "single_p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+            "shortlist_recall_ratio": round(found / 200, 3),
+        },
+    }
@@ -0,0 +1,41 @@
+# benchmarks/bench_transfer.py
+
+from benchmarks.common import traced_memory
+from benchmarks.feed_server import FeedServer
+
+ENTRIES_PER_FEED = 50
+
+
+def run(ctx) -> dict:
+    """Wire bytes and peak memory of a fetch + parse sweep, per Content-Encoding."""
+    from app.scrapers.rss_scraper import fetch_feed
+    from app.scrapers.rss_pipeline import parse_feed_bytes
+
+    n_feeds = 20 if ctx.quick else 200
+
+    def sweep(urls):
+        decoded = entries = 0
+        for url in urls:
+            raw = fetch_feed(url)
+            decoded += len(raw)
+            entries += len(parse_feed_bytes(raw)[2])
+        return decoded, entries
+
+    results = {}
+    for encoding in ("identity", "gzip", "deflate"):
+        compress = None if encoding == "identity" else encoding
+        with FeedServer(entries_per_feed=ENTRIES_PER_FEED, compress=compress) as server:
+            (decoded, entries), seconds, peak = traced_memory(sweep, server.feed_urls(n_feeds))
+            wire = server.bytes_sent
+
+        results[f"transfer.{encoding}"] = {
+            "feeds": n_feeds,
+            "entries": entries,
+            "wire_bytes": wire,
+            "decoded_bytes": decoded,
+            "compression_ratio": round(decoded / wire, 2) if wire else None,
+            "peak_memory_mb": round(peak / 1e6, 2),
+            "seconds": round(seconds, 4),
+        }
+
+    return results
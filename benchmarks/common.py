@@ -0,0 +1,151 @@
+# benchmarks/common.py
+
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class BenchContext:
+    scale: str
+    n_articles: int
+    workdir: str
+    db_url: str
+    quick: bool = False
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs):
+    """Run fn `repeat` times; return (last result, best seconds)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def traced_memory(fn, *args, **kwargs):
+    """Run fn under tracemalloc; return (result, seconds, peak bytes)."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def rss_mb(pid="self", field: str = "VmRSS") -> float:
+    """Resident set size of a process in MB (VmHWM for the peak); Linux only, 0.0 elsewhere."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return 0.0
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+# -------------------------
+# Result files
+# -------------------------
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def save_results(results: dict, ctx: BenchContext, path: str) -> dict:
+    payload = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "git_rev": _git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "scale": ctx.scale,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    return payload
+
+
+# How each metric should move. Anything not listed (entry and row counts,
+# benchmark settings, input sizes) describes the run and isn't compared;
+# booleans (e.g. "match") are correctness checks that must stay True.
+HIGHER_IS_BETTER = ("_per_sec", "_ratio")
+LOWER_IS_BETTER = ("_ms", "_seconds", "_mb", "_bytes")
+LOWER_IS_BETTER_NAMES = {"seconds", "mismatches"}
+NOT_COMPARED = {"db_latency_ms", "decoded_bytes"}
+
+
+def metric_direction(metric: str):
+    """Which way a metric should move: "higher", "lower", or None if it isn't compared."""
+    if metric in NOT_COMPARED:
+        return None
+    if metric.endswith(HIGHER_IS_BETTER):
+        return "higher"
+    if metric in LOWER_IS_BETTER_NAMES or metric.endswith(LOWER_IS_BETTER):
+        return "lower"
+    return None
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float = 0.10) -> list:
+    """Regressions larger than `tolerance` (fractional) against a baseline run.
+
+    A boolean that was True and no longer is, or a lower-is-better metric
+    rising from 0 (mismatches), is always a regression; its change_pct is None.
+    """
+    regressions = []
+
+    for bench, metrics in current.get("results", {}).items():
+        base_metrics = baseline.get("results", {}).get(bench, {})
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if isinstance(base, bool):
+                if base and value is not True:
+                    regressions.append({"benchmark": bench, "metric": metric, "baseline": base,
+                                        "current": value, "change_pct": None})
+                continue
+
+            direction = metric_direction(metric)
+            if direction is None or not isinstance(value, (int, float)) or not isinstance(base, (int, float)):
+                continue
+            if base == 0:
+                if direction == "lower" and value > 0:
+                    regressions.append({"benchmark": bench, "metric": metric, "baseline": base,
+                                        "current": value, "change_pct": None})
+                continue
+
+            change = (value - base) / base
+            worse = -change if direction == "higher" else change
+            if worse > tolerance:
+                regressions.append({
+                    "benchmark": bench,
+                    "metric": metric,
+                    "baseline": base,
+                    "current": value,
+                    "change_pct": round(change * 100, 1),
+                })
+
+    return regressions
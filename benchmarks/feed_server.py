@@ -0,0 +1,101 @@
+# benchmarks/feed_server.py
+
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import build_rss
+
+
+class FeedServer:
+    """Local HTTP server serving synthetic RSS at /feed/<id>.xml.
+
+    With compress="gzip" or "deflate" bodies are compressed for clients that
+    send a matching Accept-Encoding. bytes_sent counts body bytes on the wire.
+    """
+
+    def __init__(self, entries_per_feed: int = 20, latency: float = 0.0, port: int = 0, compress: str = None):
+        self.entries_per_feed = entries_per_feed
+        self.latency = latency
+        self.compress = compress
+        self.requests = 0
+        self.bytes_sent = 0
+
+        render = lru_cache(maxsize=4096)(lambda feed_id: build_rss(feed_id, entries_per_feed))
+
+        @lru_cache(maxsize=4096)
+        def render_compressed(feed_id: int) -> bytes:
+            body = render(feed_id)
+            if compress == "gzip":
+                c = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            else:
+                c = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS)
+            return c.compress(body) + c.flush()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) != 2 or parts[0] != "feed" or not parts[1].endswith(".xml"):
+                    self.send_error(404)
+                    return
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                feed_id = int(parts[1][:-4])
+                accepted = self.headers.get("Accept-Encoding", "")
+                encoded = bool(server.compress) and server.compress in accepted
+
+                body = render_compressed(feed_id) if encoded else render(feed_id)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                if encoded:
+                    self.send_header("Content-Encoding", server.compress)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+                server.requests += 1
+                server.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_urls(self, n_feeds: int, start: int = 0) -> list:
+        return [f"{self.base_url}/feed/{i}.xml" for i in range(start, start + n_feeds)]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve synthetic RSS feeds locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--compress", choices=["gzip", "deflate"])
+    args = parser.parse_args()
+
+    with FeedServer(args.entries, args.latency, args.port, args.compress) as srv:
+        print(f"Serving synthetic feeds at {srv.base_url}/feed/<id>.xml")
+        threading.Event().wait()
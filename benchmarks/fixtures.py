@@ -0,0 +1,151 @@
+# benchmarks/fixtures.py
+
+import random
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+
+SCALES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "2m": 2_000_000,  # ~10M rows with sentiments and entities
+}
+
+WORDS = """
+economy election climate market inflation court ruling storm energy vaccine
+startup funding league championship budget summit ceasefire tariff protest
+satellite launch merger earnings regulator wildfire drought housing rates
+strike union border migration science research discovery outbreak hospital
+""".split()
+
+FILLER = """
+the a of and to in on for with after over says amid as new report shows
+""".split()
+
+PEOPLE = ["Joe Biden", "Elon Musk", "Taylor Swift", "Rishi Sunak", "Emmanuel Macron", "Narendra Modi"]
+ORGS = ["Apple", "Reuters", "United Nations", "Federal Reserve", "Nasa", "Tesla", "World Bank"]
+PLACES = ["California", "London", "Ukraine", "Canada", "Sydney", "Mumbai", "Brussels"]
+SOURCES = ["world", "politics", "business", "technology", "science", "sports", "health", "uk", "india"]
+LABELS = ["positive", "negative", "neutral"]
+
+START_DATE = datetime(2025, 10, 1)
+
+
+def synthetic_title(rng: random.Random) -> str:
+    words = rng.sample(WORDS, 4) + rng.sample(FILLER, 3)
+    rng.shuffle(words)
+    return f"{rng.choice(PEOPLE)} {' '.join(words)} in {rng.choice(PLACES)}".capitalize()
+
+
+def synthetic_summary(rng: random.Random, html: bool = True) -> str:
+    sentences = []
+    for _ in range(rng.randint(2, 5)):
+        words = [rng.choice(WORDS + FILLER) for _ in range(rng.randint(8, 20))]
+        words.insert(rng.randrange(len(words)), rng.choice(ORGS))
+        sentences.append(" ".join(words).capitalize() + ".")
+
+    if not html:
+        return " ".join(sentences)
+
+    body = " ".join(f"<p>{s}</p>" for s in sentences)
+    return f'<div class="summary">{body} <a href="https://example.com">Read more &raquo;</a></div>'
+
+
+def generate_articles(n: int, seed: int = 42):
+    """Yield n synthetic article dicts (title, url, source, published_at, content)."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "title": synthetic_title(rng),
+            "url": f"https://bench.local/article/{seed}/{i}",
+            "source": rng.choice(SOURCES),
+            "published_at": START_DATE + timedelta(minutes=rng.randrange(60 * 24 * 90)),
+            "content": synthetic_summary(rng, html=False),
+        }
+
+
+# -------------------------
+# RSS documents
+# -------------------------
+def build_rss(feed_id: int, entries: int, seed: int = 7) -> bytes:
+    """RSS 2.0 document with `entries` items; deterministic per feed_id."""
+    rng = random.Random(seed * 1_000_003 + feed_id)
+    items = []
+
+    for i in range(entries):
+        published = START_DATE + timedelta(minutes=rng.randrange(60 * 24 * 90))
+        summary = synthetic_summary(rng).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        items.append(
+            "<item>"
+            f"<title>{synthetic_title(rng)}</title>"
+            f"<link>https://bench.local/feed/{feed_id}/item/{i}</link>"
+            f"<description>{summary}</description>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            "</item>"
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel>'
+        f"<title>Bench feed {feed_id}</title>"
+        f"<link>https://bench.local/feed/{feed_id}</link>"
+        "<description>Synthetic benchmark feed</description>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+# -------------------------
+# Database corpus
+# -------------------------
+def populate_database(engine, n_articles: int, seed: int = 42, chunk: int = 10_000):
+    """Bulk-load articles, sentiment results and entities for analytics benchmarks."""
+    from app.db.database import init_db
+    from app.db.models import Article, SentimentResult, ArticleEntity
+
+    init_db(engine)
+    rng = random.Random(seed)
+
+    with engine.begin() as conn:
+        next_id = (conn.execute(Article.__table__.select().with_only_columns(Article.id).order_by(Article.id.desc()).limit(1)).scalar() or 0) + 1
+
+    articles, sentiments, entities = [], [], []
+
+    def flush():
+        with engine.begin() as conn:
+            if articles:
+                conn.execute(Article.__table__.insert(), articles)
+            if sentiments:
+                conn.execute(SentimentResult.__table__.insert(), sentiments)
+            if entities:
+                conn.execute(ArticleEntity.__table__.insert(), entities)
+        articles.clear()
+        sentiments.clear()
+        entities.clear()
+
+    for offset, row in enumerate(generate_articles(n_articles, seed)):
+        article_id = next_id + offset
+        articles.append({"id": article_id, **row, "created_at": row["published_at"]})
+        sentiments.append({
+            "article_id": article_id,
+            "label": rng.choice(LABELS),
+            "score": round(rng.random(), 4),
+            "created_at": row["published_at"],
+        })
+        for name, kind in (
+            (rng.choice(PEOPLE), "person"),
+            (rng.choice(ORGS), "organization"),
+            (rng.choice(PLACES), "location"),
+        ):
+            entities.append({
+                "article_id": article_id,
+                "entity": name,
+                "entity_type": kind,
+                "created_at": row["published_at"],
+            })
+
+        if len(articles) >= chunk:
+            flush()
+
+    flush()
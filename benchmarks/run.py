@@ -0,0 +1,106 @@
+# benchmarks/run.py
+"""
+Benchmark runner.
+
+    python -m benchmarks.run --scale 10k
+    python -m benchmarks.run --scale 100k --only analytics --baseline benchmarks/results/baseline.json
+
+Results are written as JSON; pass --baseline to fail on regressions.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import traceback
+from datetime import datetime
+
+from benchmarks.common import BenchContext, compare_results, save_results
+from benchmarks.fixtures import SCALES
+
+# name -> module exposing run(ctx) -> {benchmark: {metric: value}}
+BENCHMARKS = {
+    "loader": "benchmarks.bench_loader",
+    "ingest": "benchmarks.bench_ingest",
+    "analytics": "benchmarks.bench_analytics",
+    "inference": "benchmarks.bench_inference",
+    "clean_html": "benchmarks.bench_clean_html",
+    "parse_pool": "benchmarks.bench_parse_pool",
+    "transfer": "benchmarks.bench_transfer",
+    "stories": "benchmarks.bench_stories",
+    "columnar": "benchmarks.bench_columnar",
+    "serving": "benchmarks.bench_serving",
+    "keywords": "benchmarks.bench_keywords",
+    "scrape_memory": "benchmarks.bench_scrape_memory",
+}
+
+DEFAULT_WORKDIR = os.path.join(os.path.dirname(__file__), ".work")
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run Global Pulse benchmarks.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--only", help="comma-separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="smaller iteration counts")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR)
+    parser.add_argument("--out", help="results JSON path")
+    parser.add_argument("--baseline", help="baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    db_path = os.path.abspath(os.path.join(args.workdir, f"bench-{args.scale}.db"))
+
+    # the engine is created at import time, so this must happen before any app import
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    # every synthetic feed lives on 127.0.0.1; per-host politeness would only measure itself
+    os.environ.setdefault("RSS_HOST_RATE", "0")
+    os.environ.setdefault("RSS_HOST_CONCURRENCY", "1024")
+    # the synthetic corpus has fixed dates; keep it visible whatever the day
+    os.environ.setdefault("RETENTION_MONTHS", "0")
+
+    ctx = BenchContext(
+        scale=args.scale,
+        n_articles=SCALES[args.scale],
+        workdir=os.path.abspath(args.workdir),
+        db_url=os.environ["DATABASE_URL"],
+        quick=args.quick,
+    )
+
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+    results = {}
+
+    for name in selected:
+        print(f"[BENCH] {name} @ {args.scale}")
+        try:
+            module = importlib.import_module(BENCHMARKS[name])
+            results.update(module.run(ctx))
+        except Exception as e:
+            print(f"[ERROR] Benchmark {name} failed: {e}")
+            traceback.print_exc()
+            results[name] = {"error": str(e)}
+
+    out = args.out or os.path.join(
+        DEFAULT_RESULTS_DIR,
+        f"{datetime.utcnow():%Y%m%dT%H%M%S}-{args.scale}.json",
+    )
+    payload = save_results(results, ctx, out)
+    print(json.dumps(payload["results"], indent=2, sort_keys=True))
+    print(f"[BENCH] Results written to {out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(payload, json.load(f), args.tolerance)
+        for r in regressions:
+            change = f" ({r['change_pct']:+}%)" if r["change_pct"] is not None else ""
+            print(f"[REGRESSION] {r['benchmark']} {r['metric']}: {r['baseline']} -> {r['current']}{change}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
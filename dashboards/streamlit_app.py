@@ -2,6 +2,7 @@
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -9,6 +10,9 @@ from datetime import date, timedelta
 
 API_BASE = "http://api:8000"
 
+# Analytics responses are reused for this long across reruns and page switches
+CACHE_TTL = 60
+
 # -------------------------------------------------------
 # Page Config
 # -------------------------------------------------------
@@ -76,9 +80,26 @@ QUERY_PARAMS = build_params()
 # -------------------------------------------------------
 # Utility: Fetch from API
 # -------------------------------------------------------
-def fetch(url):
+@st.cache_resource
+def http_session():
+    """One pooled keep-alive session shared by every rerun and browser tab."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+    return session
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner="Loading analytics...")
+def fetch_bundle(query_params):
+    # raises on failure so errors are not cached
+    response = http_session().get(f"{API_BASE}/analytics/dashboard-bundle{query_params}", timeout=(3, 20))
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch(dataset):
+    """One dataset of the bundle for the selected date range, or None."""
     try:
-        return requests.get(f"{API_BASE}{url}{QUERY_PARAMS}", timeout=20).json()
+        return fetch_bundle(QUERY_PARAMS).get(dataset)
     except Exception:
         return None
 
@@ -123,7 +144,7 @@ st.markdown("### Real-time insights from global news: sentiment, keywords, sourc
 if page == "Overview":
     st.subheader("Sentiment Overview")
 
-    sent = fetch("/analytics/sentiment-summary")
+    sent = fetch("sentiment_summary")
     if sent:
         c1, c2, c3, c4 = st.columns(4)
         with c1: stat_card("Positive", sent["positive"], COLOR_POS)
@@ -160,7 +181,7 @@ if page == "Daily Sentiment":
     st.subheader("Daily Sentiment Trend")
 
     # Use the SAME query params as the rest of the dashboard
-    daily = fetch("/analytics/daily-sentiment")
+    daily = fetch("daily_sentiment")
 
     if daily:
         rows = [{"date": d, **vals} for d, vals in daily.items()]
@@ -185,7 +206,7 @@ if page == "Daily Sentiment":
 if page == "Keywords":
     st.subheader("Most Common Keywords")
 
-    keywords = fetch("/analytics/keyword-frequency")
+    keywords = fetch("keyword_frequency")
 
     if keywords:
         df_kw = pd.DataFrame(keywords)
@@ -207,7 +228,7 @@ if page == "Keywords":
 if page == "Sources":
     st.subheader("Sentiment by News Source")
 
-    source_data = fetch("/analytics/source-sentiment")
+    source_data = fetch("source_sentiment")
 
     if source_data:
         rows = [{"source": s, **vals} for s, vals in source_data.items()]
@@ -242,7 +263,7 @@ if page == "Entities":
         "other": "#4A90E2"
     }
 
-    entities = fetch("/analytics/top-entities")
+    entities = fetch("top_entities")
 
     if entities:
         df = pd.DataFrame(entities)
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from app.db import partitioning
+from app.db.models import Article, ArticleEntity, SentimentResult
+from app.routers.analytics import dashboard_bundle, keyword_frequency, sentiment_summary
+
+
+# ---------------------------
+# 1. Dashboard bundle
+# ---------------------------
+def test_dashboard_bundle_matches_individual_routes(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    when = datetime(2026, 2, 3, 12)
+    article = Article(title="Satellite launch delayed", content="The satellite launch was delayed by weather.",
+                      source="science", url="https://x.example/1", published_at=when)
+    memory_db.add(article)
+    memory_db.flush()
+    memory_db.add(SentimentResult(article_id=article.id, label="negative", score=0.8))
+    memory_db.add(ArticleEntity(article_id=article.id, entity="Nasa", entity_type="organization"))
+    memory_db.commit()
+
+    bundle = dashboard_bundle(after="2026-02-01", db=memory_db)
+
+    assert set(bundle) == {"sentiment_summary", "daily_sentiment", "keyword_frequency", "source_sentiment", "top_entities"}
+    assert bundle["sentiment_summary"] == sentiment_summary(after="2026-02-01", db=memory_db)
+    assert bundle["keyword_frequency"] == keyword_frequency(after="2026-02-01", db=memory_db)
+    assert bundle["daily_sentiment"] == {"2026-02-03": {"positive": 0, "negative": 1, "neutral": 0, "error": 0}}
+    assert bundle["top_entities"] == [{"entity": "Nasa", "type": "organization", "count": 1}]
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from app.db.models import Article, ArticleEntity, ExportDirty, SentimentResult
+from app.services import backfill
+
+OLD = ("sst2/neutral-0.45-0.55", "bert-ner/heuristics-1")
+NEW = ("sst2/neutral-0.4-0.6", "bert-ner/heuristics-2")
+CREATED = datetime(2024, 3, 5)
+
+
+def seed(db):
+    for i, versions in enumerate([OLD, OLD, (NEW[0], OLD[1]), NEW]):
+        article = Article(title=f"Title {i}", content="Body", url=f"https://x/{i}")
+        article.sentiment = SentimentResult(label="positive", score=0.9, created_at=CREATED,
+                                            model_version=versions[0], ner_version=versions[1])
+        article.entities = [ArticleEntity(entity="Old", entity_type="person", created_at=CREATED)]
+        db.add(article)
+    db.commit()
+
+
+def fake_score(items):
+    return [
+        ({"label": "neutral", "score": 0.58} if want_sentiment else None,
+         [{"entity": "New", "entity_type": "location"}] if want_entities else None)
+        for _, _, want_sentiment, want_entities in items
+    ]
+
+
+# ---------------------------
+# 1. Re-scores only what is stale, keeps partition month
+# ---------------------------
+def test_backfill_rescores_stale_rows(memory_db, monkeypatch, tmp_path):
+    seed(memory_db)
+    monkeypatch.setattr(backfill, "_versions", lambda: NEW)
+    monkeypatch.setattr(backfill, "_score", fake_score)
+    state = str(tmp_path / "state.json")
+
+    result = backfill.run_backfill(memory_db.get_bind(), workers=0, batch=2, state_path=state, yield_queue=0)
+
+    assert result["done"] == 3 and result["remaining"] == 0
+    rows = {s.article_id: s for s in memory_db.query(SentimentResult).all()}
+    assert [rows[i].label for i in (1, 2, 3, 4)] == ["neutral", "neutral", "positive", "positive"]
+    assert all((s.model_version, s.ner_version) == NEW for s in rows.values())
+
+    entities = {e.article_id: e for e in memory_db.query(ArticleEntity).all()}
+    assert [entities[i].entity for i in (1, 2, 3, 4)] == ["New", "New", "New", "Old"]
+    assert entities[1].created_at == CREATED and entities[1].model_version == NEW[1]
+    # the Parquet export is told to redo the rows' day
+    marks = {(m.table_name, m.day) for m in memory_db.query(ExportDirty).all()}
+    assert marks == {("sentiment_results", CREATED.date()), ("article_entities", CREATED.date())}
+
+    # idempotent: nothing left to do
+    monkeypatch.setattr(backfill, "_score", lambda items: pytest.fail("re-scored twice"))
+    assert backfill.run_backfill(memory_db.get_bind(), workers=0, state_path=state, yield_queue=0)["remaining"] == 0
+
+
+# ---------------------------
+# 2. Resumes from the checkpoint
+# ---------------------------
+def test_backfill_resumes_after_failure(memory_db, monkeypatch, tmp_path):
+    seed(memory_db)
+    monkeypatch.setattr(backfill, "_versions", lambda: NEW)
+    state = str(tmp_path / "state.json")
+    calls = []
+
+    def flaky(items):
+        calls.append(len(items))
+        if len(calls) == 2:
+            raise RuntimeError("worker died")
+        return fake_score(items)
+
+    monkeypatch.setattr(backfill, "_score", flaky)
+    with pytest.raises(RuntimeError):
+        backfill.run_backfill(memory_db.get_bind(), workers=0, batch=1, state_path=state, yield_queue=0)
+
+    assert backfill.load_state(state)[backfill.run_key(NEW, 0, None)]["last_id"] == 1
+
+    result = backfill.run_backfill(memory_db.get_bind(), workers=0, batch=1, state_path=state, yield_queue=0)
+    assert result == {"last_id": 3, "done": 3, "remaining": 0}
@@ -0,0 +1,107 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from app.db import partitioning
+from app.db.database import Base
+from app.db.models import Article, ArticleEntity, ExportDirty, SentimentResult
+from app.routers import analytics
+from app.services import duckdb_analytics
+from app.services.parquet_export import TABLES, export_all, ready, table_glob
+
+ROWS = [
+    ("Storm floods coastal towns", "Heavy storm flooding forced evacuations in coastal towns.", "world", "negative"),
+    ("Markets rally after rates decision", "Stocks rallied strongly after the rates decision.", "business", "positive"),
+    ("Storm floods coastal towns again", "Storm flooding returned to coastal towns overnight.", "world", "neutral"),
+]
+
+
+def _load(memory_db, rows, start=0):
+    for n, (title, content, source, label) in enumerate(rows, start):
+        when = datetime(2026, 1, 10 + n, 9)
+        article = Article(title=title, content=content, source=source, url=f"https://x.example/{n}",
+                          published_at=when, created_at=when)
+        memory_db.add(article)
+        memory_db.flush()
+        memory_db.add(SentimentResult(article_id=article.id, label=label, score=0.5, created_at=when))
+        memory_db.add(ArticleEntity(article_id=article.id, entity="Met Office", entity_type="org", created_at=when))
+    memory_db.commit()
+
+
+def _exported(export_dir, name):
+    import duckdb
+
+    with duckdb.connect() as conn:
+        return sorted(conn.execute(f"SELECT * FROM read_parquet('{table_glob(export_dir, name)}', hive_partitioning = false)").fetchall())
+
+
+def _stored(memory_db, name):
+    return sorted(tuple(row) for row in memory_db.execute(select(Base.metadata.tables[name])))
+
+
+# ---------------------------
+# 1. Export follows new rows, in-place changes and deletes
+# ---------------------------
+def test_export_redoes_changed_days(memory_db, tmp_path):
+    bind, export_dir = memory_db.get_bind(), str(tmp_path)
+    _load(memory_db, ROWS)
+    assert not ready(export_dir)
+    assert export_all(bind, export_dir, lag_seconds=0)["articles"] == 3
+    assert ready(export_dir)
+
+    # backfill: article 1's sentiment updated, its entities re-inserted with new ids
+    first_day = datetime(2026, 1, 10, 9)
+    memory_db.query(SentimentResult).filter(SentimentResult.article_id == 1).update({"label": "positive"})
+    memory_db.query(ArticleEntity).filter(ArticleEntity.article_id == 1).delete()
+    memory_db.add(ArticleEntity(article_id=1, entity="Coast Guard", entity_type="org", created_at=first_day))
+    partitioning.mark_dirty(memory_db, "sentiment_results", [first_day.date()])
+    partitioning.mark_dirty(memory_db, "article_entities", [first_day.date()])
+    memory_db.commit()
+    # retention: article 2 and its rows go
+    partitioning._delete_articles(bind, datetime(2026, 1, 11), datetime(2026, 1, 12))
+    # and a new day arrives
+    _load(memory_db, [("Harbour reopens", "The harbour reopened.", "world", "positive")], start=3)
+
+    export_all(bind, export_dir, lag_seconds=0)
+
+    for name in TABLES:
+        assert _exported(export_dir, name) == _stored(memory_db, name)
+    assert not os.path.exists(tmp_path / "articles" / "date=2026-01-11")
+    assert memory_db.query(ExportDirty).count() == 0
+
+
+# ---------------------------
+# 2. DuckDB answers match SQL
+# ---------------------------
+def test_duckdb_backend_matches_sql(memory_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    _load(memory_db, ROWS)
+    memory_db.query(Article).filter(Article.id == 3).update({"canonical_id": 1})
+    memory_db.commit()
+    export_all(memory_db.get_bind(), str(tmp_path), lag_seconds=0)
+
+    endpoints = [
+        lambda: analytics.sentiment_summary(db=memory_db),
+        lambda: analytics.top_sources(db=memory_db),
+        lambda: analytics.daily_sentiment(after="2026-01-11", db=memory_db),
+        lambda: analytics.source_sentiment(db=memory_db),
+        lambda: analytics.keyword_frequency(db=memory_db),
+        lambda: analytics.top_entities(db=memory_db),
+    ]
+    expected = [call() for call in endpoints]
+
+    monkeypatch.setattr(duckdb_analytics, "ENABLED", True)
+    monkeypatch.setattr(duckdb_analytics, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(duckdb_analytics, "_conn", duckdb_analytics.connect(str(tmp_path)))
+    monkeypatch.setattr(memory_db, "query", lambda *a: pytest.fail("fell back to SQL"))
+
+    for call, sql_result in zip(endpoints, expected):
+        result = call()
+        if isinstance(result, list):
+            result, sql_result = sorted(map(str, result)), sorted(map(str, sql_result))
+        assert result == sql_result
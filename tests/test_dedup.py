@@ -0,0 +1,100 @@
+from app.db.models import Article
+from app.scrapers.rss_pipeline import write_records
+from app.services import dedup
+from app.services.dedup import NearDuplicateIndex, signature, similarity
+
+WIRE = (
+    "Central bank raises interest rates by half a point",
+    "The central bank raised its benchmark interest rate by half a percentage point on "
+    "Tuesday, citing persistent inflation and a tight labour market across the region.",
+)
+REWRITE = (
+    "Central bank raises interest rates by half a point - Daily Herald",
+    "The central bank raised its benchmark interest rate by half a percentage point on "
+    "Tuesday, citing persistent inflation and a tight labour market across the region. Read more",
+)
+OTHER = (
+    "Local team wins championship after dramatic overtime",
+    "Fans poured into the streets after the home side clinched the title with a late goal "
+    "in overtime, ending a twenty year wait for silverware.",
+)
+
+
+def sig(pair):
+    return signature(dedup.article_text(*pair))
+
+
+# ---------------------------
+# 1. Signatures approximate Jaccard similarity
+# ---------------------------
+def test_signature_similarity():
+    assert similarity(sig(WIRE), sig(REWRITE)) > 0.7
+    assert similarity(sig(WIRE), sig(OTHER)) < 0.2
+
+
+def test_short_text_has_no_signature():
+    assert signature("Live updates") is None
+
+
+# ---------------------------
+# 2. Index links near-duplicates and forgets old entries
+# ---------------------------
+def test_index_finds_canonical():
+    index = NearDuplicateIndex()
+    index.add(1, sig(WIRE))
+    index.add(2, sig(REWRITE), canonical_id=1)
+
+    assert index.find(sig(REWRITE)) == 1
+    assert index.find(sig(OTHER)) is None
+
+
+def test_window_evicts_old_articles():
+    index = NearDuplicateIndex(window_hours=1)
+    index.add(1, sig(WIRE), added_at=1000.0)
+
+    index._evict(now=1000.0 + 2 * 3600)
+
+    assert len(index) == 0
+    assert index.find(sig(REWRITE)) is None
+
+
+# ---------------------------
+# 3. Ingest links the same story from another feed
+# ---------------------------
+def test_write_records_links_duplicates_across_feeds(memory_db, monkeypatch):
+    monkeypatch.setattr(dedup, "_index", NearDuplicateIndex())
+
+    write_records(memory_db, "wire", [(WIRE[0], "https://wire.example/a", WIRE[1], None)])
+    write_records(memory_db, "herald", [
+        (REWRITE[0], "https://herald.example/b", REWRITE[1], None),
+        (OTHER[0], "https://herald.example/c", OTHER[1], None),
+    ])
+
+    rows = {a.url: a for a in memory_db.query(Article).all()}
+    canonical = rows["https://wire.example/a"]
+    assert canonical.canonical_id is None
+    assert rows["https://herald.example/b"].canonical_id == canonical.id
+    assert rows["https://herald.example/c"].canonical_id is None
+
+
+# ---------------------------
+# 4. Only committed articles are indexed
+# ---------------------------
+def test_rolled_back_articles_are_not_indexed(memory_db, monkeypatch):
+    monkeypatch.setattr(dedup, "_index", NearDuplicateIndex())
+    lost = Article(id=999, title=WIRE[0], content=WIRE[1], url="https://wire.example/lost")
+    memory_db.add(lost)
+    memory_db.flush()
+    dedup.link_duplicates(memory_db, [lost])
+    memory_db.rollback()
+
+    write_records(memory_db, "herald", [
+        (REWRITE[0], "https://herald.example/b", REWRITE[1], None),
+        (WIRE[0], "https://wire.example/a", WIRE[1], None),
+    ])
+
+    rows = {a.url: a for a in memory_db.query(Article).all()}
+    assert rows["https://herald.example/b"].canonical_id is None
+    # within one batch, before the commit, articles still find each other
+    assert rows["https://wire.example/a"].canonical_id == rows["https://herald.example/b"].id
+    assert 999 not in dedup._index._signatures and len(dedup._index) == 2
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import event
+
+from app.db.models import Article, ArticleEntity
+from app.services import enrichment
+from app.utils.nlp import LONG_TEXT_VERSION
+
+
+def fake_sentiment(texts, cleaned=False):
+    assert cleaned
+    return [{"label": "positive", "score": 0.9, "cleaned_text": t} for t in texts]
+
+
+def fake_entities(texts):
+    return [{"people": ["Ada Lovelace"], "organizations": [], "locations": ["London"], "products": []}
+            for _ in texts]
+
+
+def enrich_counting_queries(db, n_articles: int) -> int:
+    db.add_all(Article(title=f"Title {i}", content=f"Body {i}", url=f"https://x/{n_articles}/{i}")
+               for i in range(n_articles))
+    db.commit()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        articles = enrichment.load_pending(db, limit=n_articles)
+        enrichment.enrich_batch(articles, db)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert len(articles) == n_articles
+    return len(statements)
+
+
+# ---------------------------
+# 1. One pass, constant queries per batch
+# ---------------------------
+def test_batch_costs_constant_queries(memory_db, monkeypatch):
+    monkeypatch.setattr(enrichment, "analyze_sentiment_batch", fake_sentiment)
+    monkeypatch.setattr(enrichment, "extract_entities_batch", fake_entities)
+    memory_db.expire_on_commit = False  # as in the sentiment worker
+
+    small = enrich_counting_queries(memory_db, 5)
+    large = enrich_counting_queries(memory_db, 25)
+
+    assert small == large
+    assert memory_db.query(ArticleEntity).count() == 2 * 30
+    assert all(a.sentiment.label == "positive" for a in memory_db.query(Article).all())
+    # the long-text mode is part of the stored version
+    assert {a.sentiment.model_version for a in memory_db.query(Article).all()} == {LONG_TEXT_VERSION}
+
+
+# ---------------------------
+# 2. Failure stores nothing
+# ---------------------------
+def test_failed_batch_rolls_back(memory_db, monkeypatch):
+    def broken(texts):
+        raise RuntimeError("ner down")
+
+    monkeypatch.setattr(enrichment, "analyze_sentiment_batch", fake_sentiment)
+    monkeypatch.setattr(enrichment, "extract_entities_batch", broken)
+    memory_db.add(Article(title="t", content="c", url="https://x/1"))
+    memory_db.commit()
+
+    articles = enrichment.load_pending(memory_db)
+    with pytest.raises(RuntimeError):
+        enrichment.enrich_batch(articles, memory_db)
+
+    assert len(enrichment.load_pending(memory_db)) == 1
+    assert memory_db.query(ArticleEntity).count() == 0
@@ -0,0 +1,67 @@
+from datetime import date, datetime
+
+from app.db import partitioning
+from app.db.models import Article, ArticleEntity, EntityCooccurrence
+from app.routers.analytics import entity_graph_neighbors
+from app.services import entity_graph
+
+MENTIONS = [
+    (date(2026, 3, 1), [("Nasa", "organization"), ("Houston", "location"), ("Ada", "person")]),
+    (date(2026, 3, 1), [("Nasa", "organization"), ("Houston", "location"), ("Nasa", "organization")]),
+    (date(2026, 3, 2), [("Nasa", "organization"), ("Houston", "location"), ("Widget", "product")]),
+]
+
+
+def edges(db):
+    return {(e.entity, e.neighbor, e.day): e.count for e in db.query(EntityCooccurrence).all()}
+
+
+# ---------------------------
+# 1. Incremental counts match a rebuild; top-K neighbours
+# ---------------------------
+def test_incremental_graph_matches_rebuild(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    for i, (day, entities) in enumerate(MENTIONS):
+        article = Article(title=f"t{i}", url=f"https://x/{i}", published_at=datetime(day.year, day.month, day.day))
+        article.entities = [ArticleEntity(entity=e, entity_type=t) for e, t in entities]
+        memory_db.add(article)
+        entity_graph.record(memory_db, [(entity_graph.article_day(article), entities)])
+    memory_db.commit()
+
+    incremental = edges(memory_db)
+    assert incremental[("Nasa", "Houston", date(2026, 3, 1))] == 2
+    assert ("Nasa", "Widget", date(2026, 3, 2)) not in incremental  # products are not graph nodes
+
+    entity_graph.rebuild(memory_db.get_bind())
+    memory_db.expire_all()
+    assert edges(memory_db) == incremental
+
+    result = entity_graph_neighbors("Nasa", limit=5, after="2026-03-01", db=memory_db)
+    assert result == [
+        {"entity": "Houston", "type": "location", "count": 3},
+        {"entity": "Ada", "type": "person", "count": 1},
+    ]
+    assert entity_graph_neighbors("Nasa", min_count=2, db=memory_db) == result[:1]
+
+
+# ---------------------------
+# 2. Pruning drops weak edges of closed days only
+# ---------------------------
+def test_prune_drops_weak_closed_edges(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    entity_graph.record(memory_db, MENTIONS)
+    entity_graph.record(memory_db, [(date(2026, 3, 5), [("Ada", "person"), ("Paris", "location")])])
+    memory_db.commit()
+
+    entity_graph.prune(memory_db, min_count=2, after_days=2, today=date(2026, 3, 6))
+
+    assert set(edges(memory_db)) == {
+        ("Nasa", "Houston", date(2026, 3, 1)), ("Houston", "Nasa", date(2026, 3, 1)),
+        ("Ada", "Paris", date(2026, 3, 5)), ("Paris", "Ada", date(2026, 3, 5)),
+    }
+
+    # a backfill moving an article off a pruned edge must not re-create it
+    entity_graph.record(memory_db, MENTIONS[:1], sign=-1)
+    memory_db.commit()
+    assert edges(memory_db)[("Nasa", "Houston", date(2026, 3, 1))] == 1
+    assert ("Nasa", "Ada", date(2026, 3, 1)) not in edges(memory_db)
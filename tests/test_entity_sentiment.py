@@ -0,0 +1,93 @@
+from datetime import date, datetime
+
+from app.db import partitioning
+from app.db.models import Article, ArticleEntity, EntitySentimentDaily, SentimentResult
+from app.routers.analytics import entity_sentiment_compare, entity_sentiment_summary, entity_sentiment_trend, entity_trend
+from app.services import backfill, entity_sentiment
+
+ARTICLES = [
+    (datetime(2026, 3, 1, 9), "positive", 0.9, ["Nasa", "Houston"]),
+    (datetime(2026, 3, 1, 18), "negative", 0.7, ["Nasa"]),
+    (datetime(2026, 3, 2, 12), "positive", 0.8, ["Nasa", "Spacex"]),
+]
+
+
+def seed(db):
+    for i, (published_at, label, score, names) in enumerate(ARTICLES):
+        article = Article(title=f"t{i}", url=f"https://x/{i}", published_at=published_at)
+        article.sentiment = SentimentResult(label=label, score=score, model_version="old", ner_version="old")
+        article.entities = [ArticleEntity(entity=n, entity_type="organization") for n in names]
+        db.add(article)
+        entity_sentiment.record(db, [entity_sentiment.article_item(article)])
+    db.commit()
+
+
+def rollup(db):
+    db.expire_all()
+    return {(r.entity, r.day, r.label): (r.count, round(r.score_sum, 6))
+            for r in db.query(EntitySentimentDaily).all() if r.count}
+
+
+# ---------------------------
+# 1. Endpoints read the rollup; several entities at once
+# ---------------------------
+def test_entity_endpoints_from_rollup(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    seed(memory_db)
+
+    assert entity_sentiment_summary("Nasa", db=memory_db) == {"positive": 2, "negative": 1, "neutral": 0, "error": 0}
+    assert entity_trend("Nasa", db=memory_db) == {"2026-03-01": 2, "2026-03-02": 1}
+
+    trend = entity_sentiment_trend(entity=["Nasa", "Spacex"], after="2026-03-02", db=memory_db)
+    assert trend == {
+        "Nasa": {"2026-03-02": {"positive": 1, "negative": 0, "neutral": 0, "error": 0, "score": 0.8}},
+        "Spacex": {"2026-03-02": {"positive": 1, "negative": 0, "neutral": 0, "error": 0, "score": 0.8}},
+    }
+    assert list(entity_sentiment_compare(entity=[], db=memory_db))[0] == "Nasa"
+
+    incremental = rollup(memory_db)
+    entity_sentiment.rebuild(memory_db.get_bind())
+    assert rollup(memory_db) == incremental
+
+
+# ---------------------------
+# 2. Backfill moves counts to the new results
+# ---------------------------
+def test_backfill_keeps_rollup_in_sync(memory_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    seed(memory_db)
+    monkeypatch.setattr(backfill, "_versions", lambda: ("new", "new"))
+    monkeypatch.setattr(backfill, "_score", lambda items: [
+        ({"label": "neutral", "score": 0.5}, [{"entity": "Esa", "entity_type": "organization"}] if i % 2 else None)
+        for i, _ in enumerate(items)
+    ])
+
+    backfill.run_backfill(memory_db.get_bind(), workers=0, state_path=str(tmp_path / "state.json"), yield_queue=0)
+
+    incremental = rollup(memory_db)
+    assert incremental[("Esa", datetime(2026, 3, 1).date(), "neutral")] == (1, 0.5)
+    entity_sentiment.rebuild(memory_db.get_bind())
+    assert rollup(memory_db) == incremental
+
+
+# ---------------------------
+# 3. Backfilling a pruned day doesn't bring back negative rows
+# ---------------------------
+def test_backfill_after_prune_adds_no_negative_rows(memory_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    seed(memory_db)
+    # as if retention had pruned the day
+    memory_db.query(EntitySentimentDaily).filter(EntitySentimentDaily.day == date(2026, 3, 1)).delete()
+    memory_db.commit()
+
+    monkeypatch.setattr(backfill, "_versions", lambda: ("new", "new"))
+    monkeypatch.setattr(backfill, "_score", lambda items: [({"label": "neutral", "score": 0.5}, None) for _ in items])
+    backfill.run_backfill(memory_db.get_bind(), workers=0, state_path=str(tmp_path / "state.json"), yield_queue=0)
+
+    memory_db.expire_all()
+    rows = {(r.entity, r.day, r.label): (r.count, r.score_sum) for r in memory_db.query(EntitySentimentDaily).all()}
+    assert all(count >= 0 and score_sum >= 0 for count, score_sum in rows.values())
+    assert ("Houston", date(2026, 3, 1), "positive") not in rows
+    assert rows[("Nasa", date(2026, 3, 2), "positive")] == (0, 0.0)
+    top = entity_sentiment.top_entities(memory_db)
+    assert top[0] == "Nasa" and sorted(top[1:]) == ["Houston", "Spacex"]
@@ -0,0 +1,67 @@
+import gzip
+import io
+import zlib
+
+import pytest
+
+from app.scrapers import feed_body
+from app.scrapers.feed_body import FeedTooLarge, read_body
+
+BODY = b"<rss><channel>" + b"<item><title>Hello</title></item>" * 2000 + b"</channel></rss>"
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data: bytes, **headers):
+        super().__init__(data)
+        self.headers = {k.replace("_", "-"): v for k, v in headers.items()}
+
+
+def deflate(data: bytes, wbits: int) -> bytes:
+    c = zlib.compressobj(6, zlib.DEFLATED, wbits)
+    return c.compress(data) + c.flush()
+
+
+# ---------------------------
+# 1. Content-Encoding variants decode to the same body
+# ---------------------------
+@pytest.mark.parametrize("encoding,payload", [
+    (None, BODY),
+    ("gzip", gzip.compress(BODY)),
+    ("deflate", deflate(BODY, zlib.MAX_WBITS)),
+    ("deflate", deflate(BODY, -zlib.MAX_WBITS)),  # raw deflate, as some servers send
+])
+def test_read_body_decodes(encoding, payload):
+    headers = {"Content_Encoding": encoding} if encoding else {}
+    assert read_body(FakeResponse(payload, **headers)) == BODY
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        read_body(FakeResponse(BODY, Content_Encoding="compress"))
+
+
+# ---------------------------
+# 2. Size cap
+# ---------------------------
+def test_gzip_bomb_stops_at_cap():
+    bomb = gzip.compress(b"\0" * 50_000_000)
+
+    with pytest.raises(FeedTooLarge):
+        read_body(FakeResponse(bomb, Content_Encoding="gzip"), max_bytes=1_000_000)
+
+
+def test_declared_length_over_cap_fails_before_reading():
+    response = FakeResponse(BODY, Content_Length=str(len(BODY)))
+
+    with pytest.raises(FeedTooLarge):
+        read_body(response, max_bytes=1000)
+    assert response.tell() == 0
+
+
+def test_brotli_bomb_stops_at_cap():
+    if feed_body.brotli is None:
+        pytest.skip("needs brotli >= 1.1")
+    bomb = feed_body.brotli.compress(b"\0" * 50_000_000)
+
+    with pytest.raises(FeedTooLarge):
+        read_body(FakeResponse(bomb, Content_Encoding="br"), max_bytes=1_000_000)
@@ -0,0 +1,106 @@
+import socket
+import threading
+import time
+import urllib.error
+from datetime import datetime
+
+from app.db.models import FeedHealth
+from app.scrapers import feed_health
+from app.scrapers.feed_health import (
+    HealthTracker,
+    backoff_seconds,
+    classify_error,
+    skip_quarantined,
+    worst_offenders,
+)
+
+DEAD = "https://dead.example/rss"
+GOOD = "https://good.example/rss"
+
+
+def record(db, url, ok=True, seconds=0.5):
+    tracker = HealthTracker()
+    if ok:
+        tracker.success(url, seconds)
+    else:
+        tracker.failure(url, urllib.error.URLError(socket.timeout("timed out")), seconds)
+    tracker.flush(db)
+    return db.get(FeedHealth, url)
+
+
+# ---------------------------
+# 1. Error classification + backoff schedule
+# ---------------------------
+def test_classify_error():
+    assert classify_error(urllib.error.HTTPError(DEAD, 404, "Not Found", None, None)) == "http_404"
+    assert classify_error(urllib.error.URLError(socket.gaierror(-2, "Name or service not known"))) == "dns"
+    assert classify_error(socket.timeout("timed out")) == "timeout"
+    assert classify_error(ValueError("boom")) == "error"
+
+
+def test_backoff_doubles_and_caps():
+    first = feed_health.QUARANTINE_AFTER
+    assert backoff_seconds(first - 1) == 0
+    assert backoff_seconds(first) == feed_health.BACKOFF_BASE
+    assert backoff_seconds(first + 1) == feed_health.BACKOFF_BASE * 2
+    assert backoff_seconds(first + 50) == feed_health.BACKOFF_MAX
+
+
+# ---------------------------
+# 2. Repeated failures quarantine a feed; success releases it
+# ---------------------------
+def test_failing_feed_is_quarantined_and_skipped(memory_db):
+    for _ in range(feed_health.QUARANTINE_AFTER):
+        row = record(memory_db, DEAD, ok=False)
+    record(memory_db, GOOD)
+
+    assert row.last_status == "timeout"
+    assert row.quarantined_until > datetime.utcnow()
+    assert skip_quarantined(memory_db, {"news": [DEAD, GOOD]}) == {"news": [GOOD]}
+
+    row = record(memory_db, DEAD, ok=True)
+    assert row.consecutive_failures == 0
+    assert row.quarantined_until is None
+
+
+def test_worst_offenders_ranks_by_consecutive_failures(memory_db):
+    for _ in range(3):
+        record(memory_db, DEAD, ok=False)
+    record(memory_db, GOOD, ok=False)
+
+    report = worst_offenders(memory_db)
+    assert [r["url"] for r in report] == [DEAD, GOOD]
+    assert report[0]["consecutive_failures"] == 3
+    assert report[0]["failure_rate"] == 1.0
+
+
+# ---------------------------
+# 3. Spooling sweeps don't wait on a slow database
+# ---------------------------
+def test_slow_database_uses_last_quarantine_list(memory_db, monkeypatch):
+    monkeypatch.setattr(feed_health, "_last_blocked", set())
+    for _ in range(feed_health.QUARANTINE_AFTER):
+        record(memory_db, DEAD, ok=False)
+    feeds = {"news": [DEAD, GOOD]}
+    assert skip_quarantined(memory_db, feeds, timeout=5) == {"news": [GOOD]}
+
+    read, released = feed_health.quarantined_urls, threading.Event()
+    before = set(threading.enumerate())
+
+    def slow(db, urls):
+        released.wait(5)
+        return read(db, urls)
+
+    monkeypatch.setattr(feed_health, "quarantined_urls", slow)
+    start = time.perf_counter()
+    assert skip_quarantined(memory_db, feeds, timeout=0.05) == {"news": [GOOD]}
+
+    tracker = HealthTracker()
+    tracker.success(GOOD, 0.1)
+    monkeypatch.setattr(feed_health, "_apply", lambda *a, **k: released.wait(5))
+    tracker.flush(memory_db, timeout=0.05)
+    assert time.perf_counter() - start < 1
+    released.set()
+    # the abandoned calls still use memory_db's connection; let them finish first
+    for thread in set(threading.enumerate()) - before:
+        thread.join(5)
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from app.services.inference_server import DynamicBatcher, make_server
+from app.utils import inference_client
+
+
+# ---------------------------
+# 1. Dynamic batching
+# ---------------------------
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def fn(items):
+        calls.append(list(items))
+        return [item.upper() for item in items]
+
+    batcher = DynamicBatcher("test", fn, max_batch=64, max_latency_ms=200)
+    results = {}
+
+    def submit(n):
+        results[n] = batcher.submit([f"a{n}", f"b{n}"])
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and len(calls[0]) == 8
+    assert results == {n: [f"A{n}", f"B{n}"] for n in range(4)}
+
+
+def test_full_batch_does_not_wait_for_deadline():
+    batcher = DynamicBatcher("test", lambda items: items, max_batch=2, max_latency_ms=60_000)
+    assert batcher.submit(["x", "y"]) == ["x", "y"]  # would hang for a minute otherwise
+
+
+# ---------------------------
+# 2. Unix socket round trip
+# ---------------------------
+def test_client_over_unix_socket(tmp_path):
+    def fail(items):
+        raise ValueError("model exploded")
+
+    url = f"unix://{tmp_path / 'inference.sock'}"
+    server = make_server(url, {"sentiment": lambda items: [len(t) for t in items], "ner": fail})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        assert inference_client.call(url, "sentiment", ["abc", "de"]) == [3, 2]
+        assert inference_client.call(url, "sentiment", ["again"]) == [5]  # reused connection
+        with pytest.raises(inference_client.InferenceError, match="model exploded"):
+            inference_client.call(url, "ner", ["x"])
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,28 @@
+from collections import Counter
+
+from app.utils.keywords import count_keywords, extract_keywords
+
+DOCS = [
+    "Federal Reserve holds rates; Federal Reserve signals cuts",
+    "Wildfire near Sydney — federal response (https://x.io/a-b)",
+    "Café naïve résumé: rates rise",
+    "reserve",  # must not pair with the last word of the previous document
+    None,
+    "",
+    "Holds the rates",
+]
+
+
+# ---------------------------
+# 1. Batched counts match per-document extraction
+# ---------------------------
+def test_count_keywords_matches_per_document():
+    for ngram in (1, 2):
+        expected = Counter(w for doc in DOCS for w in extract_keywords(doc, ngram)).most_common(50)
+        assert count_keywords(DOCS, ngram=ngram, block=2) == expected
+
+
+def test_bigrams_need_adjacent_keywords():
+    assert extract_keywords("Federal Reserve holds the rates", ngram=2) == ["federal reserve", "reserve holds"]
+    assert "rise reserve" not in dict(count_keywords(DOCS, ngram=2))
+    assert "the" not in dict(count_keywords(DOCS))
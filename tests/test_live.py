@@ -0,0 +1,110 @@
+import asyncio
+import json
+from datetime import datetime
+
+from app.db import partitioning
+from app.db.models import Article, ArticleEntity, SentimentResult
+from app.routers import live as live_router
+from app.routers.analytics import dashboard_bundle
+from app.services import live
+from app.services.live import Broadcaster, LocalBus, apply_delta, article_event, delta_event
+
+
+class FakeRequest:
+    async def is_disconnected(self):
+        return False
+
+
+# ---------------------------
+# 1. Fan-out with bounded buffers
+# ---------------------------
+def test_slow_subscriber_drops_oldest_and_is_told(monkeypatch):
+    bus = LocalBus()
+    broadcaster = Broadcaster(bus=bus, buffer=2)
+    monkeypatch.setattr(live_router, "BROADCASTER", broadcaster)
+
+    async def scenario():
+        sub = broadcaster.subscribe()
+        for n in range(3):
+            bus.publish(json.dumps({"type": "article", "id": n}))
+        await asyncio.sleep(0)  # let the loop run the threadsafe callbacks
+
+        stream = live_router.event_stream(FakeRequest(), sub)
+        frames = [await stream.__anext__() for _ in range(4)]
+        await stream.aclose()
+        return sub, frames
+
+    sub, frames = asyncio.run(scenario())
+
+    assert sub.dropped == 1
+    assert frames[1].startswith(b"event: lagged")
+    assert b'"id": 1' in frames[2] and b'"id": 2' in frames[3]
+    assert len(broadcaster) == 0
+
+
+# ---------------------------
+# 2. Deltas keep a bundle current
+# ---------------------------
+def test_delta_applied_to_bundle_matches_refetch(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    when = datetime(2026, 3, 1, 10)
+
+    def add(n, label):
+        article = Article(title=f"t{n}", source="world", url=f"https://x.example/{n}", published_at=when)
+        memory_db.add(article)
+        memory_db.flush()
+        memory_db.add(SentimentResult(article_id=article.id, label=label, score=0.7))
+        memory_db.add(ArticleEntity(article_id=article.id, entity="Ukraine", entity_type="location"))
+        memory_db.commit()
+        return article
+
+    add(1, "negative")
+    bundle = dashboard_bundle(db=memory_db)
+    fresh = [add(2, "negative"), add(3, "positive")]
+
+    apply_delta(bundle, delta_event([article_event(a) for a in fresh]))
+    refetched = dashboard_bundle(db=memory_db)
+
+    for dataset in ("sentiment_summary", "daily_sentiment", "source_sentiment", "top_entities"):
+        assert bundle[dataset] == refetched[dataset]
+
+
+def test_delta_keeps_top_entities_capped(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    when = datetime(2026, 3, 1, 10)
+
+    def add(n, names):
+        article = Article(title=f"t{n}", source="world", url=f"https://x.example/{n}", published_at=when)
+        memory_db.add(article)
+        memory_db.flush()
+        memory_db.add(SentimentResult(article_id=article.id, label="neutral", score=0.5))
+        memory_db.add_all(ArticleEntity(article_id=article.id, entity=name, entity_type="org") for name in names)
+        memory_db.commit()
+        return article
+
+    names = [f"Org {i:03d}" for i in range(100)]
+    add(1, names)
+    add(2, names)
+    add(3, ["Tail"])  # 101st entity, one mention
+    bundle = dashboard_bundle(db=memory_db)
+    assert {e["count"] for e in bundle["top_entities"]} == {2}
+
+    # Tail may now outrank the list: the bundle can't tell, so it asks for a re-fetch
+    fresh = [add(4, ["Tail", "Org 000"]), add(5, ["Tail", "Org 000"])]
+    apply_delta(bundle, delta_event([article_event(a) for a in fresh]))
+    assert bundle["lagged"] and len(bundle["top_entities"]) == 100
+    assert "Tail" not in [e["entity"] for e in bundle["top_entities"]]
+    bundle = dashboard_bundle(db=memory_db)
+    assert {"entity": "Tail", "type": "org", "count": 3} in bundle["top_entities"]
+
+    # known entities only: stays exact and capped
+    apply_delta(bundle, delta_event([article_event(add(6, ["Org 001"]))]))
+    refetched = dashboard_bundle(db=memory_db)
+    assert "lagged" not in bundle
+    counts = lambda b: sorted(e["count"] for e in b["top_entities"])
+    assert counts(bundle) == counts(refetched) and len(bundle["top_entities"]) == 100
+
+
+def test_publish_never_raises(monkeypatch):
+    monkeypatch.setattr(live, "get_bus", lambda: 1 / 0)
+    assert live.publish_articles([object()]) == 0
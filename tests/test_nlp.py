@@ -3,9 +3,12 @@ import pytest
 from unittest.mock import patch
 from transformers.pipelines import Pipeline
 from app.utils.nlp import (
+    aggregate_chunks,
     analyze_sentiment,
+    analyze_sentiment_batch,
     clean_text,
     sentiment_analyzer,
+    token_windows,
 )
 
 # ----------------------------
@@ -80,4 +83,45 @@ def test_mocked_sentiment(mock_model):
     mock_model.return_value = [{"label": "POSITIVE", "score": 0.99}]
     result = analyze_sentiment("Mock test")
     assert result["label"] == "positive"
-    assert result["score"] == 0.99
\ No newline at end of file
+    assert result["score"] == 0.99
+
+
+# ----------------------------
+# LONG-DOCUMENT MODE
+# ----------------------------
+
+def test_token_windows_cover_text_with_bounded_count():
+    windows = token_windows(10_000, size=510, overlap=64, max_chunks=8)
+    assert len(windows) == 8
+    assert windows[0][0] == 0 and windows[-1][1] == 10_000
+    assert token_windows(100) == [(0, 100)]
+
+def test_aggregate_chunks_weights_by_length():
+    assert aggregate_chunks([(0.9, 100), (0.2, 300)]) == ("negative", 0.625)
+
+@patch("app.utils.nlp._forward")
+def test_long_text_scores_all_chunks_in_one_pass(mock_forward):
+    mock_forward.side_effect = lambda chunks: [0.9] * len(chunks)
+    results = analyze_sentiment_batch(["great news " * 1000, "", "Short one."])
+    assert results[0]["chunks"] > 1
+    assert results[1]["label"] == "neutral"
+    assert results[2]["label"] == "positive"
+    assert mock_forward.call_count == 1
+
+
+# ----------------------------
+# CLIENT MODE
+# ----------------------------
+
+def test_client_mode_keeps_each_sentiment_mode(monkeypatch):
+    calls = []
+
+    def call(url, endpoint, texts):
+        calls.append(endpoint)
+        return [{"label": "neutral", "score": 0.5, "cleaned_text": t} for t in texts]
+
+    monkeypatch.setattr("app.utils.nlp.INFERENCE_URL", "unix:///tmp/test.sock")
+    monkeypatch.setattr("app.utils.inference_client.call", call)
+    analyze_sentiment("truncated")
+    analyze_sentiment_batch(["chunked"])
+    assert calls == ["sentiment", "sentiment_long"]
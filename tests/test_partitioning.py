@@ -0,0 +1,68 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.db import partitioning
+from app.db.models import Article, ArticleEntity, ExportDirty, SentimentResult
+from app.db.partitioning import add_months, apply_retention, retention_cutoff
+from app.routers.analytics import daily_sentiment
+
+
+def _article(memory_db, n, when, label="positive"):
+    article = Article(title=f"a{n}", url=f"https://x.example/{n}", published_at=when, created_at=when)
+    memory_db.add(article)
+    memory_db.flush()
+    memory_db.add(SentimentResult(article_id=article.id, label=label, score=0.9, created_at=when))
+    memory_db.add(ArticleEntity(article_id=article.id, entity="Nasa", entity_type="org", created_at=when))
+    return article
+
+
+# ---------------------------
+# 1. Retention window
+# ---------------------------
+def test_retention_cutoff_keeps_whole_months():
+    assert retention_cutoff(date(2026, 3, 17), months=3) == date(2026, 1, 1)
+    assert retention_cutoff(date(2026, 3, 17), months=0) is None
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+
+
+def test_retention_deletes_expired_months_with_children(memory_db):
+    _article(memory_db, 1, datetime(2025, 12, 5))
+    _article(memory_db, 2, datetime(2026, 1, 20))
+    memory_db.commit()
+
+    report = apply_retention(memory_db.get_bind(), cutoff=date(2026, 1, 1), archive_dir="")
+
+    assert report["2025-12-01"]["articles"] == 1
+    assert [a.title for a in memory_db.query(Article).all()] == ["a2"]
+    assert memory_db.query(SentimentResult).count() == 1
+    assert memory_db.query(ArticleEntity).count() == 1
+    marks = {(m.table_name, m.day) for m in memory_db.query(ExportDirty).all()}
+    assert marks == {(name, date(2025, 12, 5)) for name in partitioning.EXPORTED}
+
+
+def test_retention_archives_to_parquet(memory_db, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _article(memory_db, 1, datetime(2025, 12, 5))
+    memory_db.commit()
+
+    apply_retention(memory_db.get_bind(), cutoff=date(2026, 1, 1), archive_dir=str(tmp_path))
+
+    table = pq.read_table(tmp_path / "articles-2025-12.parquet")
+    assert table.column("title").to_pylist() == ["a1"]
+    assert memory_db.query(Article).count() == 0
+
+
+# ---------------------------
+# 2. Date filters
+# ---------------------------
+def test_daily_sentiment_groups_by_day_on_sqlite(memory_db, monkeypatch):
+    monkeypatch.setattr(partitioning, "RETENTION_MONTHS", 0)
+    _article(memory_db, 1, datetime(2026, 1, 20, 8))
+    _article(memory_db, 2, datetime(2026, 1, 20, 23), label="negative")
+    _article(memory_db, 3, datetime(2025, 6, 1))
+    memory_db.commit()
+
+    trend = daily_sentiment(after="2026-01-01", db=memory_db)
+
+    assert trend == {"2026-01-20": {"positive": 1, "negative": 1, "neutral": 0, "error": 0}}
@@ -0,0 +1,85 @@
+import socket
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from app.scrapers import politeness
+from app.scrapers.politeness import (
+    HostBackoff,
+    HostLimiter,
+    TokenBucket,
+    interleave_by_host,
+    parse_retry_after,
+)
+
+
+# ---------------------------
+# 1. Token bucket + Retry-After parsing
+# ---------------------------
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.5, abs=0.05)
+    assert waits[4] == pytest.approx(1.0, abs=0.05)
+
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 2, 10, 0, tzinfo=timezone.utc)
+
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=90)), now=now) == 90.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+# ---------------------------
+# 2. 429/503 puts the whole host into backoff
+# ---------------------------
+def test_throttled_host_is_skipped_other_hosts_are_not():
+    limiter = HostLimiter(rate=0, concurrency=2, max_wait=5)
+    limiter.throttled("https://busy.example/a.xml", retry_after="600")
+
+    with pytest.raises(HostBackoff):
+        with limiter.slot("https://busy.example/b.xml"):
+            pass
+
+    with limiter.slot("https://quiet.example/a.xml"):
+        pass
+
+
+def test_interleave_round_robins_hosts():
+    jobs = [("c", "https://a.example/1"), ("c", "https://a.example/2"),
+            ("c", "https://a.example/3"), ("c", "https://b.example/1")]
+
+    order = [url for _, url in interleave_by_host(jobs)]
+
+    assert order == ["https://a.example/1", "https://b.example/1",
+                     "https://a.example/2", "https://a.example/3"]
+
+
+# ---------------------------
+# 3. DNS cache (positive and negative)
+# ---------------------------
+def test_dns_cache_reuses_lookups(monkeypatch):
+    calls = []
+
+    def fake_getaddrinfo(host, *args, **kwargs):
+        calls.append(host)
+        if host == "dead.example":
+            raise socket.gaierror(-2, "Name or service not known")
+        return [("addr", host)]
+
+    monkeypatch.setattr(politeness, "_original_getaddrinfo", fake_getaddrinfo)
+    politeness.clear_dns_cache()
+
+    for _ in range(3):
+        assert politeness._cached_getaddrinfo("live.example", 443) == [("addr", "live.example")]
+        with pytest.raises(socket.gaierror):
+            politeness._cached_getaddrinfo("dead.example", 443)
+
+    assert calls == ["live.example", "dead.example"]
+    politeness.clear_dns_cache()
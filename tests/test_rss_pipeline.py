@@ -0,0 +1,93 @@
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Article, FeedHealth
+from app.scrapers import rss_pipeline, rss_scraper
+from app.scrapers.politeness import HostLimiter
+from app.scrapers.rss_pipeline import parse_feed_bytes, scrape_rss_pipelined, write_records
+from app.services import dedup
+from app.services.dedup import NearDuplicateIndex
+from benchmarks.feed_server import FeedServer
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>First</title><link>https://example.com/1</link>
+<description>&lt;p&gt;Hello &lt;b&gt;World&lt;/b&gt;&lt;/p&gt;</description>
+<pubDate>Tue, 02 Jan 2024 10:30:00 GMT</pubDate></item>
+<item><title>Second</title><link>https://example.com/2</link></item>
+<item><title>No link</title></item>
+</channel></rss>"""
+
+
+# ---------------------------
+# 1. Parse stage returns compact records
+# ---------------------------
+def test_parse_feed_bytes_normalizes_entries():
+    seen, bozo, records, seconds = parse_feed_bytes(RSS)
+
+    assert seen == 3
+    assert bozo is None
+    assert records[0] == ("First", "https://example.com/1", "Hello World", datetime(2024, 1, 2, 10, 30))
+    assert [r.link for r in records] == ["https://example.com/1", "https://example.com/2"]
+
+
+# ---------------------------
+# 2. Writer skips existing and repeated URLs
+# ---------------------------
+def test_write_records_dedupes(memory_db):
+    memory_db.add(Article(title="Old", url="https://example.com/1", source="test"))
+    memory_db.commit()
+
+    _, _, records, _ = parse_feed_bytes(RSS)
+    inserted = write_records(memory_db, "test", records + records)
+
+    assert [a.url for a in inserted] == ["https://example.com/2"]
+    assert memory_db.query(Article).count() == 2
+
+
+# ---------------------------
+# 3. End to end against a local feed server
+# ---------------------------
+@pytest.fixture
+def pipeline_db(memory_db, monkeypatch):
+    """The pipeline's sessions on the test database, without host politeness."""
+    monkeypatch.setattr(rss_pipeline, "SessionLocal", sessionmaker(bind=memory_db.get_bind(), autoflush=False))
+    monkeypatch.setattr(rss_scraper, "HOSTS", HostLimiter(rate=0, concurrency=1024, respect_robots=False))
+    monkeypatch.setattr(dedup, "_index", NearDuplicateIndex())
+    return memory_db
+
+
+def test_pipeline_end_to_end_with_tiny_queues(pipeline_db):
+    progress = []
+    with FeedServer(entries_per_feed=3) as server:
+        urls = server.feed_urls(6)
+        missing = f"{server.base_url}/missing.xml"
+        result = scrape_rss_pipelined(
+            {"news": urls[:3] + [missing], "tech": urls[3:]},
+            fetch_workers=3, parse_workers=2, queue_size=1,
+            progress=lambda done, r: progress.append(done),
+        )
+
+    stored = dict(pipeline_db.query(Article.id, Article.url).all())
+    assert sorted(result.article_ids) == sorted(stored)
+    assert result.inserted == 18
+    assert progress == list(range(1, 8))  # the failed feed counts as done
+    assert pipeline_db.get(FeedHealth, missing).last_status == "http_404"
+
+
+def test_pipeline_stops_when_the_writer_fails(pipeline_db, monkeypatch):
+    def broken(db, category, records):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(rss_pipeline, "write_records", broken)
+    start = time.perf_counter()
+    with FeedServer(entries_per_feed=3) as server:
+        with pytest.raises(RuntimeError, match="disk full"):
+            scrape_rss_pipelined({"news": server.feed_urls(20)}, fetch_workers=4, parse_workers=2, queue_size=1)
+
+    # fetchers blocked on the full queues were released rather than left hanging
+    assert time.perf_counter() - start < 10
+    assert pipeline_db.query(Article).count() == 0
@@ -0,0 +1,113 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import ScraperNode
+from app.scrapers.rss_scraper import ScrapeResult
+from app.scrapers.sharding import (
+    HashRing,
+    shard_feeds,
+    heartbeat,
+    live_nodes,
+    membership_feeds,
+)
+from app.workers import rss_worker
+
+FEEDS = {
+    "world": [f"https://world{i}.example/rss" for i in range(3000)],
+    "tech": [f"https://tech{i}.example/feed" for i in range(2000)],
+}
+ALL_URLS = {u for urls in FEEDS.values() for u in urls}
+
+
+# ---------------------------
+# 1. Static shards partition the feed list
+# ---------------------------
+def test_static_shards_cover_every_feed_once():
+    seen = []
+    for shard_id in range(4):
+        owned = shard_feeds(FEEDS, shard_id, 4)
+        seen.extend(u for urls in owned.values() for u in urls)
+
+    assert len(seen) == len(ALL_URLS)
+    assert set(seen) == ALL_URLS
+
+
+def test_shards_are_roughly_balanced():
+    sizes = [sum(len(v) for v in shard_feeds(FEEDS, i, 4).values()) for i in range(4)]
+    assert min(sizes) > len(ALL_URLS) / 4 * 0.7
+
+
+# ---------------------------
+# 2. Adding a node moves ~1/N of the feeds
+# ---------------------------
+def test_adding_node_moves_about_one_nth():
+    before = HashRing(["a", "b", "c", "d"])
+    after = HashRing(["a", "b", "c", "d", "e"])
+
+    moved = [u for u in ALL_URLS if before.owner(u) != after.owner(u)]
+
+    # every moved feed went to the new node
+    assert all(after.owner(u) == "e" for u in moved)
+    assert 0.1 < len(moved) / len(ALL_URLS) < 0.3
+
+
+# ---------------------------
+# 3. Membership via scraper_nodes heartbeats
+# ---------------------------
+def test_membership_ignores_stale_nodes(memory_db):
+    heartbeat(memory_db, "node-a")
+    heartbeat(memory_db, "node-b")
+    stale = heartbeat(memory_db, "node-c")
+    stale.last_heartbeat = datetime.utcnow() - timedelta(hours=1)
+    memory_db.commit()
+
+    assert sorted(live_nodes(memory_db)) == ["node-a", "node-b"]
+
+    owned_a = membership_feeds(memory_db, FEEDS, "node-a")
+    owned_b = membership_feeds(memory_db, FEEDS, "node-b")
+    total = sum(len(v) for v in owned_a.values()) + sum(len(v) for v in owned_b.values())
+    assert total == len(ALL_URLS)
+
+
+def test_heartbeat_records_progress(memory_db):
+    heartbeat(memory_db, "node-a", feeds_owned=10, feeds_done=4)
+
+    node = memory_db.get(ScraperNode, "node-a")
+    assert (node.feeds_owned, node.feeds_done) == (10, 4)
+
+
+# ---------------------------
+# 4. A sweep scrapes once and heartbeats while it runs
+# ---------------------------
+def test_sweep_heartbeats_during_one_scrape(memory_db, monkeypatch):
+    sessions = sessionmaker(bind=memory_db.get_bind())
+    monkeypatch.setattr(rss_worker, "SessionLocal", sessions)
+    monkeypatch.setattr(rss_worker, "HEARTBEAT_EVERY", 0.01)
+    monkeypatch.setattr(rss_worker, "load_feeds", lambda: FEEDS)
+    monkeypatch.setattr(rss_worker, "USE_PIPELINE", False)
+
+    calls, seen = [], []
+
+    def fake_scrape(feeds, progress):
+        calls.append(feeds)
+        result = ScrapeResult()
+        for done in (1, 2):
+            result.article_ids.append(done)
+            progress(done, result)
+            time.sleep(0.1)  # longer than a heartbeat
+            with sessions() as db:
+                seen.append(db.get(ScraperNode, "node-a").feeds_done)
+        return result
+
+    monkeypatch.setattr(rss_worker, "scrape_rss", fake_scrape)
+
+    assert rss_worker.run_sweep("node-a") == 2
+    assert calls == [FEEDS]
+    assert seen == [1, 2]
+
+    memory_db.expire_all()
+    node = memory_db.get(ScraperNode, "node-a")
+    assert (node.feeds_owned, node.feeds_done, node.articles_inserted) == (len(ALL_URLS), len(ALL_URLS), 2)
+    assert node.sweep_finished_at is not None
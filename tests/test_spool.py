@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db.models import Article
+from app.scrapers import spool
+from app.services import dedup
+from app.services.dedup import NearDuplicateIndex
+
+
+def records(*ids):
+    return [(f"Title {i}", f"https://example.com/{i}", f"Body {i}", datetime(2026, 3, 1, i)) for i in ids]
+
+
+def urls(db):
+    return sorted(url for (url,) in db.query(Article.url).all())
+
+
+# ---------------------------
+# 1. Round trip across segments, a crash and a torn record
+# ---------------------------
+def test_spool_round_trip(memory_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(dedup, "_index", NearDuplicateIndex())
+    memory_db.add(Article(title="Old", url="https://example.com/1", source="news"))
+    memory_db.commit()
+
+    writer = spool.SpoolWriter(str(tmp_path), segment_bytes=200)
+    writer.append("news", records(1, 2))
+    writer.append("tech", records(3))
+    with pytest.raises(spool.SpoolLocked):
+        spool.SpoolWriter(str(tmp_path))
+
+    # the process dies mid-append
+    writer._file.write(b'["news","Torn"')
+    writer._file.flush()
+    writer._lock.close()
+
+    restarted = spool.SpoolWriter(str(tmp_path))
+    restarted.append("news", records(4) + records(2))
+    restarted.close()
+
+    result = spool.drain(memory_db.get_bind(), str(tmp_path), batch=2)
+
+    assert result == {"loaded": 5, "inserted": 3}
+    assert urls(memory_db) == [f"https://example.com/{i}" for i in (1, 2, 3, 4)]
+    assert memory_db.query(Article).filter(Article.url == "https://example.com/3").one().source == "tech"
+    # only the newest segment is kept, fully loaded
+    assert spool.segments(str(tmp_path)) == [spool.load_checkpoint(str(tmp_path))["segment"]]
+    assert spool.drain(memory_db.get_bind(), str(tmp_path)) == {"loaded": 0, "inserted": 0}
+
+
+# ---------------------------
+# 2. Database down: nothing is marked loaded
+# ---------------------------
+def test_drain_keeps_checkpoint_when_database_fails(memory_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(dedup, "_index", NearDuplicateIndex())
+    writer = spool.SpoolWriter(str(tmp_path))
+    writer.append("news", records(1, 2, 3))
+    writer.close()
+
+    load_lines = spool.load_lines
+
+    def down(db, lines):
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(spool, "load_lines", down)
+    with pytest.raises(OperationalError):
+        spool.drain(memory_db.get_bind(), str(tmp_path))
+    assert spool.load_checkpoint(str(tmp_path))["offset"] == 0
+
+    monkeypatch.setattr(spool, "load_lines", load_lines)
+    assert spool.drain(memory_db.get_bind(), str(tmp_path))["inserted"] == 3
+    assert len(urls(memory_db)) == 3
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.db.models import Article, ArticleStory, Story
+from app.routers.analytics import stories as stories_endpoint
+from app.services import stories
+from app.services.stories import StoryClusterer, assign_stories, vectorize
+
+QUAKE = [
+    ("Earthquake strikes coastal Japan, tsunami warning issued",
+     "A strong earthquake hit the coast of Japan, prompting a tsunami warning for coastal towns."),
+    ("Tsunami warning after powerful earthquake off Japan coast",
+     "Authorities in Japan issued a tsunami warning after a powerful earthquake struck offshore."),
+]
+CHIPS = [
+    ("Chipmaker unveils faster processor for laptops",
+     "The chipmaker unveiled a faster processor aimed at thin laptops and gaming machines."),
+]
+
+
+# ---------------------------
+# 1. Online clustering
+# ---------------------------
+def test_similar_articles_share_a_story():
+    clusterer = StoryClusterer(threshold=0.3)
+    vectors = np.vstack([vectorize(t, c) for t, c in QUAKE + CHIPS])
+
+    rows = [row for row, _, _ in clusterer.assign(vectors, datetime.utcnow())]
+
+    assert rows[0] == rows[1]
+    assert rows[2] != rows[0]
+    assert len(clusterer) == 2
+
+
+def test_idle_stories_are_retired():
+    clusterer = StoryClusterer(window_hours=1)
+    clusterer.assign(vectorize(*CHIPS[0])[None, :], datetime(2024, 1, 1, 10))
+
+    closed = clusterer.retire(datetime(2024, 1, 1, 12))
+
+    assert closed == [None]
+    assert len(clusterer) == 0
+
+
+def test_shortlist_finds_the_matching_story_among_many():
+    rng = np.random.default_rng(3)
+    others = rng.standard_normal((500, stories.DIM)).astype(np.float32)
+    quake = vectorize(*QUAKE[0])
+    clusterer = StoryClusterer()
+    clusterer.load([(i, v, datetime.utcnow()) for i, v in enumerate(others)])
+    clusterer.load([("quake", quake * 3, datetime.utcnow())])
+
+    row, similarity = clusterer.best(vectorize(*QUAKE[1]))
+
+    assert clusterer.keys[row] == "quake"
+    assert np.isclose(similarity, vectorize(*QUAKE[1]) @ quake)
+
+
+def test_open_stories_are_capped_smallest_and_stalest_first():
+    clusterer = StoryClusterer(max_open=10)
+    vectors = np.eye(12, stories.DIM, dtype=np.float32)
+    # story 0 is the oldest but has three members
+    clusterer.load([(0, vectors[0] * 3, datetime(2024, 1, 1, 9))])
+    clusterer.load([(i, vectors[i], datetime(2024, 1, 1, 9, i)) for i in range(1, 12)])
+
+    closed = clusterer.retire(datetime(2024, 1, 1, 10))
+
+    assert closed == [1, 2, 3]
+    assert clusterer.keys == [0] + list(range(4, 12))
+    assert np.allclose(clusterer.sum_of(0), vectors[0] * 3)
+
+
+# ---------------------------
+# 2. Stored stories + /analytics/stories
+# ---------------------------
+def test_assign_stories_persists_and_serves(memory_db, monkeypatch):
+    monkeypatch.setattr(stories, "_clusterer", None)
+
+    articles = [Article(title=t, content=c, url=f"https://x.example/{i}") for i, (t, c) in enumerate(QUAKE + CHIPS)]
+    memory_db.add_all(articles)
+    memory_db.commit()
+
+    assert assign_stories(memory_db, articles) == 3
+    assert memory_db.query(Story).count() == 2
+    assert memory_db.query(ArticleStory).count() == 3
+
+    top = stories_endpoint(hours=24, limit=10, db=memory_db)
+    assert top[0]["articles"] == 2
+    assert top[0]["title"] == QUAKE[0][0]
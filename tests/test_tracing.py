@@ -0,0 +1,50 @@
+import json
+import pytest
+
+from app.utils import tracing
+
+
+@pytest.fixture(autouse=True)
+def clean_tracer():
+    tracing.reset_trace()
+    yield
+    tracing.disable_tracing()
+    tracing.reset_trace()
+
+
+# ---------------------------
+# 1. Disabled tracing records nothing
+# ---------------------------
+def test_span_is_noop_when_disabled():
+    with tracing.span("scrape.fetch"):
+        pass
+
+    assert tracing.get_events() == []
+    assert tracing.span("a") is tracing.span("b")
+
+
+# ---------------------------
+# 2. Nested spans and exporters
+# ---------------------------
+def test_nested_spans_and_exports(tmp_path):
+    tracing.enable_tracing()
+
+    with tracing.span("scrape_rss"):
+        for _ in range(3):
+            with tracing.span("scrape.clean_html"):
+                pass
+
+    rows = {r["stage"]: r for r in tracing.summarize()}
+    assert rows["scrape.clean_html"]["count"] == 3
+    assert rows["scrape_rss"]["count"] == 1
+
+    trace_file = tmp_path / "run.trace.json"
+    tracing.dump_chrome_trace(str(trace_file))
+    data = json.loads(trace_file.read_text())
+    assert len(data["traceEvents"]) == 4
+    assert all(e["ph"] == "X" for e in data["traceEvents"])
+
+    folded_file = tmp_path / "run.folded"
+    tracing.dump_folded_stacks(str(folded_file))
+    stacks = [line.rsplit(" ", 1)[0] for line in folded_file.read_text().splitlines()]
+    assert "scrape_rss;scrape.clean_html" in stacks